@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'StageEndpoint.settings')
+# Route auth_app to its async views; set ASYNC_API=False to serve the sync ones.
+os.environ.setdefault('ASYNC_API', 'True')
 
 application = get_asgi_application()
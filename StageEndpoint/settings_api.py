@@ -0,0 +1,44 @@
+"""
+Lean API-only settings for serverless deployments.
+
+Imports everything from StageEndpoint.settings and drops what the JSON API
+never uses (admin, sessions, messages, staticfiles, templates and the
+browsable API) so a cold start loads as little as possible. Select it with
+DJANGO_SETTINGS_MODULE=StageEndpoint.settings_api.
+
+Authentication only skips the per-request database query when
+CACHE_BACKEND names a cache shared by every instance (Redis, Memcached).
+Serverless instances don't share the default locmem cache, so without one
+StatelessJWTAuthentication reads the user's flags from the database on
+every request and `manage.py check` reports auth_app.W001.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "auth_app",
+    "rest_framework",
+    "rest_framework_simplejwt",
+    # Backs refresh token rotation and logout.
+    "rest_framework_simplejwt.token_blacklist",
+]
+
+# DRF views are CSRF exempt and authenticate with JWTs, so neither
+# sessions nor Django's own authentication middleware are needed.
+MIDDLEWARE = [
+    "auth_app.middleware.ServerTimingMiddleware",
+    "auth_app.middleware.ReplicaPinningMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ("auth_app.renderers.FastJSONRenderer",),
+}
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_app'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from . import tokens  # noqa: F401  (registers its outbox handlers)
@@ -0,0 +1,23 @@
+from django.urls import path
+from .async_views import AsyncRegisterView, AsyncLoginView, AsyncUserDetailView, AsyncOrganisationView, AsyncOrganisationSearchView, AsyncOrganisationDetailView, AsyncAddUserToOrganisationView
+from .views import BulkRegisterView, BulkAddUsersToOrganisationView, UserBatchView, OrganisationMembersExportView, TokenRefreshView, LogoutView, MetricsView
+
+# Same routes as auth_app.urls, served by native async views. Bulk endpoints,
+# the batch user lookup and the member export are CPU/DB batch jobs and keep
+# their sync views, as does the admin-only metrics endpoint.
+urlpatterns = [
+    path('auth/register', AsyncRegisterView.as_view(), name='register'),
+    path('auth/register/bulk', BulkRegisterView.as_view(), name='register-bulk'),
+    path('auth/login', AsyncLoginView.as_view(), name='login'),
+    path('auth/token/refresh', TokenRefreshView.as_view(), name='token-refresh'),
+    path('auth/logout', LogoutView.as_view(), name='logout'),
+    path('api/users', UserBatchView.as_view(), name='user-batch'),
+    path('api/users/<str:userId>', AsyncUserDetailView.as_view(), name='user-detail'),
+    path('api/organisations', AsyncOrganisationView.as_view(), name='organisation-list'),
+    path('api/organisations/search', AsyncOrganisationSearchView.as_view(), name='organisation-search'),
+    path('api/organisations/<str:orgId>', AsyncOrganisationDetailView.as_view(), name='organisation-detail'),
+    path('api/organisations/<str:orgId>/users', AsyncAddUserToOrganisationView.as_view(), name='add-user-to-organisation'),
+    path('api/organisations/<str:orgId>/users/bulk', BulkAddUsersToOrganisationView.as_view(), name='bulk-add-users-to-organisation'),
+    path('api/organisations/<str:orgId>/members/export', OrganisationMembersExportView.as_view(), name='export-organisation-members'),
+    path('api/metrics', MetricsView.as_view(), name='metrics'),
+]
@@ -0,0 +1,393 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, Throttled
+from . import sharding
+from .authentication import StatelessJWTAuthentication
+from .backends import aauthenticate_user
+from .conditional import auser_etag, make_etag, not_modified, with_versions
+from .hashing import HashingUnavailable
+from .membership import aadd_members, ais_member, create_organisation, get_org_ids
+from .models import User, Organisation
+from .pagination import InvalidCursor, akeyset_page, astream_envelope
+from .renderers import FastJSONRenderer, request_data
+from .registration import DuplicateEmail, aregister_user
+from .search import asearch_page
+from .serializers import (
+    FastOrganisationSerializer,
+    FastUserSerializer,
+    OrganisationSerializer,
+    RegisterSerializer,
+    user_organisations,
+)
+from .throttling import CredentialThrottle
+from .tokens import AuthRefreshToken
+
+
+def json_response(payload, status_code, headers=None):
+    return HttpResponse(
+        FastJSONRenderer().render(payload),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def hashing_unavailable_response():
+    return json_response(
+        {
+            "status": "Service Unavailable",
+            "message": "Server is busy, please try again shortly",
+            "statusCode": 503,
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
+
+async def organisation_payload(user):
+    if sharding.enabled():
+        return (await sync_to_async(user_organisations)([user.pk]))[user.pk]
+    organisations = Organisation.objects.filter(memberships__user_id=user.pk).only(*FastOrganisationSerializer.fields)
+    return [organisation async for organisation in organisations.order_by("pk")]
+
+
+class AsyncAPIView(View):
+    """
+    Base for the async endpoints. Mirrors what the DRF views get from
+    APIView: CSRF exemption, JWT authentication answered with DRF's 401
+    body when ``requires_auth`` is set, and ``throttle_classes`` answered
+    with DRF's 429.
+    """
+
+    requires_auth = False
+    authentication_class = StatelessJWTAuthentication
+    throttle_classes = ()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.requires_auth:
+            authentication = self.authentication_class()
+            try:
+                result = await authentication.aauthenticate(request)
+                if result is None:
+                    raise NotAuthenticated()
+            except APIException as exc:
+                return json_response(
+                    {"detail": exc.detail} if isinstance(exc.detail, str) else exc.detail,
+                    exc.status_code,
+                    headers={"WWW-Authenticate": authentication.authenticate_header(request)},
+                )
+            request.user, request.auth = result
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not await throttle.aallow_request(request, self):
+                exc = Throttled(throttle.wait())
+                return json_response(
+                    {"detail": exc.detail},
+                    exc.status_code,
+                    headers={"Retry-After": str(exc.wait)} if exc.wait else None,
+                )
+        return await super().dispatch(request, *args, **kwargs)
+
+
+#Handles User registration
+class AsyncRegisterView(AsyncAPIView):
+    throttle_classes = (CredentialThrottle,)
+
+    async def post(self, request):
+        serializer = RegisterSerializer(data=request_data(request))
+        if serializer.is_valid():
+            try:
+                user, organisation, refresh = await aregister_user(serializer.validated_data)
+            except HashingUnavailable:
+                return hashing_unavailable_response()
+            except DuplicateEmail:
+                return json_response(
+                    {
+                        "status": "Bad Request",
+                        "message": "Registration unsuccessful",
+                        "statusCode": 422,
+                        "errors": {"email": ["A user with this email already exists."]},
+                    },
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            return json_response(
+                {
+                    "status": "success",
+                    "message": "Registration successful",
+                    "data": {
+                        "accessToken": str(refresh.access_token),
+                        "refreshToken": str(refresh),
+                        "user": FastUserSerializer.to_representation(user, [organisation]),
+                    },
+                },
+                status.HTTP_201_CREATED,
+            )
+        return json_response(
+            {
+                "status": "Bad Request",
+                "message": "Registration unsuccessful",
+                "statusCode": 422,
+                "errors": serializer.errors,
+            },
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+
+#Handles Logining in
+class AsyncLoginView(AsyncAPIView):
+    throttle_classes = (CredentialThrottle,)
+
+    async def post(self, request):
+        data = request_data(request)
+        try:
+            user = await aauthenticate_user(data.get("email"), data.get("password"))
+        except HashingUnavailable:
+            return hashing_unavailable_response()
+        if user is not None:
+            organisations = await organisation_payload(user)
+            refresh = await AuthRefreshToken.afor_user(user)
+            return json_response(
+                {
+                    "status": "success",
+                    "message": "Login successful",
+                    "data": {
+                        "accessToken": str(refresh.access_token),
+                        "refreshToken": str(refresh),
+                        "user": FastUserSerializer.to_representation(user, organisations),
+                    },
+                },
+                status.HTTP_200_OK,
+            )
+        return json_response(
+            {
+                "status": "Bad request",
+                "message": "Authentication failed",
+                "statusCode": 401,
+            },
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+
+class AsyncUserDetailView(AsyncAPIView):
+    requires_auth = True
+
+    async def get(self, request, userId):
+        try:
+            user = await with_versions(User.objects.only(*FastUserSerializer.fields, "version")).aget(userId=userId)
+        except (User.DoesNotExist, ValidationError):
+            return json_response(
+                {
+                    "status": "error",
+                    "message": "User not found",
+                    "statusCode": 404,
+                },
+                status.HTTP_404_NOT_FOUND,
+            )
+        etag = await auser_etag(user)
+        if not_modified(request, etag):
+            return HttpResponseNotModified(headers={"ETag": etag})
+        return json_response(
+            {
+                "status": "success",
+                "message": "User retrieved successfully",
+                "data": FastUserSerializer.to_representation(user, await organisation_payload(user)),
+            },
+            status.HTTP_200_OK,
+            headers={"ETag": etag},
+        )
+
+
+class AsyncOrganisationView(AsyncAPIView):
+    """GET lists the caller's organisations, POST creates one."""
+
+    requires_auth = True
+
+    async def get(self, request):
+        organisations = Organisation.objects.filter(memberships__user_id=request.user.id).only(
+            *FastOrganisationSerializer.fields
+        )
+        shards = None
+        if sharding.enabled():
+            shards = await sync_to_async(sharding.shards_for)(await sync_to_async(get_org_ids)(request.user.id))
+
+        if request.GET.get("stream") == "true":
+            rows = sharding.aiterate(
+                organisations.order_by("pk").values("orgId", "name", "description"),
+                settings.ORGANISATION_STREAM_CHUNK_SIZE,
+                shards,
+            )
+            return StreamingHttpResponse(
+                astream_envelope("Organisations retrieved successfully", "organisations", rows),
+                content_type="application/json",
+            )
+
+        try:
+            limit = int(request.GET.get("limit", settings.ORGANISATION_PAGE_SIZE))
+            if not 1 <= limit <= settings.ORGANISATION_MAX_PAGE_SIZE:
+                raise ValueError
+            page, next_cursor = await akeyset_page(organisations, request.GET.get("cursor"), limit, shards)
+        except (ValueError, InvalidCursor):
+            return json_response(
+                {
+                    "status": "Bad Request",
+                    "message": f"limit must be between 1 and {settings.ORGANISATION_MAX_PAGE_SIZE} and cursor must come from a previous page",
+                    "statusCode": 400,
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+        return json_response(
+            {
+                "status": "success",
+                "message": "Organisations retrieved successfully",
+                "data": {
+                    "organisations": FastOrganisationSerializer.many(page),
+                    "nextCursor": next_cursor,
+                },
+            },
+            status.HTTP_200_OK,
+        )
+
+    async def post(self, request):
+        serializer = OrganisationSerializer(data=request_data(request))
+        if serializer.is_valid():
+            # Both rows in one transaction, which the async ORM can't hold.
+            organisation = await sync_to_async(create_organisation)(request.user.id, serializer.validated_data)
+            return json_response(
+                {
+                    "status": "success",
+                    "message": "Organisation created successfully",
+                    "data": FastOrganisationSerializer.to_representation(organisation),
+                },
+                status.HTTP_201_CREATED,
+            )
+        return json_response(
+            {
+                "status": "Bad Request",
+                "message": "Client error",
+                "statusCode": 400,
+                "errors": serializer.errors,
+            },
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class AsyncOrganisationSearchView(AsyncAPIView):
+    requires_auth = True
+
+    async def get(self, request):
+        query = request.GET.get("q", "").strip()
+        try:
+            if not 1 <= len(query) <= settings.ORGANISATION_SEARCH_MAX_QUERY_LENGTH:
+                raise ValueError
+            limit = int(request.GET.get("limit", settings.ORGANISATION_PAGE_SIZE))
+            if not 1 <= limit <= settings.ORGANISATION_MAX_PAGE_SIZE:
+                raise ValueError
+            page, next_cursor = await asearch_page(request.user.id, query, request.GET.get("cursor"), limit)
+        except (ValueError, InvalidCursor):
+            return json_response(
+                {
+                    "status": "Bad Request",
+                    "message": f"q must be 1 to {settings.ORGANISATION_SEARCH_MAX_QUERY_LENGTH} characters, limit between 1 and {settings.ORGANISATION_MAX_PAGE_SIZE} and cursor must come from a previous page",
+                    "statusCode": 400,
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+        return json_response(
+            {
+                "status": "success",
+                "message": "Organisations retrieved successfully",
+                "data": {
+                    "organisations": FastOrganisationSerializer.many(page),
+                    "nextCursor": next_cursor,
+                },
+            },
+            status.HTTP_200_OK,
+        )
+
+
+class AsyncOrganisationDetailView(AsyncAPIView):
+    requires_auth = True
+
+    async def get(self, request, orgId):
+        with sharding.use_shard(await sharding.ashard_for(orgId)):
+            try:
+                organisation = await sharding.aget_organisation(orgId)
+            except (Organisation.DoesNotExist, ValidationError):
+                return json_response(
+                    {
+                        "status": "Not Found",
+                        "message": "Organisation not found",
+                        "statusCode": 404,
+                    },
+                    status.HTTP_404_NOT_FOUND,
+                )
+            if await ais_member(request.user.id, organisation):
+                etag = make_etag(organisation.version)
+                if not_modified(request, etag):
+                    return HttpResponseNotModified(headers={"ETag": etag})
+                return json_response(
+                    {
+                        "status": "success",
+                        "message": "Organisation retrieved successfully",
+                        "data": {
+                            **FastOrganisationSerializer.to_representation(organisation),
+                            "memberCount": organisation.member_count,
+                        },
+                    },
+                    status.HTTP_200_OK,
+                    headers={"ETag": etag},
+                )
+            return json_response(
+                {
+                    "status": "Forbidden",
+                    "message": "You do not have permission to view this organisation",
+                    "statusCode": 403,
+                },
+                status.HTTP_403_FORBIDDEN,
+            )
+
+
+class AsyncAddUserToOrganisationView(AsyncAPIView):
+    requires_auth = True
+
+    async def post(self, request, orgId):
+        userId = request_data(request).get("userId")
+        with sharding.use_shard(await sharding.ashard_for(orgId)):
+            try:
+                user = await User.objects.aget(userId=userId)
+                organisation = await sharding.aget_organisation(orgId)
+            except (User.DoesNotExist, Organisation.DoesNotExist, ValidationError):
+                return json_response(
+                    {
+                        "status": "Not Found",
+                        "message": "User or Organisation not found",
+                        "statusCode": 404,
+                    },
+                    status.HTTP_404_NOT_FOUND,
+                )
+            if await ais_member(request.user.id, organisation):
+                await aadd_members(organisation, [user.pk])
+                return json_response(
+                    {
+                        "status": "success",
+                        "message": "User added to organisation successfully",
+                    },
+                    status.HTTP_200_OK,
+                )
+            return json_response(
+                {
+                    "status": "Forbidden",
+                    "message": "You do not have permission to modify this organisation",
+                    "statusCode": 403,
+                },
+                status.HTTP_403_FORBIDDEN,
+            )
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .checks import shared_cache
+
+
+# Token claims that must follow the User row while a token is still valid,
+# with the value assumed when a token doesn't carry them.
+REVOCABLE_CLAIMS = {"is_active": True, "is_staff": False, "is_superuser": False}
+
+
+def user_claims_key(user_id):
+    return f"auth_app:user-claims:{user_id}"
+
+
+class UserCache:
+    """Small thread-safe LRU of User rows keyed by primary key, with a TTL."""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    max_size=settings.JWT_USER_CACHE["MAX_SIZE"],
+    ttl=settings.JWT_USER_CACHE["TTL"],
+)
+
+
+class AuthTokenUser(TokenUser):
+    """TokenUser exposing the profile claims added by AuthRefreshToken."""
+
+    @cached_property
+    def userId(self):
+        return self.token.get("userId")
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+    def __str__(self):
+        return self.email
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that serves the full User row from an in-process LRU.
+    Saving or deleting a user drops its entry (see auth_app.signals).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        return user
+
+
+class StatelessJWTAuthentication(CachedJWTAuthentication):
+    """
+    Builds request.user from the token's signed claims instead of a User
+    SELECT. Tokens whose is_active, is_staff or is_superuser claims no longer
+    match the user are rejected through a cache entry that outlives any
+    token. That entry only reaches every worker through a shared cache; with
+    a per-process one, the flags are read from the database instead. Tokens
+    minted without the claims fall back to the cached User lookup.
+    """
+
+    def get_user(self, validated_token):
+        if "userId" not in validated_token:
+            return super().get_user(validated_token)
+        user = self._token_user(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if self._revoked(user.id, validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
+
+    def _revoked(self, user_id, validated_token):
+        claims = self._claims(validated_token)
+        if shared_cache():
+            current = cache.get(user_claims_key(user_id))
+            return current is not None and current != claims
+        return not self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}, **claims).exists()
+
+    async def _arevoked(self, user_id, validated_token):
+        claims = self._claims(validated_token)
+        if shared_cache():
+            current = await cache.aget(user_claims_key(user_id))
+            return current is not None and current != claims
+        return not await self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}, **claims).aexists()
+
+    @staticmethod
+    def _claims(validated_token):
+        return {name: validated_token.get(name, default) for name, default in REVOCABLE_CLAIMS.items()}
+
+    async def aauthenticate(self, request):
+        """Counterpart of authenticate() for async views served under ASGI."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if "userId" not in validated_token:
+            return await sync_to_async(super().get_user)(validated_token)
+        user = self._token_user(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if await self._arevoked(user.id, validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
+
+    def _token_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return AuthTokenUser(validated_token)
@@ -0,0 +1,43 @@
+from .hashing import hash_password, needs_rehash, verify_password, ahash_password, averify_password
+from .models import User
+
+
+def _can_authenticate(user):
+    return getattr(user, "is_active", True)
+
+
+def authenticate_user(email, password):
+    """
+    Equivalent of ``authenticate()`` for the email backend, but with the
+    password check running on the hashing executor.
+    """
+    if email is None or password is None:
+        return None
+    try:
+        user = User.objects.get(email=email)
+    except User.DoesNotExist:
+        # Hash anyway so response time doesn't reveal whether the email exists.
+        hash_password(password)
+        return None
+    if not verify_password(password, user.password) or not _can_authenticate(user):
+        return None
+    if needs_rehash(user.password):
+        user.password = hash_password(password)
+        user.save(update_fields=["password"])
+    return user
+
+
+async def aauthenticate_user(email, password):
+    if email is None or password is None:
+        return None
+    try:
+        user = await User.objects.aget(email=email)
+    except User.DoesNotExist:
+        await ahash_password(password)
+        return None
+    if not await averify_password(password, user.password) or not _can_authenticate(user):
+        return None
+    if needs_rehash(user.password):
+        user.password = await ahash_password(password)
+        await user.asave(update_fields=["password"])
+    return user
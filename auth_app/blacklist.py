@@ -0,0 +1,138 @@
+import hashlib
+import math
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .checks import shared_cache
+
+GENERATION_KEY = "auth_app:blacklist-generation"
+
+# A blacklist write commits within GAP_SECONDS of taking its primary key,
+# and no more than GAP_WINDOW keys are allocated meanwhile.
+GAP_SECONDS = 60
+GAP_WINDOW = 1000
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.count = 0
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        self.count += 1
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistIndex:
+    """
+    In-process Bloom filter over the jtis of unexpired blacklisted tokens.
+    A miss proves a token is not blacklisted without touching the database;
+    a hit is confirmed against BlacklistedToken.
+
+    A miss is only trusted while the filter has seen every blacklist write.
+    Writers replace a generation token in the default cache before and after
+    they commit. When that token is unchanged and the cache is shared, the
+    filter is current. Otherwise the filter catches up first by reading the
+    rows added since its last read, so a token blacklisted by another worker
+    is never accepted. The filter is rebuilt after REBUILD_SECONDS to drop
+    expired entries.
+    """
+
+    def __init__(self):
+        self._filter = None
+        self._generation = None
+        self._built_at = 0.0
+        self._last_pk = 0
+        # Primary keys below _last_pk not seen yet, with when they were
+        # noticed: rows of transactions still open, or rolled back, when the
+        # filter read past them.
+        self._gaps = {}
+        self._lock = threading.Lock()
+
+    def is_blacklisted(self, jti):
+        bloom = self._current_filter()
+        if jti not in bloom:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def add(self, jti):
+        if self._filter is not None:
+            self._filter.add(jti)
+        self.invalidate()
+
+    def invalidate(self):
+        """Makes every process catch up with the blacklist on its next check."""
+        # A fresh value rather than a counter: an evicted key that came back
+        # must never repeat a generation some filter has already seen.
+        cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+
+    def _current_filter(self):
+        config = settings.TOKEN_BLACKLIST_FILTER
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not cache.add(GENERATION_KEY, generation, None):
+                generation = None
+        with self._lock:
+            if (
+                self._filter is None
+                or time.monotonic() - self._built_at > config["REBUILD_SECONDS"]
+                or self._filter.count > self._filter.capacity
+            ):
+                self._rebuild(generation, config)
+            elif generation is None or generation != self._generation or not shared_cache():
+                self._catch_up(generation)
+            return self._filter
+
+    def _rows(self, queryset):
+        return queryset.filter(token__expires_at__gt=timezone.now()).values_list("pk", "token__jti")
+
+    def _rebuild(self, generation, config):
+        rows = list(self._rows(BlacklistedToken.objects.all()))
+        bloom = BloomFilter(max(config["CAPACITY"], 2 * len(rows)), config["ERROR_RATE"])
+        self._filter, self._built_at, self._last_pk, self._gaps = bloom, time.monotonic(), 0, {}
+        self._merge(rows)
+        self._generation = generation
+
+    def _catch_up(self, generation):
+        since = Q(pk__gt=self._last_pk)
+        if self._gaps:
+            since |= Q(pk__in=self._gaps)
+        self._merge(self._rows(BlacklistedToken.objects.filter(since)))
+        self._generation = generation
+
+    def _merge(self, rows):
+        now = time.monotonic()
+        seen = set()
+        for pk, jti in rows:
+            self._filter.add(jti)
+            seen.add(pk)
+        top = max(seen, default=0)
+        if top > self._last_pk:
+            for pk in range(max(self._last_pk, top - GAP_WINDOW) + 1, top):
+                self._gaps.setdefault(pk, now)
+            self._last_pk = top
+        self._gaps = {pk: since for pk, since in self._gaps.items() if pk not in seen and now - since < GAP_SECONDS}
+
+
+blacklist_index = BlacklistIndex()
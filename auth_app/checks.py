@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Warning, register
+
+
+def shared_cache(alias="default"):
+    """Whether cache ``alias`` is seen by every worker process; LocMem and Dummy caches aren't."""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+@register()
+def check_revocation_cache(app_configs, **kwargs):
+    authentication = settings.REST_FRAMEWORK.get("DEFAULT_AUTHENTICATION_CLASSES", ())
+    if "auth_app.authentication.StatelessJWTAuthentication" not in authentication or shared_cache():
+        return []
+    return [
+        Warning(
+            "The default cache is local to each process, so StatelessJWTAuthentication "
+            "reads the user's is_active, is_staff and is_superuser from the database on every request.",
+            hint="Point CACHE_BACKEND at a shared cache that doesn't evict, such as Redis with noeviction.",
+            id="auth_app.W001",
+        )
+    ]
@@ -0,0 +1,55 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.utils.http import parse_etags
+
+from . import sharding
+from .models import Organisation
+
+def make_etag(*versions):
+    return '"' + ".".join(str(version) for version in versions) + '"'
+
+
+def with_versions(users):
+    """
+    Annotates a User queryset with the sum of each user's organisation
+    versions, so the row alone says whether the detail payload changed:
+    the user's own version covers its fields and memberships, the sum
+    covers edits to the organisations listed. Sharded organisations can't
+    be joined to users, so there user_etag sums them across the shards.
+    """
+    if sharding.enabled():
+        return users
+    return users.annotate(organisation_versions=Coalesce(Sum("memberships__organisation__version"), 0))
+
+
+def organisation_versions(user_id):
+    return sum(
+        sharding.fan_out(
+            lambda alias: Organisation.objects.using(alias)
+            .filter(memberships__user_id=user_id)
+            .aggregate(total=Coalesce(Sum("version"), 0))["total"]
+        )
+    )
+
+
+def user_etag(user):
+    if not hasattr(user, "organisation_versions"):
+        user.organisation_versions = organisation_versions(user.pk)
+    return make_etag(user.version, user.organisation_versions)
+
+
+async def auser_etag(user):
+    if not hasattr(user, "organisation_versions"):
+        user.organisation_versions = await sync_to_async(organisation_versions)(user.pk)
+    return make_etag(user.version, user.organisation_versions)
+
+
+def not_modified(request, etag):
+    """True when the request's If-None-Match already names ``etag``."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    # If-None-Match uses the weak comparison, so W/ prefixes don't matter.
+    return "*" in etags or etag in (tag.removeprefix("W/") for tag in etags)
@@ -0,0 +1,123 @@
+import csv
+
+from rest_framework.fields import DateTimeField
+
+from . import sharding
+from .models import Membership, User
+from .pagination import decode_cursor, encode_cursor
+from .renderers import FastJSONRenderer
+
+MEMBER_COLUMNS = ("userId", "firstName", "lastName", "email", "phone", "joinedAt", "cursor")
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def member_records(organisation, after=None, chunk_size=2000):
+    """
+    Yields one dict per member of ``organisation`` in user id order, reading
+    the (organisation, user) membership index through a server-side cursor
+    so memory stays flat. Each record carries the ``cursor`` to pass as
+    ``after`` to resume right behind it.
+    """
+    rows = Membership.objects.filter(organisation_id=organisation.pk)
+    if after:
+        rows = rows.filter(user_id__gt=decode_cursor(after))
+    if sharding.is_sharded(Membership):
+        yield from _sharded_member_records(organisation, rows, chunk_size)
+        return
+    rows = rows.order_by("user_id").values_list(
+        "user_id",
+        "user__userId",
+        "user__firstName",
+        "user__lastName",
+        "user__email",
+        "user__phone",
+        "joined_at",
+    )
+    joined = DateTimeField()
+    for user_id, userId, firstName, lastName, email, phone, joined_at in rows.iterator(chunk_size=chunk_size):
+        yield {
+            "userId": str(userId),
+            "firstName": firstName,
+            "lastName": lastName,
+            "email": email,
+            "phone": phone,
+            "joinedAt": joined.to_representation(joined_at),
+            "cursor": encode_cursor(user_id),
+        }
+
+
+def _sharded_member_records(organisation, memberships, chunk_size):
+    # Users live on the default database, so join each chunk of the shard's
+    # memberships to them with one IN query.
+    memberships = memberships.using(organisation._state.db).order_by("user_id").values_list("user_id", "joined_at")
+    joined = DateTimeField()
+    chunk = []
+    for membership in memberships.iterator(chunk_size=chunk_size):
+        chunk.append(membership)
+        if len(chunk) == chunk_size:
+            yield from _join_users(chunk, joined)
+            chunk = []
+    yield from _join_users(chunk, joined)
+
+
+def _join_users(memberships, joined):
+    users = {
+        user[0]: user
+        for user in User.objects.filter(pk__in=[user_id for user_id, _ in memberships]).values_list(
+            "id", "userId", "firstName", "lastName", "email", "phone"
+        )
+    }
+    for user_id, joined_at in memberships:
+        if user_id not in users:
+            continue
+        _, userId, firstName, lastName, email, phone = users[user_id]
+        yield {
+            "userId": str(userId),
+            "firstName": firstName,
+            "lastName": lastName,
+            "email": email,
+            "phone": phone,
+            "joinedAt": joined.to_representation(joined_at),
+            "cursor": encode_cursor(user_id),
+        }
+
+
+def ndjson_lines(records):
+    renderer = FastJSONRenderer()
+    for record in records:
+        yield renderer.render(record) + b"\n"
+
+
+# Cells a spreadsheet would evaluate as a formula; only member-entered text
+# can start with these.
+FORMULA_PREFIXES = ("=", "+", "-", "@")
+TEXT_COLUMNS = frozenset(("firstName", "lastName", "email", "phone"))
+
+
+class _Line:
+    # csv.writer only needs write(); hand each formatted line straight back.
+    def write(self, value):
+        return value
+
+
+def _cell(column, value):
+    if value is None:
+        return ""
+    if column in TEXT_COLUMNS and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(records):
+    writer = csv.writer(_Line())
+    yield writer.writerow(MEMBER_COLUMNS).encode()
+    for record in records:
+        yield writer.writerow([_cell(column, record[column]) for column in MEMBER_COLUMNS]).encode()
+
+
+def render_members(records, export_format):
+    return ndjson_lines(records) if export_format == "ndjson" else csv_lines(records)
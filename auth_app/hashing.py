@@ -0,0 +1,151 @@
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from . import timing
+from .metrics import counters
+
+
+class HashingUnavailable(Exception):
+    """Raised when a password hash cannot be scheduled or did not finish in time."""
+
+
+class HashingExecutor:
+    """
+    Runs password hashing off the request thread. With more than one worker a
+    process pool is used, otherwise hashing runs inline. Either way at most
+    ``max_pending`` hashes may be queued or running at once; further requests
+    fail fast with ``HashingUnavailable`` instead of piling up.
+    """
+
+    def __init__(self, workers=0, max_pending=64, timeout=10):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = None
+        if workers > 1:
+            # Deferred: pulls in multiprocessing, which inline hashing never needs.
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(self, fn, *args, block=False):
+        if not self._slots.acquire(blocking=block, timeout=self.timeout if block else None):
+            counters.add("hashing.rejected")
+            raise HashingUnavailable("Password hashing queue is full")
+        counters.add("hashing.admitted")
+        counters.add("hashing.in_flight")
+        if self._pool is not None:
+            future = self._pool.submit(fn, *args)
+            future.add_done_callback(lambda _: self._release())
+            return future
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        finally:
+            self._release()
+        return future
+
+    def _release(self):
+        counters.add("hashing.in_flight", -1)
+        self._slots.release()
+
+    def run(self, fn, *args):
+        with timing.phase("hash"):
+            try:
+                return self.submit(fn, *args).result(timeout=self.timeout)
+            except TimeoutError:
+                counters.add("hashing.timed_out")
+                raise HashingUnavailable("Password hashing timed out")
+
+    async def arun(self, fn, *args):
+        if self._pool is None:
+            return await sync_to_async(self.run, thread_sensitive=False)(fn, *args)
+        with timing.phase("hash"):
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(self.submit(fn, *args)), self.timeout)
+            except asyncio.TimeoutError:
+                counters.add("hashing.timed_out")
+                raise HashingUnavailable("Password hashing timed out")
+
+    def map(self, fn, items, chunksize):
+        # Batch work waits for free slots rather than failing, one slot per chunk.
+        futures = [
+            self.submit(_apply_chunk, fn, items[start:start + chunksize], block=True)
+            for start in range(0, len(items), chunksize)
+        ]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _apply_chunk(fn, items):
+    return [fn(item) for item in items]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                config = settings.PASSWORD_HASHING
+                _executor = HashingExecutor(
+                    workers=config["WORKERS"],
+                    max_pending=config["MAX_PENDING"],
+                    timeout=config["TIMEOUT"],
+                )
+    return _executor
+
+
+@receiver(setting_changed)
+def _reset_executor(setting, **kwargs):
+    global _executor
+    if setting == "PASSWORD_HASHING" and _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def needs_rehash(encoded):
+    hasher = identify_hasher(encoded)
+    return hasher.algorithm != get_hasher().algorithm or hasher.must_update(encoded)
+
+
+def hash_password(raw_password):
+    return get_executor().run(make_password, raw_password)
+
+
+async def ahash_password(raw_password):
+    return await get_executor().arun(make_password, raw_password)
+
+
+def verify_password(raw_password, encoded):
+    return get_executor().run(check_password, raw_password, encoded)
+
+
+async def averify_password(raw_password, encoded):
+    return await get_executor().arun(check_password, raw_password, encoded)
+
+
+def hash_passwords(passwords, executor=None):
+    # PBKDF2 is CPU bound, so large batches are spread across worker processes.
+    executor = executor or get_executor()
+    workers = executor.workers
+    chunksize = max(1, len(passwords) // (max(workers, 1) * 4))
+    return executor.map(make_password, passwords, chunksize)
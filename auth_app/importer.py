@@ -0,0 +1,262 @@
+import csv
+import io
+import json
+import time
+from itertools import islice
+
+from django.contrib.auth.hashers import identify_hasher
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from . import sharding
+from .authentication import user_cache
+from .hashing import hash_passwords
+from .models import Membership, Organisation, User
+from .registration import _resolve_pks, create_registrations, default_organisation
+
+CONFLICT_POLICIES = ("skip", "update", "fail")
+
+USER_COPY_FIELDS = tuple(field.name for field in User._meta.concrete_fields if not field.primary_key)
+ORGANISATION_COPY_FIELDS = ("orgId", "name", "description", "member_count")
+# joined_at is left to its database default.
+MEMBERSHIP_COPY_FIELDS = ("organisation", "user")
+
+
+class ImportConflict(Exception):
+    """Raised under the ``fail`` policy when an imported email already exists."""
+
+
+class ImportStats:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+
+    @property
+    def processed(self):
+        return self.created + self.updated + self.skipped + self.failed
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed else 0.0
+
+
+def read_rows(handle, file_format):
+    """Yields ``(line_number, row)`` from a CSV or NDJSON stream without reading it all."""
+    if file_format == "csv":
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def clean_row(row):
+    """
+    Returns ``(data, error)`` for one input row. Rows carry either a plain
+    ``password`` or a ``passwordHash`` already in Django's hasher format.
+    """
+    if not isinstance(row, dict):
+        return None, "Row is not a valid record."
+    email = (row.get("email") or "").strip()
+    firstName = (row.get("firstName") or "").strip()
+    lastName = (row.get("lastName") or "").strip()
+    phone = (row.get("phone") or "").strip() or None
+    try:
+        # The validator and length cap of RegisterSerializer's EmailField.
+        validate_email(email)
+        valid_email = len(email) <= 254
+    except ValidationError:
+        valid_email = False
+    if not valid_email:
+        return None, "Enter a valid email address."
+    if not firstName or not lastName:
+        return None, "firstName and lastName are required."
+    if len(firstName) > 255 or len(lastName) > 255 or (phone and len(phone) > 20):
+        return None, "A field is longer than allowed."
+    data = {
+        "email": User.objects.normalize_email(email),
+        "firstName": firstName,
+        "lastName": lastName,
+        "phone": phone,
+        "password": None,
+        "passwordHash": row.get("passwordHash") or None,
+    }
+    if data["passwordHash"]:
+        try:
+            identify_hasher(data["passwordHash"])
+        except ValueError:
+            return None, "passwordHash is not in a known Django hasher format."
+    elif row.get("password"):
+        data["password"] = row["password"]
+    else:
+        return None, "password or passwordHash is required."
+    return data, None
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    )
+
+
+def copy_payload(fields, objects, using=DEFAULT_DB_ALIAS):
+    """Renders ``objects`` in COPY's text format, one line per object."""
+    connection = connections[using]
+    buffer = io.StringIO()
+    for obj in objects:
+        buffer.write(
+            "\t".join(
+                _copy_value(field.get_db_prep_save(getattr(obj, field.attname), connection)) for field in fields
+            )
+        )
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_objects(model, field_names, objects, using=DEFAULT_DB_ALIAS):
+    """Loads unsaved ``objects`` into ``model``'s table on ``using`` with a single Postgres COPY."""
+    connection = connections[using]
+    fields = [model._meta.get_field(name) for name in field_names]
+    buffer = copy_payload(fields, objects, using)
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    sql = f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN"
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            raw.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+class UserImporter:
+    """
+    Imports users in chunks of ``batch_size``. Each chunk costs one
+    existing-email query, one hashing pass for plain passwords and one
+    transaction that loads users, default organisations and memberships,
+    through COPY on Postgres or bulk_create elsewhere. Conflicting emails
+    are skipped, updated in place, or abort the import (``fail``); chunks
+    already written stay committed.
+    """
+
+    def __init__(self, conflict="skip", batch_size=10000, executor=None, use_copy=None,
+                 on_error=None, on_progress=None):
+        if conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"conflict must be one of {', '.join(CONFLICT_POLICIES)}")
+        self.conflict = conflict
+        self.batch_size = batch_size
+        self.executor = executor
+        self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+        self.on_error = on_error or (lambda line, message: None)
+        self.on_progress = on_progress or (lambda stats: None)
+        self.stats = ImportStats()
+
+    def run(self, rows):
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                return self.stats
+            self._import_chunk(chunk)
+            self.on_progress(self.stats)
+
+    def _fail(self, line, message):
+        self.stats.failed += 1
+        self.on_error(line, message)
+
+    def _import_chunk(self, chunk):
+        cleaned = {}
+        for line, row in chunk:
+            data, error = clean_row(row)
+            if error:
+                self._fail(line, error)
+            elif data["email"].lower() in cleaned:
+                self._fail(line, "Duplicate email in file.")
+            else:
+                cleaned[data["email"].lower()] = (line, data)
+
+        existing = dict(
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=list(cleaned))
+            .values_list("email_lower", "pk")
+        )
+        if existing and self.conflict == "fail":
+            lines = sorted(cleaned[email][0] for email in existing)
+            raise ImportConflict(f"{len(existing)} emails already exist (lines {', '.join(map(str, lines[:10]))})")
+        if self.conflict == "skip":
+            self.stats.skipped += len(existing)
+            for email in existing:
+                del cleaned[email]
+
+        records = list(cleaned.values())
+        plain = [data for _, data in records if data["passwordHash"] is None]
+        for data, hashed in zip(plain, hash_passwords([data["password"] for data in plain], self.executor)):
+            data["passwordHash"] = hashed
+
+        new, updates = [], []
+        for _, data in records:
+            user = User(
+                email=data["email"],
+                firstName=data["firstName"],
+                lastName=data["lastName"],
+                phone=data["phone"],
+                password=data["passwordHash"],
+            )
+            pk = existing.get(data["email"].lower())
+            if pk is None:
+                new.append(user)
+            else:
+                user.pk = pk
+                user.version = F("version") + 1
+                updates.append(user)
+
+        with transaction.atomic():
+            if new:
+                self._insert(new)
+            if updates:
+                User.objects.bulk_update(updates, ["firstName", "lastName", "phone", "password", "version"], batch_size=1000)
+                transaction.on_commit(lambda: [user_cache.invalidate(user.pk) for user in updates])
+        self.stats.created += len(new)
+        self.stats.updated += len(updates)
+
+    def _insert(self, users):
+        if not self.use_copy:
+            create_registrations(users)
+            return
+        copy_objects(User, USER_COPY_FIELDS, users)
+        _resolve_pks(User, users, "userId")
+        pairs = [(user, default_organisation(user)) for user in users]
+        for alias, group in sharding.group_by_shard(pairs, lambda pair: pair[1].orgId).items():
+            using = alias or DEFAULT_DB_ALIAS
+            with sharding.use_shard(alias), sharding.atomic():
+                organisations = [organisation for _, organisation in group]
+                copy_objects(Organisation, ORGANISATION_COPY_FIELDS, organisations, using)
+                _resolve_pks(Organisation, organisations, "orgId")
+                copy_objects(
+                    Membership,
+                    MEMBERSHIP_COPY_FIELDS,
+                    [Membership(organisation_id=organisation.pk, user_id=user.pk) for user, organisation in group],
+                    using,
+                )
@@ -0,0 +1,398 @@
+import json
+import logging
+import math
+import random
+import re
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections
+from django.test.testcases import LiveServerThread
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import get_resolver
+from rest_framework.test import APIClient
+
+from auth_app import sharding
+from auth_app.membership import recount
+from auth_app.models import Membership, User, Organisation
+from auth_app.tokens import AuthRefreshToken
+
+PASSWORD = "benchmark-password"
+
+# The query count ServerTimingMiddleware reports in its Server-Timing header.
+SERVER_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def summarize(latencies, statuses, queries, wall):
+    errors = sum(1 for code in statuses if code >= 400)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statusCodes": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+        "throughputRps": round(len(latencies) / wall, 2) if wall else None,
+        "meanMs": round(statistics.fmean(latencies), 3) if latencies else None,
+        "p50Ms": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95Ms": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99Ms": round(percentile(latencies, 99), 3) if latencies else None,
+        "queriesPerRequest": round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+class Dataset:
+    """Seeded users, organisations and a skewed (Zipf-like) membership graph."""
+
+    def __init__(self, users, orgs, skew, seed):
+        self.random = random.Random(seed)
+        password_hash = make_password(PASSWORD)
+        User.objects.bulk_create(
+            [
+                User(
+                    userId=f"00000000-0000-4000-8000-{index:012d}",
+                    email=f"bench-{index}@example.com",
+                    firstName=f"Bench{index}",
+                    lastName="User",
+                    password=password_hash,
+                )
+                for index in range(users)
+            ]
+        )
+        self.users = list(User.objects.order_by("pk"))
+        self.admin = User.objects.create_superuser(
+            email="bench-admin@example.com", firstName="Bench", lastName="Admin", password=PASSWORD
+        )
+        Organisation.objects.bulk_create(
+            [Organisation(name=f"Bench Org {index}", description="Benchmark organisation") for index in range(orgs)]
+        )
+        self.orgs = list(Organisation.objects.order_by("pk"))
+
+        # A few organisations are very popular, most are small; user 0 acts as a
+        # service account that belongs to every organisation.
+        weights = [1 / (rank + 1) ** skew for rank in range(orgs)]
+        pairs = {(org.pk, self.users[0].pk) for org in self.orgs}
+        for user in self.users[1:]:
+            for org in self.random.choices(self.orgs, weights=weights, k=self.random.randint(1, 5)):
+                pairs.add((org.pk, user.pk))
+        Membership.objects.bulk_create(
+            [Membership(organisation_id=org_id, user_id=user_id) for org_id, user_id in pairs],
+            batch_size=1000,
+        )
+        recount(Organisation.objects.all())
+        self.memberships = {}
+        for org_id, user_id in pairs:
+            self.memberships.setdefault(user_id, []).append(org_id)
+        self.org_by_pk = {org.pk: org for org in self.orgs}
+        self.tokens = {}
+        self.refresh_tokens = {}
+
+    def token(self, user):
+        if user.pk not in self.tokens:
+            self.tokens[user.pk] = str(AuthRefreshToken.build_for_user(user).access_token)
+        return self.tokens[user.pk]
+
+    def refresh_token(self, user):
+        if user.pk not in self.refresh_tokens:
+            self.refresh_tokens[user.pk] = str(AuthRefreshToken.for_user(user))
+        return self.refresh_tokens[user.pk]
+
+    def user(self):
+        # Skew callers towards the service account and early users.
+        return self.users[min(int(self.random.paretovariate(1.2)) - 1, len(self.users) - 1)]
+
+    def member_org(self, user):
+        return self.org_by_pk[self.random.choice(self.memberships[user.pk])]
+
+
+def scenarios(data, run_id):
+    """Maps each auth_app URL name to a function building request ``i``."""
+
+    def register(i):
+        return "post", "/auth/register", {
+            "email": f"bench-register-{run_id}-{i}@example.com",
+            "firstName": "Register",
+            "lastName": "Bench",
+            "password": PASSWORD,
+        }, None
+
+    def register_bulk(i):
+        return "post", "/auth/register/bulk", {
+            "users": [
+                {
+                    "email": f"bench-bulk-{run_id}-{i}-{n}@example.com",
+                    "firstName": "Bulk",
+                    "lastName": "Bench",
+                    "password": PASSWORD,
+                }
+                for n in range(5)
+            ]
+        }, data.token(data.admin)
+
+    def login(i):
+        user = data.users[i % len(data.users)]
+        return "post", "/auth/login", {"email": user.email, "password": PASSWORD}, None
+
+    def token_refresh(i):
+        user = data.user()
+        return "post", "/auth/token/refresh", {"refreshToken": data.refresh_token(user)}, None
+
+    def logout(i):
+        # Each logout needs its own token; blacklisting a token twice is a no-op.
+        return "post", "/auth/logout", {"refreshToken": str(AuthRefreshToken.for_user(data.user()))}, None
+
+    def user_detail(i):
+        return "get", f"/api/users/{data.user().userId}", None, data.token(data.user())
+
+    def user_batch(i):
+        ids = ",".join(str(data.user().userId) for _ in range(20))
+        return "get", f"/api/users?ids={ids}", None, data.token(data.user())
+
+    def organisation_list(i):
+        return "get", "/api/organisations", None, data.token(data.user())
+
+    def organisation_search(i):
+        user = data.user()
+        query = data.member_org(user).name.split()[-1]
+        return "get", f"/api/organisations/search?q={query}", None, data.token(user)
+
+    def organisation_detail(i):
+        user = data.user()
+        return "get", f"/api/organisations/{data.member_org(user).orgId}", None, data.token(user)
+
+    def export_members(i):
+        # The service account belongs to every organisation, including the largest.
+        service = data.users[0]
+        return "get", f"/api/organisations/{data.orgs[i % len(data.orgs)].orgId}/members/export", None, data.token(service)
+
+    def organisation_create(i):
+        return "post", "/api/organisations", {"name": f"Bench Created {run_id}-{i}"}, data.token(data.user())
+
+    def add_user(i):
+        user = data.user()
+        org = data.member_org(user)
+        return "post", f"/api/organisations/{org.orgId}/users", {"userId": data.user().userId}, data.token(user)
+
+    def bulk_add_users(i):
+        user = data.user()
+        org = data.member_org(user)
+        userIds = [data.user().userId for _ in range(20)]
+        return "post", f"/api/organisations/{org.orgId}/users/bulk", {"userIds": userIds}, data.token(user)
+
+    def metrics(i):
+        return "get", "/api/metrics", None, data.token(data.admin)
+
+    return {
+        "register": register,
+        "register-bulk": register_bulk,
+        "login": login,
+        "token-refresh": token_refresh,
+        "logout": logout,
+        "user-detail": user_detail,
+        "user-batch": user_batch,
+        "organisation-list": organisation_list,
+        "organisation-search": organisation_search,
+        "organisation-detail": organisation_detail,
+        "organisation-create": organisation_create,
+        "add-user-to-organisation": add_user,
+        "bulk-add-users-to-organisation": bulk_add_users,
+        "export-organisation-members": export_members,
+        "metrics": metrics,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database and measures throughput, p50/p95/p99 "
+        "latency and query counts for every auth_app endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--orgs", type=int, default=50)
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of organisation popularity.")
+        parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Client threads in server mode.")
+        parser.add_argument("--mode", choices=["client", "server", "both"], default="both")
+        parser.add_argument("--endpoints", nargs="*", help="Only run these URL names.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        if sharding.enabled():
+            # The dataset is bulk-created on the default database only.
+            raise CommandError("benchmark does not support sharded databases; unset SHARD_DATABASE_URLS")
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        # Every benchmark request comes from one address; measure the endpoints, not the throttle.
+        try:
+            with override_settings(AUTH_THROTTLE={**settings.AUTH_THROTTLE, "ENABLED": False}):
+                report = self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        # A scenario that never succeeds measures nothing but its error path.
+        broken = [
+            f"{mode} {name}"
+            for mode, results in report["results"].items()
+            for name, result in results.items()
+            if result["requests"] and not any(code.startswith("2") for code in result["statusCodes"])
+        ]
+        if broken:
+            raise CommandError(f"No successful responses from: {', '.join(broken)}")
+
+    def run(self, options):
+        data = Dataset(options["users"], options["orgs"], options["skew"], options["seed"])
+        names = list(scenarios(data, "check"))
+        routes = {pattern.name for pattern in get_resolver("auth_app.urls").url_patterns}
+        missing = routes - set(names)
+        if missing:
+            self.stderr.write(f"No benchmark scenario for: {', '.join(sorted(missing))}")
+        if options["endpoints"]:
+            unknown = set(options["endpoints"]) - set(names)
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+            names = options["endpoints"]
+
+        def builders(mode):
+            # Each mode gets its own run id so created emails never collide.
+            built = scenarios(data, f"{mode}-{int(time.time())}")
+            return {name: built[name] for name in names}
+
+        report = {
+            "meta": {
+                "startedAt": datetime.now(timezone.utc).isoformat(),
+                "database": connection.vendor,
+                "users": options["users"],
+                "orgs": options["orgs"],
+                "skew": options["skew"],
+                "requestsPerEndpoint": options["requests"],
+                "concurrency": options["concurrency"],
+                "seed": options["seed"],
+            },
+            "results": {},
+        }
+        if options["mode"] in ("client", "both"):
+            report["results"]["client"] = {
+                name: self.run_client(name, build, options["requests"])
+                for name, build in builders("client").items()
+            }
+        if options["mode"] in ("server", "both"):
+            report["results"]["server"] = self.run_server(builders("server"), options["requests"], options["concurrency"])
+        return report
+
+    def run_client(self, name, build, count):
+        client = APIClient()
+        latencies, statuses, queries = [], [], []
+        started = time.perf_counter()
+        for i in range(count):
+            method, path, body, token = build(i)
+            client.credentials(**({"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}))
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                response = getattr(client, method)(path, body, format="json")
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            statuses.append(response.status_code)
+            queries.append(len(captured.captured_queries))
+        result = summarize(latencies, statuses, queries, time.perf_counter() - started)
+        self.report_line("client", name, result)
+        return result
+
+    def run_server(self, builders, count, concurrency):
+        # Share in-memory SQLite connections with the server thread, as
+        # LiveServerTestCase does.
+        overrides = {}
+        for conn in connections.all():
+            if conn.vendor == "sqlite" and conn.is_in_memory_db():
+                overrides[conn.alias] = conn
+                conn.inc_thread_sharing()
+                concurrency = 1
+        server = LiveServerThread("localhost", lambda handler: handler, connections_override=overrides)
+        server.daemon = True
+        server.start()
+        server.is_ready.wait()
+        if server.error:
+            raise server.error
+        base_url = f"http://localhost:{server.port}"
+        results = {}
+        # Have ServerTimingMiddleware report every request's query count,
+        # without logging a line per request.
+        timing = override_settings(
+            REQUEST_TIMING={**settings.REQUEST_TIMING, "ENABLED": True, "SAMPLE_RATE": 1.0, "HEADER": True}
+        )
+        timing.enable()
+        timing_logger = logging.getLogger("auth_app.timing")
+        timing_logger.disabled = True
+        try:
+            for name, build in builders.items():
+                requests = [build(i) for i in range(count)]
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    outcomes = list(pool.map(lambda request: self.send(base_url, *request), requests))
+                wall = time.perf_counter() - started
+                results[name] = summarize(
+                    [latency for latency, _, _ in outcomes],
+                    [code for _, code, _ in outcomes],
+                    [queries for _, _, queries in outcomes if queries is not None],
+                    wall,
+                )
+                self.report_line("server", name, results[name])
+        finally:
+            timing.disable()
+            timing_logger.disabled = False
+            server.terminate()
+            server.join()
+            for conn in overrides.values():
+                conn.dec_thread_sharing()
+        return results
+
+    def send(self, base_url, method, path, body, token):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        request = urllib.request.Request(
+            base_url + path,
+            # Bodies carry UUIDs, which the test client's renderer handles and json doesn't.
+            data=json.dumps(body, cls=DjangoJSONEncoder).encode() if body is not None else None,
+            headers=headers,
+            method=method.upper(),
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                code, headers = response.status, response.headers
+        except urllib.error.HTTPError as exc:
+            code, headers = exc.code, exc.headers
+        latency = (time.perf_counter() - started) * 1000
+        # Streamed responses report the queries run before the first byte.
+        queries = SERVER_QUERIES.search(headers.get("Server-Timing", ""))
+        return latency, code, int(queries.group(1)) if queries else None
+
+    def report_line(self, mode, name, result):
+        queries = result["queriesPerRequest"]
+        self.stdout.write(
+            f"[{mode}] {name:<32} {result['throughputRps']:>9} req/s  "
+            f"p50 {result['p50Ms']:>8}ms  p95 {result['p95Ms']:>8}ms  p99 {result['p99Ms']:>8}ms  "
+            f"errors {result['errors']:>4}"
+            + (f"  queries {queries}" if queries is not None else "")
+        )
@@ -0,0 +1,120 @@
+import io
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from auth_app.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+def organisation(index):
+    return {
+        "orgId": str(uuid.UUID(int=index)),
+        "name": f"Organisation {index}",
+        "description": "Default organisation",
+    }
+
+
+def payloads(organisations):
+    """Response bodies shaped like the hot endpoints, with ``organisations`` rows each."""
+    token = "e" * 40 + "." + "y" * 180 + "." + "s" * 43
+    joined = datetime(2024, 7, 1, 12, 30, tzinfo=timezone.utc)
+    return {
+        "login": {
+            "status": "success",
+            "message": "Login successful",
+            "data": {
+                "accessToken": token,
+                "refreshToken": token,
+                "user": {
+                    "userId": str(uuid.UUID(int=1)),
+                    "firstName": "Ada",
+                    "lastName": "Lovelace",
+                    "email": "ada@example.com",
+                    "phone": None,
+                    "organisations": [organisation(index) for index in range(organisations)],
+                },
+            },
+        },
+        "organisation-list": {
+            "status": "success",
+            "message": "Organisations retrieved successfully",
+            "data": {
+                "organisations": [organisation(index) for index in range(organisations)],
+                "nextCursor": "MTIzNDU",
+            },
+        },
+        # Raw UUIDs and datetimes, as export and streaming rows can carry.
+        "members": [
+            {
+                "userId": uuid.UUID(int=index),
+                "email": f"member-{index}@example.com",
+                "joinedAt": joined + timedelta(seconds=index, microseconds=index),
+            }
+            for index in range(organisations)
+        ],
+    }
+
+
+def per_call_us(function, argument, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function(argument)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSONRenderer/JSONParser with the orjson-backed "
+        "FastJSONRenderer/FastJSONParser on typical response bodies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+        parser.add_argument(
+            "--organisations",
+            type=int,
+            default=settings.ORGANISATION_PAGE_SIZE,
+            help="Organisations per response body.",
+        )
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        drf_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        drf_parser, fast_parser = JSONParser(), FastJSONParser()
+        report = {"orjson": orjson is not None, "iterations": options["iterations"], "payloads": {}}
+
+        for name, data in payloads(options["organisations"]).items():
+            body = drf_renderer.render(data)
+            if fast_renderer.render(data) != body:
+                raise CommandError(f"FastJSONRenderer output differs from JSONRenderer for {name}")
+            render = (
+                per_call_us(drf_renderer.render, data, options["iterations"]),
+                per_call_us(fast_renderer.render, data, options["iterations"]),
+            )
+            parse = (
+                per_call_us(lambda raw: drf_parser.parse(io.BytesIO(raw)), body, options["iterations"]),
+                per_call_us(lambda raw: fast_parser.parse(io.BytesIO(raw)), body, options["iterations"]),
+            )
+            report["payloads"][name] = {
+                "bytes": len(body),
+                "renderUs": {"drf": round(render[0], 2), "fast": round(render[1], 2)},
+                "parseUs": {"drf": round(parse[0], 2), "fast": round(parse[1], 2)},
+            }
+            self.stdout.write(
+                f"{name} ({len(body)} bytes): render {render[0]:.1f}us -> {render[1]:.1f}us "
+                f"(saves {render[0] - render[1]:.1f}us), parse {parse[0]:.1f}us -> {parse[1]:.1f}us "
+                f"(saves {parse[0] - parse[1]:.1f}us)"
+            )
+        if orjson is None:
+            self.stderr.write("orjson is not installed; both columns measure the stdlib path.")
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.routers import replica_health
+
+
+class Command(BaseCommand):
+    help = (
+        "Probes every read replica for availability and replication lag. "
+        "Exits non-zero when any replica would be skipped by the router."
+    )
+
+    def handle(self, *args, **options):
+        replicas = settings.REPLICA_ROUTING["REPLICAS"]
+        if not replicas:
+            self.stdout.write("No read replicas configured; reads use the primary.")
+            return
+        unhealthy = []
+        for alias in replicas:
+            healthy, lag = replica_health.check(alias)
+            if not healthy:
+                unhealthy.append(alias)
+            state = "ok" if healthy else "unavailable" if lag is None else "lagging"
+            self.stdout.write(f"{alias}: {state}" + ("" if lag is None else f", {lag:.2f}s behind"))
+        if unhealthy:
+            raise CommandError(f"Reads fall back to the primary for: {', '.join(unhealthy)}")
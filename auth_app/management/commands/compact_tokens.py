@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from auth_app.blacklist import blacklist_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired outstanding tokens (and, by cascade, their blacklist "
+        "entries) in small batches so the tables stay small without long locks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by("pk")
+        deleted = blacklisted = 0
+        while True:
+            ids = list(expired.values_list("pk", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            _, counts = OutstandingToken.objects.filter(pk__in=ids).delete()
+            deleted += counts.get("token_blacklist.OutstandingToken", 0)
+            blacklisted += counts.get("token_blacklist.BlacklistedToken", 0)
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        if deleted:
+            blacklist_index.invalidate()
+        self.stdout.write(f"Deleted {deleted} expired tokens ({blacklisted} blacklisted).")
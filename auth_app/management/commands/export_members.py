@@ -0,0 +1,62 @@
+import sys
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app import sharding
+from auth_app.export import CONTENT_TYPES, member_records, render_members
+from auth_app.models import Organisation
+from auth_app.pagination import InvalidCursor, decode_cursor
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams every member of an organisation as NDJSON or CSV. Pass the "
+        "last reported cursor as --after to resume an interrupted export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("orgId")
+        parser.add_argument("--type", choices=sorted(CONTENT_TYPES), default="ndjson")
+        parser.add_argument("--after", help="Resume after this cursor.")
+        parser.add_argument("--output", help="Append to this file instead of writing to stdout.")
+        parser.add_argument("--chunk-size", type=int, default=settings.MEMBER_EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            with sharding.for_org(options["orgId"]):
+                organisation = sharding.get_organisation(options["orgId"])
+            if options["after"]:
+                decode_cursor(options["after"])
+        except (Organisation.DoesNotExist, ValidationError):
+            raise CommandError(f"Organisation {options['orgId']} not found")
+        except InvalidCursor:
+            raise CommandError("--after must be a cursor from a previous export")
+
+        exported, last = 0, options["after"]
+
+        def tracked(records):
+            nonlocal exported, last
+            for record in records:
+                yield record
+                exported += 1
+                last = record["cursor"]
+
+        records = tracked(member_records(organisation, options["after"], options["chunk_size"]))
+        lines = render_members(records, options["type"])
+        if options["type"] == "csv" and options["after"]:
+            next(lines)  # A resumed CSV export appends to a file that already has its header.
+
+        handle = open(options["output"], "ab") if options["output"] else sys.stdout.buffer
+        # The memberships are read from the organisation's shard as the lines are written.
+        try:
+            with sharding.use_shard(organisation._state.db if sharding.enabled() else None):
+                for line in lines:
+                    handle.write(line)
+        finally:
+            if options["output"]:
+                handle.close()
+            else:
+                handle.flush()
+            self.stderr.write(f"Exported {exported} members; last cursor: {last or '-'}")
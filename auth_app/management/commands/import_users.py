@@ -0,0 +1,62 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.hashing import HashingExecutor
+from auth_app.importer import CONFLICT_POLICIES, ImportConflict, UserImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports users from a CSV or NDJSON file (or - for stdin), creating their "
+        "default organisations and memberships in bulk. Rows need email, "
+        "firstName, lastName and either password or passwordHash (Django hasher "
+        "format); phone is optional."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--type", choices=["csv", "ndjson"], help="Defaults to the file extension.")
+        parser.add_argument("--conflict", choices=CONFLICT_POLICIES, default="skip",
+                            help="What to do with emails that already exist.")
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASHING["WORKERS"],
+                            help="Processes hashing plain-text passwords; 1 or less hashes inline.")
+        parser.add_argument("--no-copy", action="store_true", help="Use bulk_create even on Postgres.")
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        file_format = options["type"] or ("csv" if options["path"].endswith(".csv") else "ndjson")
+        executor = HashingExecutor(workers=options["workers"], max_pending=max(options["workers"], 1) * 4, timeout=None)
+        importer = UserImporter(
+            conflict=options["conflict"],
+            batch_size=options["batch_size"],
+            executor=executor,
+            use_copy=False if options["no_copy"] else None,
+            on_error=self.report_error,
+            on_progress=self.report_progress,
+        )
+        handle = sys.stdin if options["path"] == "-" else open(options["path"], newline="", encoding="utf-8")
+        try:
+            stats = importer.run(read_rows(handle, file_format))
+        except ImportConflict as exc:
+            raise CommandError(f"{exc}; earlier batches were committed ({importer.stats.created} users created)")
+        finally:
+            executor.shutdown()
+            if handle is not sys.stdin:
+                handle.close()
+        self.stdout.write(
+            f"Imported {stats.processed} rows in {stats.elapsed:.1f}s: "
+            f"{stats.created} created, {stats.updated} updated, {stats.skipped} skipped, {stats.failed} failed"
+        )
+
+    def report_error(self, line, message):
+        self.stderr.write(f"line {line}: {message}")
+
+    def report_progress(self, stats):
+        if self.verbosity >= 1:
+            self.stderr.write(
+                f"{stats.processed} rows ({stats.created} created, {stats.updated} updated, "
+                f"{stats.skipped} skipped, {stats.failed} failed) {stats.rate:,.0f} rows/s"
+            )
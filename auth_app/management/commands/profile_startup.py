@@ -0,0 +1,118 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: loads the WSGI application the way a cold
+# serverless worker does, then serves one request through it.
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from StageEndpoint.wsgi import application
+loaded = time.perf_counter()
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+environ = {"PATH_INFO": sys.argv[1], "REQUEST_METHOD": sys.argv[2], "wsgi.input": BytesIO()}
+setup_testing_defaults(environ)
+statuses = []
+body = b"".join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+done = time.perf_counter()
+print(json.dumps({
+    "status": statuses[0],
+    "setupMs": (loaded - started) * 1000,
+    "firstResponseMs": (done - loaded) * 1000,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """Returns {module: (self_us, cumulative_us)} from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures cold start in fresh interpreters: per-module import time "
+        "and time to the first response through the WSGI application."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure; medians are reported.")
+        parser.add_argument("--path", default="/api/organisations", help="Path of the first request.")
+        parser.add_argument("--method", default="GET")
+        parser.add_argument("--top", type=int, default=20, help="Slowest modules to list.")
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        runs = [self.cold_start(options["path"], options["method"]) for _ in range(options["runs"])]
+
+        def median(key):
+            return round(statistics.median(run[key] for run in runs), 2)
+
+        imports = {}
+        for run in runs:
+            for name, (self_us, cumulative_us) in run["imports"].items():
+                imports.setdefault(name, []).append((self_us, cumulative_us))
+        slowest = sorted(
+            (
+                {
+                    "module": name,
+                    "selfMs": round(statistics.median(s for s, _ in samples) / 1000, 2),
+                    "cumulativeMs": round(statistics.median(c for _, c in samples) / 1000, 2),
+                }
+                for name, samples in imports.items()
+            ),
+            key=lambda row: row["selfMs"],
+            reverse=True,
+        )[: options["top"]]
+
+        report = {
+            "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+            "runs": options["runs"],
+            "status": runs[-1]["status"],
+            "processMs": median("processMs"),
+            "setupMs": median("setupMs"),
+            "firstResponseMs": median("firstResponseMs"),
+            "modules": runs[-1]["modules"],
+            "slowestImports": slowest,
+        }
+
+        self.stdout.write(
+            f"{report['settings']}: process {report['processMs']}ms, setup {report['setupMs']}ms, "
+            f"first response {report['firstResponseMs']}ms ({report['status']}), {report['modules']} modules"
+        )
+        for row in slowest:
+            self.stdout.write(f"  {row['selfMs']:>8.2f}ms self {row['cumulativeMs']:>9.2f}ms cumulative  {row['module']}")
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    def cold_start(self, path, method):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, path, method],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if completed.returncode != 0:
+            raise CommandError(f"Cold start failed:\n{completed.stderr[-2000:]}")
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        result["processMs"] = elapsed
+        result["imports"] = parse_importtime(completed.stderr)
+        return result
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app import resharding, sharding
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves organisations between shards while the service runs. Use --org "
+        "and --to for a single organisation, --pin-all before changing "
+        "SHARD_DATABASE_URLS so every organisation stays where it is, and "
+        "--rebalance afterwards to move organisations onto their new hash shard."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", help="orgId of the organisation to move.")
+        parser.add_argument("--to", help="Shard alias to move --org to.")
+        parser.add_argument("--pin-all", action="store_true", help="Record every organisation's current shard.")
+        parser.add_argument("--rebalance", action="store_true", help="Move organisations onto their hash shard.")
+        parser.add_argument("--dry-run", action="store_true", help="List the moves --rebalance would make.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between moves.")
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        if not sharding.enabled():
+            raise CommandError("Sharding is not configured; set SHARD_DATABASE_URLS.")
+        if sum(bool(options[name]) for name in ("org", "pin_all", "rebalance")) != 1:
+            raise CommandError("Pass exactly one of --org, --pin-all or --rebalance.")
+
+        try:
+            if options["org"]:
+                if not options["to"]:
+                    raise CommandError("--org needs --to.")
+                source = resharding.move_organisation(options["org"], options["to"])
+                if source is None:
+                    self.stdout.write(f"{options['org']} is already on {options['to']}")
+                else:
+                    self.stdout.write(f"Moved {options['org']} from {source} to {options['to']}")
+            elif options["pin_all"]:
+                added = resharding.pin_all(batch_size=options["batch_size"])
+                self.stdout.write(f"Pinned {added} organisations to their current shard")
+            else:
+                moves = resharding.rebalance(
+                    batch_size=options["batch_size"],
+                    sleep=options["sleep"],
+                    dry_run=options["dry_run"],
+                    on_move=self.report_move,
+                )
+                if options["dry_run"]:
+                    for orgId, source, target in moves:
+                        self.stdout.write(f"{orgId}: {source} -> {target}")
+                self.stdout.write(f"{'Would move' if options['dry_run'] else 'Moved'} {len(moves)} organisations")
+        except resharding.ReshardError as exc:
+            raise CommandError(str(exc))
+
+    def report_move(self, orgId, source, target):
+        if self.verbosity >= 2:
+            self.stderr.write(f"{orgId}: {source} -> {target}")
@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from auth_app import outbox
+
+# Processed and dead messages are purged, and dead ones reported, on this
+# period rather than on every poll.
+PURGE_EVERY_SECONDS = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        "Drains the transactional outbox: claims due messages in batches, runs "
+        "their handlers on a thread pool and retries failures with backoff. "
+        "Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        config = settings.OUTBOX
+        parser.add_argument("--batch-size", type=int, default=config["BATCH_SIZE"])
+        parser.add_argument("--workers", type=int, default=config["WORKERS"], help="Handler threads; 1 runs inline.")
+        parser.add_argument(
+            "--poll-interval", type=float, default=config["POLL_SECONDS"], help="Seconds to sleep when idle."
+        )
+        parser.add_argument("--once", action="store_true", help="Drain what is due now, then exit.")
+
+    def handle(self, *args, **options):
+        executor = outbox.make_executor(options["workers"])
+        succeeded = failed = 0
+        purged_at = None
+        try:
+            while True:
+                if purged_at is None or time.monotonic() - purged_at >= PURGE_EVERY_SECONDS:
+                    purged = outbox.purge()
+                    purged_at = time.monotonic()
+                    if purged and options["verbosity"] >= 2:
+                        self.stderr.write(f"Purged {purged} processed or dead messages")
+                    self.report_dead()
+                done, errors = outbox.drain(options["batch_size"], executor=executor)
+                succeeded += done
+                failed += errors
+                if options["once"]:
+                    break
+                if not done and not errors:
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self.stdout.write(f"Processed {succeeded} outbox messages, {failed} failed")
+        self.report_dead()
+
+    def report_dead(self):
+        dead = outbox.stats()["dead"]
+        if dead:
+            self.stderr.write(f"{dead} outbox messages gave up after MAX_ATTEMPTS; their last_error says why")
@@ -0,0 +1,142 @@
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from . import sharding
+from .models import Membership, Organisation, User
+
+
+def _cache():
+    return caches[settings.MEMBERSHIP_CACHE["ALIAS"]]
+
+
+def _key(user_id):
+    return f"auth_app:memberships:{user_id}"
+
+
+def get_org_ids(user_id):
+    """Returns the orgIds ``user_id`` belongs to, loading them on a cache miss."""
+    cache = _cache()
+    org_ids = cache.get(_key(user_id))
+    if org_ids is None:
+        shards = sharding.fan_out(
+            lambda alias: list(
+                Organisation.objects.using(alias).filter(memberships__user_id=user_id).values_list("orgId", flat=True)
+            )
+        )
+        org_ids = frozenset(str(org_id) for org_ids in shards for org_id in org_ids)
+        cache.set(_key(user_id), org_ids, settings.MEMBERSHIP_CACHE["TIMEOUT"])
+    return org_ids
+
+
+def is_member(user_id, organisation):
+    """
+    Answers from the cached orgId set when it is warm, otherwise with a
+    single-row probe on the (organisation, user) membership index.
+    """
+    org_ids = _cache().get(_key(user_id))
+    if org_ids is not None:
+        return str(organisation.orgId) in org_ids
+    return Membership.objects.filter(organisation_id=organisation.pk, user_id=user_id).exists()
+
+
+async def ais_member(user_id, organisation):
+    org_ids = await _cache().aget(_key(user_id))
+    if org_ids is not None:
+        return str(organisation.orgId) in org_ids
+    return await Membership.objects.filter(organisation_id=organisation.pk, user_id=user_id).aexists()
+
+
+def create_organisation(owner_id, fields):
+    """
+    Creates an organisation from validated ``fields`` with ``owner_id`` as
+    its first member. Both rows go to its hash shard in one transaction, so
+    an organisation never exists without its owner.
+    """
+    orgId = uuid.uuid4()
+    with sharding.use_shard(sharding.hash_shard(orgId)), transaction.atomic(), sharding.atomic():
+        organisation = Organisation.objects.create(**fields, orgId=orgId, member_count=1)
+        Membership.objects.create(organisation=organisation, user_id=owner_id)
+        touch_users([owner_id])
+    invalidate([owner_id])
+    return organisation
+
+
+def add_members(organisation, user_ids):
+    """
+    Adds ``user_ids`` to ``organisation`` with one bulk insert and returns
+    the ids that were actually added. The insert and the ``member_count``
+    update share a transaction holding the organisation's row lock, so
+    concurrent adds of the same user count it once: the count moves by the
+    rows the insert made, measured after it.
+    """
+    alias = organisation._state.db
+    with transaction.atomic(using=alias):
+        list(Organisation.objects.using(alias).select_for_update().filter(pk=organisation.pk).values_list("pk"))
+        members = Membership.objects.using(alias).filter(organisation_id=organisation.pk, user_id__in=user_ids)
+        before = set(members.values_list("user_id", flat=True))
+        new = [Membership(organisation_id=organisation.pk, user_id=user_id) for user_id in user_ids if user_id not in before]
+        Membership.objects.using(alias).bulk_create(new, ignore_conflicts=True)
+        added = [user_id for user_id in members.values_list("user_id", flat=True) if user_id not in before]
+        if added:
+            Organisation.objects.using(alias).filter(pk=organisation.pk).update(
+                member_count=F("member_count") + len(added), version=F("version") + 1
+            )
+    if added:
+        touch_users(added)
+        invalidate(added)
+    return added
+
+
+async def aadd_members(organisation, user_ids):
+    # The async ORM can't hold a transaction, so run the sync version in one.
+    return await sync_to_async(add_members)(organisation, user_ids)
+
+
+def adjust_member_count(organisation_id, delta):
+    """Moves ``member_count`` by ``delta`` in the database, safe under concurrent writers."""
+    Organisation.objects.filter(pk=organisation_id).update(
+        member_count=F("member_count") + delta, version=F("version") + 1
+    )
+
+
+def touch_users(user_ids):
+    """Bumps the version of users whose organisation list just changed."""
+    user_ids = list(user_ids)
+    if user_ids:
+        User.objects.filter(pk__in=user_ids).update(version=F("version") + 1)
+
+
+async def atouch_users(user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        await User.objects.filter(pk__in=user_ids).aupdate(version=F("version") + 1)
+
+
+def recount(organisations):
+    """Recomputes ``member_count`` for an Organisation queryset in one UPDATE."""
+    counts = (
+        Membership.objects.filter(organisation=OuterRef("pk"))
+        .order_by()
+        .values("organisation")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    organisations.update(member_count=Coalesce(Subquery(counts), 0), version=F("version") + 1)
+
+
+def invalidate(user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        _cache().delete_many([_key(user_id) for user_id in user_ids])
+
+
+async def ainvalidate(user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        await _cache().adelete_many([_key(user_id) for user_id in user_ids])
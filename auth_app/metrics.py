@@ -0,0 +1,33 @@
+import threading
+from collections import defaultdict
+
+
+class Counters:
+    """
+    Named per-process counters (and gauges, with negative amounts) for
+    admission decisions. Each worker process keeps its own; scrape them per
+    worker through the metrics endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(int)
+
+    def add(self, name, amount=1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def get(self, name):
+        with self._lock:
+            return self._counts[name]
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+counters = Counters()
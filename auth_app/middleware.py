@@ -0,0 +1,170 @@
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+from . import routers, timing
+
+logger = logging.getLogger("auth_app.timing")
+
+
+class ServerTimingMiddleware:
+    """
+    Records DB query count/time (through the connection's execute wrappers)
+    and the hash, jwt and render phases for a sample of requests, and reports
+    them as a ``Server-Timing`` header and a JSON log line. Requests slower
+    than ``SLOW_MS`` are always logged, sampled or not.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = settings.REQUEST_TIMING
+        if not config["ENABLED"]:
+            return self.get_response(request)
+        started = time.perf_counter()
+        timings, token = self._start(config)
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                timing.stop(token)
+        return self._finish(config, request, response, timings, started)
+
+    async def __acall__(self, request):
+        config = settings.REQUEST_TIMING
+        if not config["ENABLED"]:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        timings, token = self._start(config)
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                timing.stop(token)
+        return self._finish(config, request, response, timings, started)
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view returns; time that separately.
+        rendering = timing.phase("render")
+        rendering.__enter__()
+
+        def finish_render(rendered):
+            rendering.__exit__(None, None, None)
+
+        response.add_post_render_callback(finish_render)
+        return response
+
+    def _start(self, config):
+        if random.random() >= config["SAMPLE_RATE"]:
+            return None, None
+        for connection in connections.all(initialized_only=True):
+            timing.install(connection)
+        return timing.start()
+
+    def _finish(self, config, request, response, timings, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        slow = total_ms >= config["SLOW_MS"]
+        if timings is None and not slow:
+            return response
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "totalMs": round(total_ms, 2),
+        }
+        metrics = []
+        if timings is not None:
+            record["queries"] = timings.queries
+            record["dbMs"] = round(timings.query_ms, 2)
+            metrics.append(f'db;dur={timings.query_ms:.2f};desc="{timings.queries} queries"')
+            for name, ms in timings.phases.items():
+                record[f"{name}Ms"] = round(ms, 2)
+                metrics.append(f"{name};dur={ms:.2f}")
+            metrics.append(f"total;dur={total_ms:.2f}")
+            if config["HEADER"]:
+                response["Server-Timing"] = ", ".join(metrics)
+
+        if slow:
+            logger.warning(json.dumps({"event": "slow_request", **record}))
+        else:
+            logger.info(json.dumps({"event": "request_timing", **record}))
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Read-your-writes for ReplicaRouter. A request that writes gets a signed
+    cookie pinning the client's reads to the primary for PIN_SECONDS, long
+    enough for replicas to catch up; requests that carry a valid pin read
+    from the primary. Does nothing while no replicas are configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+    signer = signing.TimestampSigner(salt="auth_app.replica-pin")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = settings.REPLICA_ROUTING
+        if not config["REPLICAS"]:
+            return self.get_response(request)
+        state, token = routers.start(self._pinned(config, request))
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.stop(token)
+        return self._finish(config, request, response, state)
+
+    async def __acall__(self, request):
+        config = settings.REPLICA_ROUTING
+        if not config["REPLICAS"]:
+            return await self.get_response(request)
+        state, token = routers.start(self._pinned(config, request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.stop(token)
+        return self._finish(config, request, response, state)
+
+    def _pinned(self, config, request):
+        value = request.COOKIES.get(config["PIN_COOKIE"])
+        if not value:
+            return False
+        try:
+            self.signer.unsign(value, max_age=config["PIN_SECONDS"])
+        except signing.BadSignature:
+            return False
+        return True
+
+    def _finish(self, config, request, response, state):
+        if state.wrote:
+            response.set_cookie(
+                config["PIN_COOKIE"],
+                self.signer.sign("primary"),
+                max_age=config["PIN_SECONDS"],
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:22
+#
+# Emails that differ only in case would make the new index fail to build,
+# so they are listed first and have to be merged or renamed by hand.
+
+import django.db.models.functions.text
+from django.db import migrations, models, router
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# How many conflicting addresses the error lists.
+REPORT_LIMIT = 20
+
+
+def check_case_duplicates(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    User = apps.get_model("auth_app", "User")
+    if not router.allow_migrate_model(alias, User):
+        return
+    users = User._base_manager.using(alias).annotate(email_ci=Lower("email"))
+    duplicates = users.values("email_ci").annotate(count=Count("pk")).filter(count__gt=1).order_by("email_ci")
+    total = duplicates.count()
+    if not total:
+        return
+    conflicts = []
+    for row in duplicates[:REPORT_LIMIT]:
+        accounts = users.filter(email_ci=row["email_ci"]).order_by("pk").values_list("pk", "email")
+        conflicts.append("  " + ", ".join(f"pk={pk} {email}" for pk, email in accounts))
+    raise ValueError(
+        f"{total} email addresses are used by more than one user when case is ignored; merge or rename "
+        "them before migrating:\n" + "\n".join(conflicts)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('auth_app', '0004_rename_org_id_organisation_orgid_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='auth_app_user_email_ci_unique'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Expand step of the userId/orgId move to native UUID columns: add nullable
+# shadow columns the backfill (0007) can fill without locking the tables.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0005_user_email_ci_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='userId_uuid',
+            field=models.UUIDField(null=True),
+        ),
+        migrations.AddField(
+            model_name='organisation',
+            name='orgId_uuid',
+            field=models.UUIDField(null=True),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Copies the string identifiers into the UUID shadow columns in small
+# batches, each in its own transaction, so it can run against a live
+# database and be resumed if interrupted. Identifiers that aren't UUIDs
+# stop it before anything is written: clients and other systems hold them,
+# so they have to be mapped by hand rather than replaced.
+
+import uuid
+
+from django.db import migrations, router, transaction
+
+BATCH_SIZE = 2000
+
+COLUMNS = (
+    ("User", "userId", "userId_uuid"),
+    ("Organisation", "orgId", "orgId_uuid"),
+)
+
+
+# How many offending rows the error lists.
+REPORT_LIMIT = 20
+
+
+def _as_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _pending(apps, alias):
+    for model_name, source, target in COLUMNS:
+        model = apps.get_model("auth_app", model_name)
+        if router.allow_migrate_model(alias, model):
+            yield model, source, target, model._base_manager.using(alias).filter(**{f"{target}__isnull": True})
+
+
+def check_identifiers(apps, alias):
+    invalid, count = [], 0
+    for model, source, _, pending in _pending(apps, alias):
+        for pk, value in pending.values_list("pk", source).iterator(chunk_size=BATCH_SIZE):
+            if _as_uuid(value) is None:
+                count += 1
+                if len(invalid) < REPORT_LIMIT:
+                    invalid.append(f"  {model.__name__} pk={pk} {source}={value!r}")
+    if count:
+        raise ValueError(
+            f"{count} identifiers are not UUIDs; give them UUIDs (and tell whoever holds them) "
+            "before migrating:\n" + "\n".join(invalid)
+        )
+
+
+def backfill(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    check_identifiers(apps, alias)
+    for model, source, target, pending in _pending(apps, alias):
+        pending = pending.order_by("pk")
+        last_pk = 0
+        while True:
+            batch = list(pending.filter(pk__gt=last_pk).only("pk", source)[:BATCH_SIZE])
+            if not batch:
+                break
+            for row in batch:
+                setattr(row, target, _as_uuid(getattr(row, source)))
+            with transaction.atomic(using=alias):
+                model._base_manager.using(alias).bulk_update(batch, [target], batch_size=500)
+            last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('auth_app', '0006_uuid_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop, elidable=True),
+    ]
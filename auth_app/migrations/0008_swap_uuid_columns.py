@@ -0,0 +1,63 @@
+# Swap step: the UUID columns take over the userId/orgId names and unique
+# indexes. The string columns are kept, nullable, as *_legacy so this step
+# can be reversed. They are dropped by a contract migration in a later
+# release, once no process runs the string-id code.
+
+import importlib
+import uuid
+
+from django.db import migrations, models
+
+backfill = importlib.import_module("auth_app.migrations.0007_backfill_uuid_columns").backfill
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0007_backfill_uuid_columns'),
+    ]
+
+    operations = [
+        # Rows written by the previous release since 0007 ran.
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RenameField(
+            model_name='user',
+            old_name='userId',
+            new_name='userId_legacy',
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='userId_legacy',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.RenameField(
+            model_name='user',
+            old_name='userId_uuid',
+            new_name='userId',
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='userId',
+            field=models.UUIDField(default=uuid.uuid4, unique=True),
+        ),
+        migrations.RenameField(
+            model_name='organisation',
+            old_name='orgId',
+            new_name='orgId_legacy',
+        ),
+        migrations.AlterField(
+            model_name='organisation',
+            name='orgId_legacy',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.RenameField(
+            model_name='organisation',
+            old_name='orgId_uuid',
+            new_name='orgId',
+        ),
+        migrations.AlterField(
+            model_name='organisation',
+            name='orgId',
+            field=models.UUIDField(default=uuid.uuid4, unique=True),
+        ),
+    ]
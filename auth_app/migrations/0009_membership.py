@@ -0,0 +1,76 @@
+# Turns the implicit Organisation.users table into the explicit Membership
+# model without copying data: the model is adopted in state only, then the
+# new columns and indexes are added and the indexes they make redundant
+# are dropped.
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0008_swap_uuid_columns'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Membership',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('organisation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='auth_app.organisation')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'auth_app_organisation_users',
+                        'unique_together': {('organisation', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='organisation',
+                    name='users',
+                    field=models.ManyToManyField(related_name='organisations', through='auth_app.Membership', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='membership',
+            name='joined_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AddField(
+            model_name='organisation',
+            name='member_count',
+            field=models.PositiveIntegerField(db_default=0, default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='membership',
+            constraint=models.UniqueConstraint(fields=('user', 'organisation'), name='auth_app_membership_user_org_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['organisation', 'user'], name='auth_app_membership_org_user'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['organisation', 'joined_at'], name='auth_app_membership_org_joined'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='membership',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='membership',
+            name='organisation',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='auth_app.organisation'),
+        ),
+        migrations.AlterField(
+            model_name='membership',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
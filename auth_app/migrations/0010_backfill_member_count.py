@@ -0,0 +1,46 @@
+# Fills Organisation.member_count from the membership table in primary-key
+# batches, one transaction per batch.
+
+from django.db import migrations, router, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 2000
+
+
+def backfill(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Organisation = apps.get_model("auth_app", "Organisation")
+    Membership = apps.get_model("auth_app", "Membership")
+    if not router.allow_migrate_model(alias, Organisation):
+        return
+    counts = (
+        Membership.objects.using(alias)
+        .filter(organisation=OuterRef("pk"))
+        .order_by()
+        .values("organisation")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    organisations = Organisation._base_manager.using(alias).order_by("pk")
+    last_pk = 0
+    while True:
+        pks = list(organisations.filter(pk__gt=last_pk).values_list("pk", flat=True)[:BATCH_SIZE])
+        if not pks:
+            break
+        with transaction.atomic(using=alias):
+            organisations.filter(pk__in=pks).update(member_count=Coalesce(Subquery(counts), 0))
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('auth_app', '0009_membership'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop, elidable=True),
+    ]
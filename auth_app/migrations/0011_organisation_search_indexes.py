@@ -0,0 +1,42 @@
+# Trigram indexes for organisation search. Django's icontains compiles to
+# UPPER(column) LIKE UPPER(...) on Postgres, so the GIN indexes are built on
+# the same expressions. They are created concurrently and only on Postgres;
+# other backends fall back to scanning the caller's memberships.
+
+from django.db import migrations
+
+INDEXES = (
+    ("auth_app_organisation_name_trgm", "name"),
+    ("auth_app_organisation_description_trgm", "description"),
+)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+            f'ON "auth_app_organisation" USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('auth_app', '0010_backfill_member_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
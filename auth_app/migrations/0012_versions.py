@@ -0,0 +1,24 @@
+# Version counters behind the detail endpoints' ETags. The constant database
+# default lets Postgres add the columns without rewriting either table.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0011_organisation_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organisation',
+            name='version',
+            field=models.PositiveIntegerField(db_default=1, default=1),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='version',
+            field=models.PositiveIntegerField(db_default=1, default=1),
+        ),
+    ]
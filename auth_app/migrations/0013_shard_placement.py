@@ -0,0 +1,29 @@
+# Organisation sharding: the placement directory for moved organisations, and
+# dropping the membership -> user constraint, which can't hold once
+# memberships live on a different database from users.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0012_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShardPlacement',
+            fields=[
+                ('orgId', models.UUIDField(primary_key=True, serialize=False)),
+                ('database', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='membership',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Marks outbox messages that exhausted their attempts, and keeps them out of
+# the pending index. Existing ones are marked by the worker's next purge.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0014_outbox_message'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='outboxmessage',
+            name='auth_app_outbox_pending',
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='dead_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(condition=models.Q(('dead_at__isnull', True), ('processed_at__isnull', True)), fields=['available_at'], name='auth_app_outbox_pending'),
+        ),
+    ]
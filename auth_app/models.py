@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Lower, Now
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -12,7 +14,7 @@ import uuid
 class UserManager(BaseUserManager):
 
     def create_user(
-        self, email, firstName, lastName, phone=None, password=None, **extra_fields
+        self, email, firstName, lastName, phone=None, password=None, password_hash=None, **extra_fields
     ):
         if not email:
             raise ValueError("The Email field must be set")
@@ -29,8 +31,10 @@ class UserManager(BaseUserManager):
             phone=phone,
             **extra_fields
         )
-        user.userId = str(uuid.uuid4())
-        user.set_password(password)
+        if password_hash is not None:
+            user.password = password_hash
+        else:
+            user.set_password(password)
         user.save(using=self._db)
         return user
 
@@ -48,8 +52,43 @@ class UserManager(BaseUserManager):
         )
 
 
-class User(AbstractBaseUser, PermissionsMixin):
-    userId = models.CharField(max_length=255, unique=True)
+def parse_uuid(value):
+    """Returns ``value`` as a UUID, or None when it is not a valid UUID string."""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class VersionedModel(models.Model):
+    """
+    Adds a ``version`` counter that every save of an existing row moves up
+    by one in the database, so it can back a strong ETag. Bulk updates
+    that change what an endpoint shows have to bump it themselves.
+    """
+
+    version = models.PositiveIntegerField(default=1, db_default=1)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, update_fields=None, **kwargs):
+        bump = not self._state.adding
+        if bump:
+            self.version = F("version") + 1
+            if update_fields is not None:
+                update_fields = {*update_fields, "version"}
+        super().save(*args, update_fields=update_fields, **kwargs)
+        if bump:
+            # Leave the field deferred instead of reading it back: only code
+            # that asks for the new version pays for the one-column SELECT.
+            del self.version
+
+
+class User(VersionedModel, AbstractBaseUser, PermissionsMixin):
+    userId = models.UUIDField(unique=True, default=uuid.uuid4)
+    # The pre-UUID identifier, left by migration 0008; dropped in a later release.
+    userId_legacy = models.CharField(max_length=255, null=True)
     firstName = models.CharField(max_length=255)
     lastName = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
@@ -68,15 +107,113 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["firstName", "lastName"]
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(Lower("email"), name="auth_app_user_email_ci_unique"),
+        ]
+
     def __str__(self):
         return self.email
 
 
-class Organisation(models.Model):
-    orgId = models.CharField(max_length=255, unique=True, default=uuid.uuid4)
+class ShardedManager(models.Manager):
+    """Manager for the models auth_app.sharding partitions by organisation."""
+
+    def for_org(self, orgId):
+        """A queryset on the shard holding ``orgId``; ordinary routing while sharding is off."""
+        from . import sharding
+
+        return self.using(sharding.shard_for(orgId))
+
+
+class Organisation(VersionedModel):
+    orgId = models.UUIDField(unique=True, default=uuid.uuid4)
+    # The pre-UUID identifier, left by migration 0008; dropped in a later release.
+    orgId_legacy = models.CharField(max_length=255, null=True)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
-    users = models.ManyToManyField(User, related_name="organisations")
+    users = models.ManyToManyField(User, related_name="organisations", through="Membership")
+    # Kept in step with Membership rows by auth_app.membership and signals.
+    member_count = models.PositiveIntegerField(default=0, db_default=0)
+
+    objects = ShardedManager()
 
     def __str__(self):
         return self.name
+
+
+class Membership(models.Model):
+    # Reuses the table Django created for the implicit many-to-many. The
+    # composite indexes below cover both foreign keys, so neither gets its own.
+    id = models.BigAutoField(primary_key=True)
+    organisation = models.ForeignKey(
+        Organisation, on_delete=models.CASCADE, related_name="memberships", db_index=False
+    )
+    # No database constraint: with sharding enabled, memberships live on the
+    # organisation's shard while users stay on the default database.
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="memberships", db_index=False, db_constraint=False
+    )
+    # A database default lets rows inserted without it (older releases) still get a timestamp.
+    joined_at = models.DateTimeField(db_default=Now())
+
+    objects = ShardedManager()
+
+    class Meta:
+        db_table = "auth_app_organisation_users"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "organisation"], name="auth_app_membership_user_org_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["organisation", "user"], name="auth_app_membership_org_user"),
+            models.Index(fields=["organisation", "joined_at"], name="auth_app_membership_org_joined"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in {self.organisation_id}"
+
+
+class ShardPlacement(models.Model):
+    """
+    Directory of organisations that live somewhere other than their hash
+    shard (see auth_app.sharding), kept on the default database.
+    """
+
+    orgId = models.UUIDField(primary_key=True)
+    database = models.CharField(max_length=100)
+
+    def __str__(self):
+        return f"{self.orgId} on {self.database}"
+
+
+class OutboxMessage(models.Model):
+    """
+    A side effect recorded in the same transaction as the change that
+    caused it, carried out afterwards by run_outbox_worker (see
+    auth_app.outbox).
+    """
+
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    # Enqueueing a key twice keeps one message; handlers use it to stay idempotent.
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    attempts = models.PositiveIntegerField(default=0)
+    # When the message may next be claimed: moved forward by leases and retry backoff.
+    available_at = models.DateTimeField(db_default=Now())
+    created_at = models.DateTimeField(db_default=Now())
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Set once the message has failed MAX_ATTEMPTS times; it is never claimed again.
+    dead_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["available_at"],
+                condition=Q(processed_at__isnull=True, dead_at__isnull=True),
+                name="auth_app_outbox_pending",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} {self.idempotency_key}"
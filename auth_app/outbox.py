@@ -0,0 +1,164 @@
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger("auth_app.outbox")
+
+_handlers = {}
+
+
+class UnknownTopic(LookupError):
+    pass
+
+
+def handler(topic):
+    """
+    Registers ``function(message)`` as the handler for ``topic``. A message
+    can be delivered more than once (a worker may die after the handler
+    ran), so handlers key their writes on ``message.idempotency_key`` or on
+    something in the payload.
+    """
+
+    def register(function):
+        _handlers[topic] = function
+        return function
+
+    return register
+
+
+def enqueue(topic, payload, key):
+    """
+    Records a side effect for the worker. Call it inside the transaction
+    making the change, so the message commits or rolls back with it. A
+    ``key`` that was already enqueued is ignored.
+    """
+    OutboxMessage.objects.bulk_create(
+        [OutboxMessage(topic=topic, payload=payload, idempotency_key=key)], ignore_conflicts=True
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before attempt ``attempts + 1``: exponential, capped at RETRY_MAX_SECONDS."""
+    config = settings.OUTBOX
+    return min(config["RETRY_MAX_SECONDS"], config["RETRY_BASE_SECONDS"] * 2 ** (attempts - 1))
+
+
+def claim(batch_size):
+    """
+    Leases up to ``batch_size`` due messages to the caller. Rows another
+    worker is claiming are skipped rather than waited on, and messages held
+    by a worker that dies become due again after LEASE_SECONDS.
+    """
+    config = settings.OUTBOX
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                processed_at__isnull=True,
+                dead_at__isnull=True,
+                available_at__lte=now,
+                attempts__lt=config["MAX_ATTEMPTS"],
+            )
+            .order_by("available_at", "pk")[:batch_size]
+        )
+        if messages:
+            OutboxMessage.objects.filter(pk__in=[message.pk for message in messages]).update(
+                attempts=F("attempts") + 1, available_at=now + timedelta(seconds=config["LEASE_SECONDS"])
+            )
+    for message in messages:
+        message.attempts += 1
+    return messages
+
+
+def process(message):
+    """
+    Runs the handler of one claimed message. Its writes and the processed
+    mark commit together; a failure schedules a retry, or after
+    MAX_ATTEMPTS marks the message dead and keeps it and its error for
+    inspection until purge(). Returns whether the handler succeeded.
+    """
+    try:
+        function = _handlers.get(message.topic)
+        if function is None:
+            raise UnknownTopic(f"No outbox handler for {message.topic}")
+        with transaction.atomic():
+            function(message)
+            OutboxMessage.objects.filter(pk=message.pk).update(processed_at=timezone.now(), last_error="")
+    except Exception:
+        error = traceback.format_exc()
+        if message.attempts >= settings.OUTBOX["MAX_ATTEMPTS"]:
+            logger.error("Giving up on outbox message %s after %d attempts", message.pk, message.attempts)
+            OutboxMessage.objects.filter(pk=message.pk).update(dead_at=timezone.now(), last_error=error)
+            return False
+        logger.warning("Outbox message %s failed, attempt %d", message.pk, message.attempts)
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            available_at=timezone.now() + timedelta(seconds=retry_delay(message.attempts)), last_error=error
+        )
+        return False
+    return True
+
+
+def _process_in_thread(message):
+    # Pool threads hold their own connections; recycle them like a request would.
+    close_old_connections()
+    try:
+        return process(message)
+    finally:
+        close_old_connections()
+
+
+def drain(batch_size, executor=None):
+    """
+    Claims and processes batches until no message is due, running each
+    batch on ``executor`` when given. Returns ``(succeeded, failed)``.
+    """
+    succeeded = failed = 0
+    while True:
+        messages = claim(batch_size)
+        if not messages:
+            return succeeded, failed
+        if executor is None:
+            results = [process(message) for message in messages]
+        else:
+            results = list(executor.map(_process_in_thread, messages))
+        succeeded += results.count(True)
+        failed += results.count(False)
+
+
+def make_executor(workers):
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth_app-outbox") if workers > 1 else None
+
+
+def purge():
+    """
+    Marks dead the messages whose last attempt was claimed by a worker that
+    never reported back, then deletes messages processed or dead for more
+    than RETENTION_DAYS; returns how many were deleted.
+    """
+    now = timezone.now()
+    OutboxMessage.objects.filter(
+        processed_at__isnull=True,
+        dead_at__isnull=True,
+        attempts__gte=settings.OUTBOX["MAX_ATTEMPTS"],
+        available_at__lte=now,
+    ).update(dead_at=now)
+    cutoff = now - timedelta(days=settings.OUTBOX["RETENTION_DAYS"])
+    deleted, _ = OutboxMessage.objects.filter(Q(processed_at__lt=cutoff) | Q(dead_at__lt=cutoff)).delete()
+    return deleted
+
+
+def stats():
+    """Counts of messages still to deliver and of dead ones, in one query."""
+    return OutboxMessage.objects.filter(processed_at__isnull=True).aggregate(
+        pending=Count("pk", filter=Q(dead_at__isnull=True)),
+        dead=Count("pk", filter=Q(dead_at__isnull=False)),
+    )
@@ -0,0 +1,176 @@
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models.functions import Lower
+
+from . import membership, sharding
+from .hashing import ahash_password, hash_password, hash_passwords
+from .models import Membership, User, Organisation
+from .tokens import AuthRefreshToken
+
+
+class DuplicateEmail(Exception):
+    pass
+
+
+EMAIL_CONSTRAINT = "auth_app_user_email_ci_unique"
+
+_email_constraints = {}
+
+
+def _email_constraint_names(alias):
+    # The case-insensitive index, plus the column's own unique index, whose
+    # name depends on the backend and on how the table was created.
+    if alias not in _email_constraints:
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, User._meta.db_table)
+        _email_constraints[alias] = {EMAIL_CONSTRAINT} | {
+            name for name, info in constraints.items() if info["unique"] and info["columns"] == ["email"]
+        }
+    return _email_constraints[alias]
+
+
+def _is_duplicate_email(error):
+    """Whether ``error`` comes from one of the unique indexes on the user's email."""
+    names = _email_constraint_names(router.db_for_write(User))
+    diag = getattr(error.__cause__, "diag", None)
+    if diag is not None:
+        # psycopg names the violated constraint.
+        return diag.constraint_name in names
+    # SQLite only names it in the message, and the column for inline UNIQUE.
+    message = str(error)
+    return any(f"'{name}'" in message for name in names) or message.endswith(f"{User._meta.db_table}.email")
+
+
+def _resolve_pks(model, objects, field):
+    # bulk_create only sets primary keys on backends that can return them.
+    missing = {str(getattr(obj, field)): obj for obj in objects if obj.pk is None}
+    if not missing:
+        return
+    lookup = {f"{field}__in": list(missing)}
+    for value, pk in model.objects.filter(**lookup).values_list(field, "pk"):
+        missing[str(value)].pk = pk
+
+
+def register_user(data):
+    """
+    Registers one user with their default organisation and returns
+    ``(user, organisation, refresh_token)``. All writes share one transaction
+    and uniqueness is left to the case-insensitive email index, so a
+    registration costs four INSERTs (the last an outbox message) and no
+    reads.
+    """
+    return _create_registration(data, hash_password(data["password"]))
+
+
+async def aregister_user(data):
+    # Django's async ORM has no transactions yet, so the atomic write block
+    # runs as a single thread hop once the password has been hashed.
+    password_hash = await ahash_password(data["password"])
+    return await sync_to_async(_create_registration)(data, password_hash)
+
+
+def _create_registration(data, password_hash):
+    try:
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email=data["email"],
+                firstName=data["firstName"],
+                lastName=data["lastName"],
+                phone=data.get("phone"),
+                password_hash=password_hash,
+            )
+            organisation = default_organisation(user)
+            with sharding.use_shard(sharding.hash_shard(organisation.orgId)), sharding.atomic():
+                organisation.save(force_insert=True)
+                # Insert the membership row directly; users.add() reads existing rows first.
+                Membership.objects.create(organisation_id=organisation.pk, user_id=user.pk)
+            # The outstanding token row isn't needed to answer; the outbox worker writes it.
+            refresh = AuthRefreshToken.for_user_deferred(user)
+    except IntegrityError as error:
+        if not _is_duplicate_email(error):
+            raise
+        raise DuplicateEmail(data["email"])
+    membership.invalidate([user.pk])
+    return user, organisation, refresh
+
+
+def existing_emails(emails):
+    """Which of the lowercased ``emails`` are taken, in one query on the case-insensitive index."""
+    return set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=list(emails))
+        .values_list("email_lower", flat=True)
+    )
+
+
+def bulk_register_users(rows, batch_size=1000):
+    """
+    Creates users, their default organisations and memberships from already
+    validated registration rows using one bulk insert per table. Returns the
+    users in row order, with None for rows whose email was registered
+    concurrently after the caller checked it.
+    """
+    hashes = hash_passwords([row["password"] for row in rows])
+    users = [
+        User(
+            email=User.objects.normalize_email(row["email"]),
+            firstName=row["firstName"],
+            lastName=row["lastName"],
+            phone=row.get("phone"),
+            password=hashed,
+        )
+        for row, hashed in zip(rows, hashes)
+    ]
+    pending, taken = users, set()
+    while pending:
+        try:
+            with transaction.atomic():
+                create_registrations(pending, batch_size)
+            break
+        except IntegrityError as error:
+            if not _is_duplicate_email(error):
+                raise
+            conflicts = existing_emails(user.email.lower() for user in pending)
+            if not conflicts:
+                raise
+            taken |= conflicts
+            pending = [user for user in pending if user.email.lower() not in conflicts]
+            for user in pending:
+                # Primary keys from the rolled back inserts don't exist.
+                user.pk = None
+                user._state.adding = True
+    return [None if user.email.lower() in taken else user for user in users]
+
+
+def default_organisation(user):
+    return Organisation(
+        name=f"{user.firstName}'s Organisation",
+        description="Default organisation",
+        member_count=1,
+    )
+
+
+def create_registrations(users, batch_size=1000):
+    """
+    Inserts unsaved ``users`` (passwords already hashed) together with their
+    default organisations and memberships, one bulk insert per table (per
+    shard when organisations are sharded). Must run inside a transaction.
+    """
+    User.objects.bulk_create(users, batch_size=batch_size)
+    _resolve_pks(User, users, "userId")
+
+    pairs = [(user, default_organisation(user)) for user in users]
+    for alias, group in sharding.group_by_shard(pairs, lambda pair: pair[1].orgId).items():
+        with sharding.use_shard(alias), sharding.atomic():
+            organisations = [organisation for _, organisation in group]
+            Organisation.objects.bulk_create(organisations, batch_size=batch_size)
+            _resolve_pks(Organisation, organisations, "orgId")
+            Membership.objects.bulk_create(
+                [Membership(organisation_id=organisation.pk, user_id=user.pk) for user, organisation in group],
+                batch_size=batch_size,
+            )
+    organisations = [organisation for _, organisation in pairs]
+    # bulk_create bypasses m2m_changed, so drop cached memberships here.
+    transaction.on_commit(lambda: membership.invalidate(user.pk for user in users))
+    return organisations
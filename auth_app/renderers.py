@@ -0,0 +1,85 @@
+import io
+import json
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - the stdlib path is DRF's own
+    orjson = None
+
+# Unlike the stdlib, orjson leaves U+2028/U+2029 unescaped; DRF escapes them
+# so responses stay valid JavaScript.
+_LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that serializes with orjson when it is installed.
+    Output matches DRF's compact, unicode, strict rendering byte for byte:
+    UUIDs, dates and datetimes are formatted natively in the same shape,
+    everything else goes through DRF's encoder, and anything orjson refuses
+    (non-string keys, integers over 64 bits) is rendered by DRF instead.
+    Indented output (the browsable API, ``; indent=``) and non-default
+    UNICODE_JSON/COMPACT_JSON settings are left to DRF as well. The one
+    difference is NaN and infinity, which come out as null rather than
+    raising.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80" in ret:
+            for raw, escaped in _LINE_SEPARATORS:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser that decodes UTF-8 bodies with orjson. Bodies orjson rejects
+    are handed to DRF's parser, so malformed input gets the same ParseError
+    message as before.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+def loads(data):
+    """Decodes a JSON document from bytes or str, raising ValueError when malformed."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def request_data(request):
+    """The parsed body of a plain Django request: JSON when sent as JSON, else the form data."""
+    if request.content_type == "application/json":
+        try:
+            return loads(request.body or b"{}")
+        except ValueError:
+            return {}
+    return request.POST
@@ -0,0 +1,135 @@
+import time
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from . import sharding
+from .models import Membership, Organisation, ShardPlacement
+
+
+class ReshardError(Exception):
+    pass
+
+
+def _copy_fields(organisation):
+    # Primary keys are per shard, so the copy takes a new one on the target.
+    return {
+        field.attname: getattr(organisation, field.attname)
+        for field in Organisation._meta.concrete_fields
+        if not field.primary_key
+    }
+
+
+def move_organisation(orgId, target):
+    """
+    Moves one organisation and its memberships to shard ``target`` while
+    the service keeps running. The organisation row is locked on its source
+    shard for the copy, so concurrent membership writes wait and then fail
+    rather than being lost; reads keep being served from the source until
+    the placement flips. Returns the source shard, or None when the
+    organisation already lives on ``target``.
+    """
+    if target not in sharding.databases():
+        raise ReshardError(f"{target} is not a shard")
+    source = sharding.shard_for(orgId)
+    if source == target:
+        return None
+    # Commits run target, directory, source: a failure part way leaves a
+    # copy on the target that the next attempt clears, never a lost org.
+    with (
+        transaction.atomic(using=source),
+        transaction.atomic(using=DEFAULT_DB_ALIAS),
+        transaction.atomic(using=target),
+    ):
+        try:
+            organisation = Organisation.objects.using(source).select_for_update().get(orgId=orgId)
+        except Organisation.DoesNotExist:
+            raise ReshardError(f"Organisation {orgId} not found on {source}")
+        members = list(
+            Membership.objects.using(source)
+            .filter(organisation_id=organisation.pk)
+            .values_list("user_id", "joined_at")
+        )
+
+        # Clear out what an earlier, interrupted move may have left behind.
+        Membership.objects.using(target).filter(organisation__orgId=orgId).delete()
+        Organisation.objects.using(target).filter(orgId=orgId).delete()
+
+        copy = Organisation(**_copy_fields(organisation))
+        copy.save(using=target, force_insert=True)
+        Membership.objects.using(target).bulk_create(
+            [
+                Membership(organisation_id=copy.pk, user_id=user_id, joined_at=joined_at)
+                for user_id, joined_at in members
+            ]
+        )
+
+        if target == sharding.hash_shard(orgId):
+            ShardPlacement.objects.using(DEFAULT_DB_ALIAS).filter(orgId=organisation.orgId).delete()
+        else:
+            ShardPlacement.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+                orgId=organisation.orgId, defaults={"database": target}
+            )
+
+        Membership.objects.using(source).filter(organisation_id=organisation.pk).delete()
+        Organisation.objects.using(source).filter(pk=organisation.pk).delete()
+    sharding.forget_placement(orgId)
+    return source
+
+
+def pin_all(batch_size=1000):
+    """
+    Records every organisation's current shard in the placement directory,
+    so changing the shard list doesn't strand organisations whose hash
+    moves. Returns the number of placements added.
+    """
+    added = 0
+    for alias in sharding.databases():
+        org_ids = Organisation.objects.using(alias).values_list("orgId", flat=True).order_by("pk")
+        batch = []
+        for orgId in org_ids.iterator(chunk_size=batch_size):
+            batch.append(ShardPlacement(orgId=orgId, database=alias))
+            if len(batch) == batch_size:
+                added += _pin(batch, batch_size)
+                batch = []
+        added += _pin(batch, batch_size)
+    return added
+
+
+def _pin(placements, batch_size):
+    if not placements:
+        return 0
+    before = ShardPlacement.objects.using(DEFAULT_DB_ALIAS).count()
+    ShardPlacement.objects.using(DEFAULT_DB_ALIAS).bulk_create(placements, batch_size=batch_size, ignore_conflicts=True)
+    for placement in placements:
+        sharding.forget_placement(placement.orgId)
+    return ShardPlacement.objects.using(DEFAULT_DB_ALIAS).count() - before
+
+
+def rebalance(batch_size=1000, sleep=0.0, dry_run=False, on_move=None):
+    """
+    Moves every organisation that lives away from its hash shard back onto
+    it, one short transaction each with ``sleep`` seconds between moves,
+    then drops placements that no longer say anything. Returns the
+    ``(orgId, source, target)`` moves, planned or made.
+    """
+    moves = []
+    for alias in sharding.databases():
+        org_ids = Organisation.objects.using(alias).values_list("orgId", flat=True).order_by("pk")
+        for orgId in org_ids.iterator(chunk_size=batch_size):
+            target = sharding.hash_shard(orgId)
+            # Rows on a shard the directory doesn't point at are leftovers, not the live copy.
+            if target != alias and sharding.shard_for(orgId) == alias:
+                moves.append((orgId, alias, target))
+    if dry_run:
+        return moves
+    for move in moves:
+        move_organisation(move[0], move[2])
+        if on_move:
+            on_move(*move)
+        if sleep:
+            time.sleep(sleep)
+    for placement in ShardPlacement.objects.using(DEFAULT_DB_ALIAS).iterator(chunk_size=batch_size):
+        if placement.database == sharding.hash_shard(placement.orgId):
+            placement.delete(using=DEFAULT_DB_ALIAS)
+            sharding.forget_placement(placement.orgId)
+    return moves
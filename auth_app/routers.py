@@ -0,0 +1,150 @@
+import contextvars
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from . import sharding
+
+logger = logging.getLogger("auth_app.replicas")
+
+_current = contextvars.ContextVar("auth_app_replica_routing", default=None)
+
+# Replay delay of a streaming replica; 0 when it has replayed everything it
+# received, so an idle primary doesn't read as lag.
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+class RoutingState:
+    """Per-request routing flags: reads pinned to the primary, and whether the request wrote."""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+def start(pinned=False):
+    state = RoutingState(pinned)
+    return state, _current.set(state)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+class ReplicaHealth:
+    """
+    Per-process view of which replicas can take reads. Each replica is
+    re-probed at most every HEALTH_CHECK_SECONDS; one that errors or lags
+    the primary by more than MAX_LAG_SECONDS is skipped until a later probe
+    finds it healthy again.
+    """
+
+    def __init__(self):
+        self._status = {}
+
+    def check(self, alias):
+        """Probes ``alias`` now and returns ``(healthy, lag_seconds)``."""
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(POSTGRES_LAG_SQL if connection.vendor == "postgresql" else "SELECT 0")
+                lag = float(cursor.fetchone()[0] or 0)
+        except DatabaseError as exc:
+            logger.warning("Replica %s is unavailable: %s", alias, exc)
+            connection.close()
+            return False, None
+        if lag > settings.REPLICA_ROUTING["MAX_LAG_SECONDS"]:
+            logger.warning("Replica %s is %.1fs behind the primary", alias, lag)
+            return False, lag
+        return True, lag
+
+    def is_available(self, alias):
+        now = time.monotonic()
+        status = self._status.get(alias)
+        if status is None or now - status[1] >= settings.REPLICA_ROUTING["HEALTH_CHECK_SECONDS"]:
+            status = self._status[alias] = (self.check(alias)[0], now)
+        return status[0]
+
+    def available(self):
+        return [alias for alias in settings.REPLICA_ROUTING["REPLICAS"] if self.is_available(alias)]
+
+    def reset(self):
+        self._status.clear()
+
+
+replica_health = ReplicaHealth()
+
+
+class ShardRouter:
+    """
+    Sends Organisation and Membership queries to the shard selected through
+    auth_app.sharding, or to the shard of the instance they are about. With
+    sharding enabled and no shard selected they raise NoShardSelected rather
+    than quietly using the default database's empty tables. Everything
+    else, and everything while sharding is off, falls through to the next
+    router.
+    """
+
+    def _shard(self, model, **hints):
+        if not sharding.is_sharded(model):
+            return None
+        alias = sharding.current()
+        if alias is not None:
+            return alias
+        instance = hints.get("instance")
+        if instance is not None and sharding.is_sharded(type(instance)) and instance._state.db:
+            return instance._state.db
+        raise sharding.NoShardSelected(f"No shard selected for {model._meta.label}")
+
+    db_for_read = _shard
+    db_for_write = _shard
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Memberships point at users on the default database.
+        if sharding.is_sharded(type(obj1)) or sharding.is_sharded(type(obj2)):
+            return True
+        return None
+
+
+class ReplicaRouter:
+    """
+    Sends writes to the primary and reads to a random healthy replica.
+    Reads stay on the primary inside a transaction, after the current
+    request has written, and while the request is pinned by
+    ReplicaPinningMiddleware; with no healthy replica they fall back to it.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = replica_health.available()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_ROUTING["REPLICAS"]}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        if db in settings.REPLICA_ROUTING["REPLICAS"]:
+            return False
+        return None
@@ -0,0 +1,82 @@
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from . import sharding
+from .membership import get_org_ids
+from .models import Organisation
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+from .serializers import FastOrganisationSerializer
+
+
+def search_queryset(user_id, query):
+    """
+    Organisations ``user_id`` belongs to whose name or description contains
+    ``query``, case-insensitively, annotated with a rank: exact name (3),
+    name prefix (2), name substring (1), description only (0). On Postgres
+    the substring filters are served by the pg_trgm indexes from migration
+    0011; elsewhere they fall back to a scan of the caller's memberships.
+    """
+    return (
+        Organisation.objects.filter(memberships__user_id=user_id)
+        .filter(Q(name__icontains=query) | Q(description__icontains=query))
+        .annotate(
+            rank=Case(
+                When(name__iexact=query, then=Value(3)),
+                When(name__istartswith=query, then=Value(2)),
+                When(name__icontains=query, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        .only(*FastOrganisationSerializer.fields)
+    )
+
+
+def _page_queryset(user_id, query, cursor, limit):
+    queryset = search_queryset(user_id, query)
+    if cursor:
+        rank, last_id = decode_cursor(cursor, size=2)
+        queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, pk__gt=last_id))
+    return queryset.order_by("-rank", "pk")[: limit + 1]
+
+
+def _paginate(rows, limit):
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].rank, rows[-1].pk)
+
+
+def _sharded_page(user_id, query, cursor, limit):
+    # Primary keys repeat across shards, so ties within a rank break on orgId.
+    queryset = search_queryset(user_id, query)
+    if cursor:
+        rank, last_id = decode_cursor(cursor, size=2)
+        try:
+            last_id = uuid.UUID(int=last_id)
+        except ValueError:
+            raise InvalidCursor("Invalid cursor")
+        queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, orgId__gt=last_id))
+    queryset = queryset.order_by("-rank", "orgId")[: limit + 1]
+    aliases = sharding.shards_for(get_org_ids(user_id))
+    shards = sharding.fan_out(lambda alias: list(queryset.using(alias)), aliases=aliases)
+    rows = sorted((row for rows in shards for row in rows), key=lambda row: (-row.rank, row.orgId))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].rank, rows[-1].orgId.int)
+
+
+def search_page(user_id, query, cursor, limit):
+    """Returns ``(rows, next_cursor)``, best matches first, continuing after ``cursor``."""
+    if sharding.enabled():
+        return _sharded_page(user_id, query, cursor, limit)
+    return _paginate(list(_page_queryset(user_id, query, cursor, limit)), limit)
+
+
+async def asearch_page(user_id, query, cursor, limit):
+    if sharding.enabled():
+        return await sync_to_async(_sharded_page)(user_id, query, cursor, limit)
+    return _paginate([row async for row in _page_queryset(user_id, query, cursor, limit)], limit)
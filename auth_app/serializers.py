@@ -1,4 +1,9 @@
+from collections import defaultdict
+from operator import attrgetter
+
+from django.db.models import F
 from rest_framework import serializers
+from . import sharding
 from .models import User, Organisation
 
 
@@ -19,22 +24,79 @@ class UserSerializer(serializers.ModelSerializer):
             "userId": {"read_only": True},
         }
 
-    def create(self, validated_data):
-        user = User.objects.create_user(
-            email=validated_data["email"],
-            firstName=validated_data["firstName"],
-            lastName=validated_data["lastName"],
-            password=validated_data["password"],
-            phone=validated_data.get("phone"),
-        )
-        return user
 
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
+class RegisterSerializer(serializers.Serializer):
+    # Field checks only; uniqueness is resolved by the caller in one query.
+    email = serializers.EmailField(max_length=254)
+    firstName = serializers.CharField(max_length=255)
+    lastName = serializers.CharField(max_length=255)
+    password = serializers.CharField(max_length=255, write_only=True)
+    phone = serializers.CharField(
+        max_length=20, required=False, allow_null=True, allow_blank=True
+    )
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+class FastSerializer:
+    """
+    Read-only output path for hot responses. Accessors are bound once per
+    class and every field is rendered the way DRF's CharField/EmailField
+    would, so the JSON is identical to the matching ModelSerializer.
+    """
+
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._getters = tuple((name, attrgetter(name)) for name in cls.fields)
+
+    @classmethod
+    def to_representation(cls, instance):
+        return {name: _text(get(instance)) for name, get in cls._getters}
+
+    @classmethod
+    def many(cls, instances):
+        return [cls.to_representation(instance) for instance in instances]
+
+
+class FastOrganisationSerializer(FastSerializer):
+    fields = ("orgId", "name", "description")
+
+
+class FastUserSerializer(FastSerializer):
+    fields = ("userId", "firstName", "lastName", "email", "phone")
+
+    @classmethod
+    def to_representation(cls, instance, organisations=None):
+        data = super().to_representation(instance)
+        if organisations is None:
+            organisations = instance.organisations.all()
+        data["organisations"] = FastOrganisationSerializer.many(organisations)
+        return data
+
+
+def user_organisations(user_ids):
+    """
+    Maps each of ``user_ids`` that belongs to any organisation to its
+    organisations in primary key order (shard by shard when sharded): one
+    query, or one per shard run in parallel.
+    """
+    user_ids = list(user_ids)
+
+    def load(alias):
+        return list(
+            Organisation.objects.using(alias)
+            .filter(memberships__user_id__in=user_ids)
+            .annotate(member_id=F("memberships__user_id"))
+            .only(*FastOrganisationSerializer.fields)
+            .order_by("pk")
+        )
 
-    def validate_userId(self, value):
-        if User.objects.filter(userId=value).exists():
-            raise serializers.ValidationError("A user with this ID already exists.")
-        return value
+    organisations = defaultdict(list)
+    for shard in sharding.fan_out(load):
+        for organisation in shard:
+            organisations[organisation.member_id].append(organisation)
+    return organisations
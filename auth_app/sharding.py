@@ -0,0 +1,268 @@
+import contextvars
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .checks import shared_cache
+from .models import Membership, Organisation, ShardPlacement, parse_uuid
+
+SHARDED_MODELS = (Organisation, Membership)
+
+_current = contextvars.ContextVar("auth_app_shard", default=None)
+_executor = None
+
+
+class NoShardSelected(RuntimeError):
+    """Raised when a sharded model is queried without a shard to route to."""
+
+
+def databases():
+    return settings.SHARDING["DATABASES"]
+
+
+def enabled():
+    return bool(settings.SHARDING["DATABASES"])
+
+
+def is_sharded(model):
+    return enabled() and issubclass(model, SHARDED_MODELS)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def use_shard(alias):
+    """Routes Organisation and Membership queries in this block to ``alias`` (None leaves routing alone)."""
+    if alias is None:
+        yield
+        return
+    token = _current.set(alias)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def atomic():
+    """A transaction on the selected shard, or nothing when no shard is selected."""
+    alias = current()
+    return transaction.atomic(using=alias) if alias is not None else nullcontext()
+
+
+def hash_shard(orgId):
+    """
+    The shard an organisation lives on unless it has been moved, by
+    rendezvous hashing: adding a shard only claims the organisations that
+    now hash to it. Shard aliases are part of the hash, so keep them stable.
+    """
+    if not enabled():
+        return None
+    key = parse_uuid(orgId)
+    if key is None:
+        return databases()[0]
+    return max(databases(), key=lambda alias: hashlib.blake2b(key.bytes + alias.encode(), digest_size=8).digest())
+
+
+def _placement_key(orgId):
+    return f"auth_app:shard:{orgId}"
+
+
+def placement_timeout():
+    return settings.SHARDING["PLACEMENT_CACHE_TIMEOUT"]
+
+
+def shard_for(orgId):
+    """
+    The shard holding ``orgId``: its ShardPlacement row when it has been
+    moved, otherwise its hash shard. Answers come from a shared cache, so a
+    routed request normally costs no directory read; a per-process cache
+    never hears of another worker's move, so without one the directory is
+    read every time.
+    """
+    if not enabled():
+        return None
+    if not shared_cache():
+        return _lookup(orgId)
+    key = _placement_key(orgId)
+    alias = cache.get(key)
+    if alias is None:
+        alias = _lookup(orgId)
+        cache.set(key, alias, placement_timeout())
+    return alias
+
+
+async def ashard_for(orgId):
+    if not enabled():
+        return None
+    if not shared_cache():
+        return await sync_to_async(_lookup)(orgId)
+    key = _placement_key(orgId)
+    alias = await cache.aget(key)
+    if alias is None:
+        alias = await sync_to_async(_lookup)(orgId)
+        await cache.aset(key, alias, placement_timeout())
+    return alias
+
+
+def _lookup(orgId):
+    value = parse_uuid(orgId)
+    if value is None:
+        return hash_shard(orgId)
+    # Placements are read from the primary so a move is seen immediately.
+    placed = ShardPlacement.objects.using(DEFAULT_DB_ALIAS).filter(orgId=value).values_list("database", flat=True)
+    return placed.first() or hash_shard(value)
+
+
+def shards_for(org_ids):
+    """The shards holding any of ``org_ids``, in configured order, with one cache round trip when warm."""
+    if not enabled():
+        return None
+    keys = {_placement_key(orgId): orgId for orgId in org_ids}
+    cached = shared_cache()
+    found = cache.get_many(keys) if cached else {}
+    missing = {key: orgId for key, orgId in keys.items() if key not in found}
+    if missing:
+        values = [value for value in map(parse_uuid, missing.values()) if value is not None]
+        placed = dict(
+            ShardPlacement.objects.using(DEFAULT_DB_ALIAS).filter(orgId__in=values).values_list("orgId", "database")
+        )
+        resolved = {key: placed.get(parse_uuid(orgId)) or hash_shard(orgId) for key, orgId in missing.items()}
+        if cached:
+            cache.set_many(resolved, placement_timeout())
+        found.update(resolved)
+    held = set(found.values())
+    return [alias for alias in databases() if alias in held]
+
+
+def forget_placement(orgId):
+    cache.delete(_placement_key(orgId))
+
+
+def for_org(orgId):
+    """Selects the shard holding ``orgId`` for the block; a no-op without sharding."""
+    return use_shard(shard_for(orgId))
+
+
+def _relocate(orgId):
+    # A placement cached before a move still points at the source shard.
+    alias = current()
+    if alias is None:
+        return False
+    forget_placement(orgId)
+    moved_to = shard_for(orgId)
+    if moved_to == alias:
+        return False
+    # The enclosing use_shard() still restores the previous shard on exit.
+    _current.set(moved_to)
+    return True
+
+
+def get_organisation(orgId):
+    """
+    Organisation ``orgId`` from the selected shard. A miss there is checked
+    against the placement directory, since the organisation may have been
+    moved since its shard was cached; if it was, the rest of the block is
+    switched to its new shard, so the writes that follow land there too.
+    """
+    try:
+        return Organisation.objects.get(orgId=orgId)
+    except Organisation.DoesNotExist:
+        if not _relocate(orgId):
+            raise
+    return Organisation.objects.get(orgId=orgId)
+
+
+async def aget_organisation(orgId):
+    try:
+        return await Organisation.objects.aget(orgId=orgId)
+    except Organisation.DoesNotExist:
+        alias = current()
+        if alias is None:
+            raise
+        # Inline rather than sync_to_async(_relocate): the switch has to happen in this context.
+        await cache.adelete(_placement_key(orgId))
+        moved_to = await ashard_for(orgId)
+        if moved_to == alias:
+            raise
+        _current.set(moved_to)
+    return await Organisation.objects.aget(orgId=orgId)
+
+
+def group_by_shard(items, org_id):
+    """Splits ``items`` by the hash shard of ``org_id(item)``; one ``None`` group without sharding."""
+    if not enabled():
+        return {None: list(items)}
+    groups = defaultdict(list)
+    for item in items:
+        groups[hash_shard(org_id(item))].append(item)
+    return groups
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.SHARDING["FAN_OUT_WORKERS"], thread_name_prefix="auth_app-shard"
+        )
+    return _executor
+
+
+def _call(function, alias):
+    with use_shard(alias):
+        return function(alias)
+
+
+def _call_in_worker(function, alias):
+    # Pool threads hold their own connections; honour CONN_MAX_AGE like a request would.
+    connections[alias].close_if_unusable_or_obsolete()
+    return _call(function, alias)
+
+
+def fan_out(function, parallel=True, aliases=None):
+    """
+    Calls ``function(alias)`` once per shard, or per shard in ``aliases``,
+    with that shard selected, and returns the results in shard order.
+    Shards are queried from a thread pool unless ``parallel`` is False
+    (writes that should stay on the calling thread). Without sharding it is
+    a single inline call with ``alias`` None, so callers keep their
+    unsharded query plan.
+    """
+    if not enabled():
+        return [function(None)]
+    aliases = databases() if aliases is None else aliases
+    if not parallel or len(aliases) == 1:
+        return [_call(function, alias) for alias in aliases]
+    futures = [
+        _pool().submit(contextvars.copy_context().run, _call_in_worker, function, alias) for alias in aliases
+    ]
+    return [future.result() for future in futures]
+
+
+def iterate(queryset, chunk_size, aliases=None):
+    """
+    ``queryset.iterator()`` over every shard, or every shard in ``aliases``,
+    in turn, for responses streamed after the view returns.
+    """
+    if not is_sharded(queryset.model):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+    for alias in databases() if aliases is None else aliases:
+        yield from queryset.using(alias).iterator(chunk_size=chunk_size)
+
+
+async def aiterate(queryset, chunk_size, aliases=None):
+    if not is_sharded(queryset.model):
+        aliases = [None]
+    elif aliases is None:
+        aliases = databases()
+    for alias in aliases:
+        async for row in queryset.using(alias).aiterator(chunk_size=chunk_size):
+            yield row
@@ -0,0 +1,106 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from . import membership, sharding
+from .authentication import REVOCABLE_CLAIMS, user_cache, user_claims_key
+from .blacklist import blacklist_index
+from .models import Membership, Organisation, User
+
+
+def _token_lifetime():
+    return max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME).total_seconds()
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
+    user_cache.invalidate(instance.pk)
+    if update_fields is not None and not REVOCABLE_CLAIMS.keys() & set(update_fields):
+        return
+    # Stateless tokens can't be recalled, so remember the current flags for
+    # as long as any token issued before this save stays valid; tokens that
+    # carry other values are rejected.
+    cache.set(
+        user_claims_key(instance.pk),
+        {name: getattr(instance, name) for name in REVOCABLE_CLAIMS},
+        timeout=_token_lifetime(),
+    )
+
+
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    cache.set(user_claims_key(instance.pk), {"is_active": False}, timeout=_token_lifetime())
+
+
+@receiver(pre_delete, sender=User)
+def leave_organisations(sender, instance, **kwargs):
+    def leave(alias):
+        Organisation.objects.using(alias).filter(memberships__user=instance).update(
+            member_count=F("member_count") - 1, version=F("version") + 1
+        )
+        if alias is not None:
+            # The cascade below only reaches the default database.
+            Membership.objects.using(alias).filter(user_id=instance.pk).delete()
+
+    # Memberships go with the user by cascade, which sends no m2m_changed.
+    sharding.fan_out(leave, parallel=False)
+
+
+@receiver(m2m_changed, sender=Membership)
+def invalidate_memberships(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action == "pre_clear":
+            instance._cleared_org_ids = list(instance.organisations.values_list("id", flat=True))
+        elif action == "post_add":
+            Organisation.objects.filter(pk__in=pk_set).update(
+                member_count=F("member_count") + 1, version=F("version") + 1
+            )
+        elif action == "post_remove":
+            membership.recount(Organisation.objects.filter(pk__in=pk_set))
+        elif action == "post_clear":
+            membership.recount(Organisation.objects.filter(pk__in=getattr(instance, "_cleared_org_ids", [])))
+        if action in ("post_add", "post_remove", "post_clear"):
+            membership.touch_users([instance.pk])
+            membership.invalidate([instance.pk])
+        return
+    if action == "pre_clear":
+        instance._cleared_user_ids = list(instance.users.values_list("id", flat=True))
+    elif action == "post_clear":
+        Organisation.objects.filter(pk=instance.pk).update(member_count=0, version=F("version") + 1)
+        membership.touch_users(getattr(instance, "_cleared_user_ids", []))
+        membership.invalidate(getattr(instance, "_cleared_user_ids", []))
+    elif action == "post_add":
+        # pk_set only holds the users that were not members yet.
+        membership.adjust_member_count(instance.pk, len(pk_set))
+        membership.touch_users(pk_set)
+        membership.invalidate(pk_set)
+    elif action == "post_remove":
+        membership.recount(Organisation.objects.filter(pk=instance.pk))
+        membership.touch_users(pk_set)
+        membership.invalidate(pk_set)
+
+
+@receiver(pre_delete, sender=Organisation)
+def invalidate_deleted_organisation(sender, instance, using, **kwargs):
+    user_ids = list(
+        Membership.objects.using(using).filter(organisation_id=instance.pk).values_list("user_id", flat=True)
+    )
+    membership.touch_users(user_ids)
+    membership.invalidate(user_ids)
+
+
+@receiver(pre_save, sender=BlacklistedToken)
+def invalidate_blacklist_before_write(sender, **kwargs):
+    # Together with the bump after commit, a filter that catches up while
+    # the write is in flight still catches up again once it is visible.
+    blacklist_index.invalidate()
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def invalidate_blacklist_after_write(sender, using, **kwargs):
+    transaction.on_commit(blacklist_index.invalidate, using=using)
@@ -0,0 +1,101 @@
+# tests/async_views_spec.py
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from auth_app.models import Membership, User, Organisation
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("auth_app.async_urls")
+class TestAsyncEndpoints:
+
+    def setup_method(self):
+        self.client = AsyncClient()
+
+    def post(self, path, data, token=None):
+        return async_to_sync(self.client.post)(
+            path, data, content_type="application/json", headers=self.auth(token)
+        )
+
+    def get(self, path, token=None):
+        return async_to_sync(self.client.get)(path, headers=self.auth(token))
+
+    def auth(self, token):
+        return {"Authorization": f"Bearer {token}"} if token else {}
+
+    # It Should Register, Log In and Read Back Through the Async Views.
+    def test_register_login_and_read(self):
+        response = self.post(
+            "/auth/register",
+            {"email": "async@example.com", "firstName": "Async", "lastName": "User", "password": "password123"},
+        )
+        assert response.status_code == 201
+        assert response.json()["data"]["user"]["organisations"][0]["name"] == "Async's Organisation"
+
+        response = self.post("/auth/login", {"email": "async@example.com", "password": "password123"})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        token = data["accessToken"]
+
+        response = self.get(f"/api/users/{data['user']['userId']}", token=token)
+        assert response.status_code == 200
+        assert response.json()["data"]["email"] == "async@example.com"
+
+        orgId = data["user"]["organisations"][0]["orgId"]
+        response = self.get(f"/api/organisations/{orgId}", token=token)
+        assert response.status_code == 200
+
+        response = self.post("/api/organisations", {"name": "Second"}, token=token)
+        assert response.status_code == 201
+        response = self.get("/api/organisations", token=token)
+        assert [org["name"] for org in response.json()["data"]["organisations"]] == [
+            "Async's Organisation",
+            "Second",
+        ]
+
+        response = self.get("/api/organisations/search?q=second", token=token)
+        assert response.status_code == 200
+        assert [org["name"] for org in response.json()["data"]["organisations"]] == ["Second"]
+
+    # It Should Require a Token on Protected Async Views.
+    def test_requires_authentication(self):
+        response = self.get("/api/organisations")
+        assert response.status_code == 401
+        assert "detail" in response.json()
+
+    # It Should Forbid Adding Users to Someone Else's Organisation.
+    def test_add_user_forbidden(self):
+        owner = User.objects.create_user(
+            email="owner@example.com", firstName="Owner", lastName="User", password="password123"
+        )
+        User.objects.create_user(
+            email="intruder@example.com", firstName="Intruder", lastName="User", password="password123"
+        )
+        organisation = Organisation.objects.create(name="Private")
+        organisation.users.add(owner)
+        login = self.post("/auth/login", {"email": "intruder@example.com", "password": "password123"}).json()
+        response = self.post(
+            f"/api/organisations/{organisation.orgId}/users",
+            {"userId": owner.userId},
+            token=login["data"]["accessToken"],
+        )
+        assert response.status_code == 403
+
+    # It Should Never Leave an Organisation Without Its Creator.
+    def test_create_organisation_is_atomic(self, monkeypatch):
+        user = User.objects.create_user(
+            email="atomic@example.com", firstName="Ato", lastName="Mic", password="password123"
+        )
+        token = self.post("/auth/login", {"email": "atomic@example.com", "password": "password123"}).json()["data"][
+            "accessToken"
+        ]
+
+        def fail(**kwargs):
+            raise RuntimeError("membership insert failed")
+
+        monkeypatch.setattr(Membership.objects, "create", fail)
+        with pytest.raises(RuntimeError):
+            self.post("/api/organisations", {"name": "Orphan"}, token=token)
+        assert not Organisation.objects.filter(name="Orphan").exists()
+        assert user.organisations.count() == 0
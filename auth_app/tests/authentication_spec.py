@@ -0,0 +1,75 @@
+# tests/authentication_spec.py
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from auth_app.authentication import user_cache
+from auth_app.models import User
+
+
+@pytest.mark.django_db
+class TestStatelessAuthentication:
+
+    def setup_method(self):
+        self.client = APIClient()
+        user_cache.clear()
+
+    def teardown_method(self):
+        # Primary keys are reused between tests, so drop deactivation markers.
+        cache.clear()
+
+    def login(self, email, **extra):
+        User.objects.create_user(
+            email=email,
+            firstName="Token",
+            lastName="User",
+            password="password123",
+            **extra,
+        )
+        response = self.client.post(
+            "/auth/login", data={"email": email, "password": "password123"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['data']['accessToken']}")
+
+    # It Should Authenticate From Token Claims Without Loading the User.
+    def test_protected_view_skips_user_lookup(self, shared_cache, django_assert_num_queries):
+        self.login("claims@example.com")
+        with django_assert_num_queries(1):
+            response = self.client.get("/api/organisations")
+        assert response.status_code == 200
+
+    # It Should Reject Tokens of a Deactivated User.
+    def test_deactivated_user_is_rejected(self):
+        self.login("inactive@example.com")
+        user = User.objects.get(email="inactive@example.com")
+        user.is_active = False
+        user.save()
+        response = self.client.get("/api/organisations")
+        assert response.status_code == 401
+
+    # It Should Check the Database When Other Workers Can't See the Deactivation Marker.
+    def test_local_cache_checks_database(self, django_assert_num_queries):
+        self.login("local@example.com")
+        with django_assert_num_queries(2):
+            assert self.client.get("/api/organisations").status_code == 200
+        # A deactivation in another worker leaves no marker in this process.
+        User.objects.filter(email="local@example.com").update(is_active=False)
+        assert self.client.get("/api/organisations").status_code == 401
+
+    # It Should Revoke Admin Tokens Once the User Is Demoted.
+    def test_demoted_admin_is_rejected(self, shared_cache):
+        self.login("admin@example.com", is_staff=True)
+        assert self.client.get("/api/metrics").status_code == 200
+        user = User.objects.get(email="admin@example.com")
+        user.is_staff = False
+        user.save()
+        response = self.client.get("/api/metrics")
+        assert response.status_code == 401
+        assert response.json()["code"] == "token_revoked"
+
+    # It Should Compare Privileges in the Database Without a Shared Cache.
+    def test_local_cache_checks_privileges(self):
+        self.login("local-admin@example.com", is_staff=True)
+        assert self.client.get("/api/metrics").status_code == 200
+        User.objects.filter(email="local-admin@example.com").update(is_staff=False)
+        assert self.client.get("/api/metrics").status_code == 401
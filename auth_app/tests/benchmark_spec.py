@@ -0,0 +1,53 @@
+# tests/benchmark_spec.py
+
+import pytest
+from django.core.management import CommandError, call_command
+from auth_app.management.commands.benchmark import Command, Dataset, percentile, scenarios, summarize
+
+
+class TestBenchmarkStats:
+
+    # It Should Use Nearest-Rank Percentiles.
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+        assert percentile([], 50) is None
+
+    # It Should Summarise Latency, Errors and Query Counts.
+    def test_summarize(self):
+        result = summarize([1.0, 2.0, 3.0, 4.0], [200, 200, 404, 201], [2, 2, 1, 3], wall=2.0)
+        assert result["requests"] == 4
+        assert result["errors"] == 1
+        assert result["statusCodes"] == {"200": 2, "201": 1, "404": 1}
+        assert result["throughputRps"] == 2.0
+        assert result["p50Ms"] == 2.0
+        assert result["queriesPerRequest"] == 2.0
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchmarkScenarios:
+
+    # It Should Send Every Scenario's Request to a Live Server.
+    def test_scenarios_send(self, live_server, settings):
+        settings.AUTH_THROTTLE = {**settings.AUTH_THROTTLE, "ENABLED": False}
+        data = Dataset(users=5, orgs=3, skew=1.1, seed=1)
+        command = Command()
+        for name, build in scenarios(data, "spec").items():
+            _, code, _ = command.send(live_server.url, *build(0))
+            assert 200 <= code < 300, name
+
+    # It Should Report Query Counts in Server Mode.
+    def test_server_mode_counts_queries(self, settings):
+        settings.AUTH_THROTTLE = {**settings.AUTH_THROTTLE, "ENABLED": False}
+        data = Dataset(users=5, orgs=3, skew=1.1, seed=1)
+        builders = {name: build for name, build in scenarios(data, "spec").items() if name == "organisation-list"}
+        results = Command().run_server(builders, count=3, concurrency=1)
+        assert results["organisation-list"]["queriesPerRequest"] >= 1
+
+    # It Should Refuse Sharded Settings Before Seeding Anything.
+    def test_refuses_sharding(self, settings):
+        settings.SHARDING = {**settings.SHARDING, "DATABASES": ["shard_0"]}
+        with pytest.raises(CommandError, match="SHARD_DATABASE_URLS"):
+            call_command("benchmark")
@@ -0,0 +1,95 @@
+# tests/bulk_register_spec.py
+
+import pytest
+from rest_framework.test import APIClient
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestBulkRegistration:
+
+    def setup_method(self):
+        self.client = APIClient()
+        admin = User.objects.create_superuser(
+            email="admin@example.com",
+            firstName="Admin",
+            lastName="User",
+            password="password123",
+        )
+        self.client.force_authenticate(user=admin)
+
+    # It Should Register Every Valid Row with a Default Organisation and Report Failures Per Row.
+    def test_bulk_register_reports_per_row_results(self):
+        User.objects.create_user(
+            email="taken@example.com",
+            firstName="Taken",
+            lastName="User",
+            password="password123",
+        )
+        response = self.client.post(
+            "/auth/register/bulk",
+            data={
+                "users": [
+                    {"email": "one@example.com", "firstName": "One", "lastName": "User", "password": "password123"},
+                    {"email": "taken@example.com", "firstName": "Two", "lastName": "User", "password": "password123"},
+                    {"email": "one@example.com", "firstName": "Three", "lastName": "User", "password": "password123"},
+                    {"email": "four@example.com", "firstName": "Four"},
+                    {"email": "five@example.com", "firstName": "Five", "lastName": "User", "password": "password123"},
+                ]
+            },
+            format="json",
+        )
+        assert response.status_code == 201
+        data = response.json()["data"]
+        assert [row["status"] for row in data["results"]] == [
+            "created", "failed", "failed", "failed", "created",
+        ]
+        assert data["stats"]["created"] == 2
+        assert data["stats"]["failed"] == 3
+
+        user = User.objects.get(email="five@example.com")
+        assert user.check_password("password123")
+        assert str(user.userId) == data["results"][4]["userId"]
+        assert list(Organisation.objects.filter(users=user).values_list("name", flat=True)) == [
+            "Five's Organisation"
+        ]
+
+    # It Should Report an Email Registered After the Pre-Check as a Failed Row.
+    def test_bulk_register_concurrent_duplicate(self, monkeypatch):
+        User.objects.create_user(
+            email="Race@example.com", firstName="Race", lastName="User", password="password123"
+        )
+        # The pre-check ran before the other registration committed.
+        monkeypatch.setattr("auth_app.views.existing_emails", lambda emails: set())
+        response = self.client.post(
+            "/auth/register/bulk",
+            data={
+                "users": [
+                    {"email": "new@example.com", "firstName": "New", "lastName": "User", "password": "password123"},
+                    {"email": "race@example.com", "firstName": "Race", "lastName": "Two", "password": "password123"},
+                ]
+            },
+            format="json",
+        )
+        assert response.status_code == 201
+        data = response.json()["data"]
+        assert [row["status"] for row in data["results"]] == ["created", "failed"]
+        assert data["results"][1]["errors"] == {"email": ["A user with this email already exists."]}
+        assert data["stats"]["created"] == 1
+        user = User.objects.get(email="new@example.com")
+        assert str(user.userId) == data["results"][0]["userId"]
+        assert Organisation.objects.filter(users=user).count() == 1
+
+    # It Should Only Allow Admin Users.
+    def test_bulk_register_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(
+            user=User.objects.create_user(
+                email="plain@example.com",
+                firstName="Plain",
+                lastName="User",
+                password="password123",
+            )
+        )
+        response = client.post("/auth/register/bulk", data={"users": []}, format="json")
+        assert response.status_code == 403
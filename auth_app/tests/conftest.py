@@ -0,0 +1,23 @@
+# tests/conftest.py
+
+import pytest
+from django.core.cache import cache
+from auth_app import throttling
+
+
+# Every test client shares one address, so buckets would carry over between tests.
+@pytest.fixture(autouse=True)
+def reset_throttles():
+    throttling.reset()
+    yield
+    throttling.reset()
+
+
+# A cache every worker would see, for code that only trusts a shared one.
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)}
+    }
+    yield
+    cache.clear()
@@ -0,0 +1,117 @@
+# tests/etag_spec.py
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def setup_method(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            email="owner@example.com", firstName="Owner", lastName="User", password="password123"
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com", firstName="Other", lastName="User", password="password123"
+        )
+        self.organisation = Organisation.objects.create(name="Acme")
+        self.organisation.users.add(self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def teardown_method(self):
+        cache.clear()
+
+    def user_url(self, user):
+        return f"/api/users/{user.userId}"
+
+    def organisation_url(self):
+        return f"/api/organisations/{self.organisation.orgId}"
+
+    # It Should Send a Strong ETag and Answer a Matching If-None-Match With an Empty 304.
+    def test_user_detail_not_modified(self, django_assert_num_queries):
+        response = self.client.get(self.user_url(self.owner))
+        assert response.status_code == 200
+        etag = response["ETag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+
+        with django_assert_num_queries(1):
+            response = self.client.get(self.user_url(self.owner), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.content == b""
+
+        response = self.client.get(self.user_url(self.owner), HTTP_IF_NONE_MATCH=f'"stale", W/{etag}')
+        assert response.status_code == 304
+
+    # It Should Bump the Version in One UPDATE and Only Read It Back When Asked.
+    def test_save_defers_version(self, django_assert_num_queries):
+        # Adding the owner bumped the row, not this instance.
+        self.organisation.refresh_from_db()
+        version = self.organisation.version
+        self.organisation.name = "Acme Renamed"
+        with django_assert_num_queries(1):
+            self.organisation.save(update_fields=["name"])
+        with django_assert_num_queries(1):
+            assert self.organisation.version == version + 1
+        assert self.organisation.name == "Acme Renamed"
+
+    # It Should Change the User ETag on Profile Edits, Membership Changes and Organisation Renames.
+    def test_user_etag_tracks_payload(self):
+        def etag():
+            return self.client.get(self.user_url(self.owner))["ETag"]
+
+        seen = [etag()]
+        self.owner.firstName = "Renamed"
+        self.owner.save(update_fields=["firstName"])
+        seen.append(etag())
+        other_etag = self.client.get(self.user_url(self.other))["ETag"]
+        self.client.post(f"{self.organisation_url()}/users", data={"userId": self.other.userId})
+        assert self.client.get(self.user_url(self.other))["ETag"] != other_etag
+        self.organisation.name = "Acme Ltd"
+        self.organisation.save()
+        seen.append(etag())
+        self.owner.organisations.remove(self.organisation)
+        seen.append(etag())
+        assert len(set(seen)) == len(seen)
+
+        response = self.client.get(self.user_url(self.owner), HTTP_IF_NONE_MATCH=seen[0])
+        assert response.status_code == 200
+        assert response.json()["data"]["organisations"] == []
+
+    # It Should Change the Organisation ETag When Members Join and Only Answer 304 to Members.
+    def test_organisation_detail_not_modified(self):
+        response = self.client.get(self.organisation_url())
+        etag = response["ETag"]
+        assert self.client.get(self.organisation_url(), HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        self.client.post(f"{self.organisation_url()}/users", data={"userId": self.other.userId})
+        response = self.client.get(self.organisation_url(), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["data"]["memberCount"] == 2
+
+        outsider = User.objects.create_user(
+            email="outsider@example.com", firstName="Out", lastName="Sider", password="password123"
+        )
+        self.client.force_authenticate(user=outsider)
+        response = self.client.get(self.organisation_url(), HTTP_IF_NONE_MATCH="*")
+        assert response.status_code == 403
+
+    # It Should Answer If-None-Match the Same Way Through the Async Views.
+    @pytest.mark.urls("auth_app.async_urls")
+    def test_async_detail_not_modified(self):
+        client = AsyncClient()
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.owner)}"}
+        for url in (self.user_url(self.owner), self.organisation_url()):
+            response = async_to_sync(client.get)(url, headers=headers)
+            assert response.status_code == 200
+            etag = response["ETag"]
+            response = async_to_sync(client.get)(url, headers={**headers, "If-None-Match": etag})
+            assert response.status_code == 304
+            assert response["ETag"] == etag
@@ -0,0 +1,101 @@
+# tests/export_spec.py
+
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestMemberExport:
+    client = APIClient()
+
+    def setup_method(self):
+        self.organisation = Organisation.objects.create(name="Big Org")
+        self.users = [
+            User.objects.create_user(
+                email=f"member{n}@example.com", firstName=f"Member{n}", lastName="User", password="password123"
+            )
+            for n in range(5)
+        ]
+        self.organisation.users.add(*self.users)
+        self.client.force_authenticate(user=self.users[0])
+
+    def export(self, **params):
+        response = self.client.get(f"/api/organisations/{self.organisation.orgId}/members/export", params)
+        return response, b"".join(response.streaming_content) if response.streaming else b""
+
+    # It Should Stream Every Member as NDJSON and Resume After a Cursor.
+    def test_ndjson_export_and_resume(self):
+        response, body = self.export()
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert [row["email"] for row in rows] == [user.email for user in self.users]
+        assert rows[0]["userId"] == str(self.users[0].userId)
+
+        _, rest = self.export(after=rows[1]["cursor"])
+        assert [json.loads(line)["email"] for line in rest.splitlines()] == [user.email for user in self.users[2:]]
+
+    # It Should Stream CSV With a Header Row.
+    def test_csv_export(self):
+        response, body = self.export(type="csv")
+        assert response["Content-Type"] == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        assert len(rows) == 5
+        assert rows[0]["firstName"] == "Member0"
+        assert rows[0]["phone"] == ""
+
+    # It Should Only Let Members Export.
+    def test_non_members_are_forbidden(self):
+        outsider = User.objects.create_user(
+            email="outsider@example.com", firstName="Out", lastName="Sider", password="password123"
+        )
+        self.client.force_authenticate(user=outsider)
+        response, _ = self.export()
+        assert response.status_code == 403
+
+    # It Should Export Through the Management Command.
+    def test_export_command(self, tmp_path):
+        path = tmp_path / "members.ndjson"
+        call_command("export_members", str(self.organisation.orgId), "--output", str(path), "--chunk-size", "2")
+        assert len(path.read_text().splitlines()) == 5
+
+    # It Should Append a Resumed CSV Export Without Repeating the Header.
+    def test_csv_export_command_resume(self, tmp_path):
+        path = tmp_path / "members.csv"
+        stderr = io.StringIO()
+        call_command("export_members", str(self.organisation.orgId), "--type", "csv", "--output", str(path))
+        rows = list(csv.DictReader(io.StringIO(path.read_text())))
+        assert len(rows) == 5
+
+        path.write_text("".join(path.read_text().splitlines(keepends=True)[:3]))
+        call_command(
+            "export_members",
+            str(self.organisation.orgId),
+            "--type",
+            "csv",
+            "--after",
+            rows[1]["cursor"],
+            "--output",
+            str(path),
+            stderr=stderr,
+        )
+        resumed = list(csv.DictReader(io.StringIO(path.read_text())))
+        assert [row["email"] for row in resumed] == [user.email for user in self.users]
+        assert "Exported 3 members" in stderr.getvalue()
+
+    # It Should Keep Member Names From Becoming Spreadsheet Formulas.
+    def test_csv_escapes_formulas(self):
+        self.users[0].firstName = "=HYPERLINK(\"http://evil\")"
+        self.users[0].phone = "+2348000000000"
+        self.users[0].save()
+        _, body = self.export(type="csv")
+        row = next(csv.DictReader(io.StringIO(body.decode())))
+        assert row["firstName"] == "'=HYPERLINK(\"http://evil\")"
+        assert row["phone"] == "'+2348000000000"
+        assert row["lastName"] == "User"
@@ -0,0 +1,59 @@
+# tests/hashing_spec.py
+
+import asyncio
+
+import pytest
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import override_settings
+from rest_framework.test import APIClient
+from auth_app.hashing import HashingExecutor, HashingUnavailable
+from auth_app.models import User
+
+
+@pytest.mark.django_db
+class TestHashingExecutor:
+    client = APIClient()
+
+    # It Should Hash in a Process Pool and be Awaitable.
+    def test_pool_hashes_for_sync_and_async_callers(self):
+        executor = HashingExecutor(workers=2, max_pending=4, timeout=30)
+        try:
+            encoded = executor.run(make_password, "password123")
+            assert check_password("password123", encoded)
+            assert asyncio.run(executor.arun(check_password, "password123", encoded))
+        finally:
+            executor.shutdown()
+
+    # It Should Fail Fast When the Queue is Full.
+    def test_saturated_executor_rejects(self):
+        executor = HashingExecutor(workers=0, max_pending=1)
+        executor._slots.acquire()
+        with pytest.raises(HashingUnavailable):
+            executor.run(check_password, "password123", "")
+
+    # It Should Return a 503 From Login and Register When Hashing is Saturated.
+    def test_login_and_register_return_503_when_saturated(self):
+        User.objects.create_user(
+            email="busy@example.com",
+            firstName="Busy",
+            lastName="User",
+            password="password123",
+        )
+        with override_settings(PASSWORD_HASHING={"WORKERS": 0, "MAX_PENDING": 0, "TIMEOUT": 1}):
+            response = self.client.post(
+                "/auth/login",
+                data={"email": "busy@example.com", "password": "password123"},
+            )
+            assert response.status_code == 503
+            assert response["Retry-After"] == "1"
+            response = self.client.post(
+                "/auth/register",
+                data={
+                    "email": "new@example.com",
+                    "firstName": "New",
+                    "lastName": "User",
+                    "password": "password123",
+                },
+            )
+            assert response.status_code == 503
+        assert not User.objects.filter(email="new@example.com").exists()
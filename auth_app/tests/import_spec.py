@@ -0,0 +1,82 @@
+# tests/import_spec.py
+
+import json
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from auth_app.management.commands.import_users import Command
+from auth_app.importer import clean_row, copy_payload
+from auth_app.models import Membership, User, Organisation
+
+
+@pytest.mark.django_db
+class TestImportUsers:
+
+    def setup_method(self):
+        self.hashed = make_password("password123")
+
+    def write_ndjson(self, tmp_path, rows):
+        path = tmp_path / "users.ndjson"
+        path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+        return str(path)
+
+    # It Should Import Pre-Hashed and Plain Rows With Default Organisations.
+    def test_imports_users_organisations_and_memberships(self, tmp_path):
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,firstName,lastName,phone,password,passwordHash\n"
+            f"ada@example.com,Ada,Lovelace,,,{self.hashed}\n"
+            "alan@example.com,Alan,Turing,0800,secret123,\n"
+            "broken,No,Email,,secret123,\n"
+            f"ADA@example.com,Ada,Again,,,{self.hashed}\n"
+        )
+        call_command("import_users", str(path), "--batch-size", "2", "--workers", "1", verbosity=0)
+
+        assert User.objects.count() == 2
+        ada = User.objects.get(email="ada@example.com")
+        assert ada.check_password("password123")
+        assert User.objects.get(email="alan@example.com").check_password("secret123")
+        organisation = Organisation.objects.get(users=ada)
+        assert organisation.name == "Ada's Organisation"
+        assert organisation.member_count == 1
+        assert Membership.objects.count() == 2
+
+    # It Should Apply the Conflict Policy to Existing Emails.
+    def test_conflict_policies(self, tmp_path):
+        User.objects.create_user(email="ada@example.com", firstName="Ada", lastName="Old", password="x")
+        path = self.write_ndjson(
+            tmp_path, [{"email": "ada@example.com", "firstName": "Ada", "lastName": "New", "passwordHash": self.hashed}]
+        )
+
+        call_command("import_users", path, "--conflict", "skip", verbosity=0)
+        assert User.objects.get(email="ada@example.com").lastName == "Old"
+
+        call_command("import_users", path, "--conflict", "update", verbosity=0)
+        user = User.objects.get(email="ada@example.com")
+        assert user.lastName == "New"
+        assert user.check_password("password123")
+
+        with pytest.raises(CommandError):
+            call_command("import_users", path, "--conflict", "fail", verbosity=0)
+        assert User.objects.count() == 1
+
+    # It Should Escape Values and Mark NULLs in the COPY Payload.
+    def test_copy_payload_escaping(self):
+        user = User(email="tab@example.com", firstName="Tab\tbed", lastName="Line\nBreak\\", password="x")
+        fields = [User._meta.get_field(name) for name in ("firstName", "lastName", "phone", "is_active")]
+        assert copy_payload(fields, [user]).getvalue() == "Tab\\tbed\tLine\\nBreak\\\\\t\\N\tt\n"
+
+    # It Should Reject the Emails Registration Rejects.
+    def test_email_validation_matches_registration(self):
+        row = {"firstName": "Ada", "lastName": "Lovelace", "password": "password123"}
+        for email in ("ada@", "@example.com", "ada@@example.com", "ada@example", "ada lovelace@example.com"):
+            assert clean_row({**row, "email": email}) == (None, "Enter a valid email address."), email
+        data, error = clean_row({**row, "email": "ada@Example.com"})
+        assert error is None and data["email"] == "ada@example.com"
+
+    # It Should Hash With the Configured Number of Workers by Default.
+    def test_workers_default_to_password_hashing(self, settings):
+        parser = Command().create_parser("manage.py", "import_users")
+        assert parser.parse_args(["users.csv"]).workers == settings.PASSWORD_HASHING["WORKERS"]
@@ -0,0 +1,99 @@
+# tests/membership_spec.py
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from auth_app import membership
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestMembershipCache:
+
+    def setup_method(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            email="owner@example.com", firstName="Owner", lastName="User", password="password123"
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com", firstName="Other", lastName="User", password="password123"
+        )
+        self.organisation = Organisation.objects.create(name="Acme")
+        self.organisation.users.add(self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def teardown_method(self):
+        cache.clear()
+
+    # It Should Probe a Single Membership Row, Then Answer From the Warm Cache.
+    def test_membership_check_is_cached(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert membership.is_member(self.owner.pk, self.organisation)
+        membership.get_org_ids(self.owner.pk)
+        with django_assert_num_queries(0):
+            assert membership.is_member(self.owner.pk, self.organisation)
+            assert not membership.is_member(self.owner.pk, Organisation(orgId="missing"))
+
+    # It Should Invalidate Cached Memberships When Users Are Added or Removed.
+    def test_m2m_changes_invalidate_cache(self):
+        membership.get_org_ids(self.other.pk)
+        assert not membership.is_member(self.other.pk, self.organisation)
+        response = self.client.post(
+            f"/api/organisations/{self.organisation.orgId}/users",
+            data={"userId": self.other.userId},
+        )
+        assert response.status_code == 200
+        assert str(self.organisation.orgId) in membership.get_org_ids(self.other.pk)
+
+        self.other.organisations.remove(self.organisation)
+        assert str(self.organisation.orgId) not in membership.get_org_ids(self.other.pk)
+
+        membership.get_org_ids(self.owner.pk)
+        self.organisation.users.clear()
+        assert str(self.organisation.orgId) not in membership.get_org_ids(self.owner.pk)
+
+    # It Should Add Users in Bulk and Report Added, Existing and Unknown Ids.
+    def test_bulk_add_users(self):
+        third = User.objects.create_user(
+            email="third@example.com", firstName="Third", lastName="User", password="password123"
+        )
+        response = self.client.post(
+            f"/api/organisations/{self.organisation.orgId}/users/bulk",
+            data={"userIds": [self.owner.userId, self.other.userId, third.userId, "unknown"]},
+            format="json",
+        )
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["added"] == 2
+        assert data["alreadyMembers"] == 1
+        assert data["notFound"] == 1
+        assert data["notFoundUserIds"] == ["unknown"]
+        assert self.organisation.users.count() == 3
+
+    # It Should Count Only the Rows an Add Actually Inserted.
+    def test_add_members_counts_inserted_rows(self):
+        assert membership.add_members(self.organisation, [self.other.pk, self.other.pk, self.owner.pk]) == [
+            self.other.pk
+        ]
+        assert async_to_sync(membership.aadd_members)(self.organisation, [self.other.pk, self.owner.pk]) == []
+        self.organisation.refresh_from_db()
+        assert self.organisation.member_count == self.organisation.users.count() == 2
+
+    # It Should Keep member_count in Step With Memberships.
+    def test_member_count_tracks_memberships(self):
+        def count():
+            return Organisation.objects.get(pk=self.organisation.pk).member_count
+
+        assert count() == 1
+        self.client.post(f"/api/organisations/{self.organisation.orgId}/users", data={"userId": self.other.userId})
+        self.client.post(f"/api/organisations/{self.organisation.orgId}/users", data={"userId": self.other.userId})
+        assert count() == 2
+        response = self.client.get(f"/api/organisations/{self.organisation.orgId}")
+        assert response.json()["data"]["memberCount"] == 2
+
+        self.other.delete()
+        assert count() == 1
+        self.owner.organisations.remove(self.organisation)
+        assert count() == 0
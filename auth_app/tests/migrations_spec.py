@@ -0,0 +1,79 @@
+# tests/migrations_spec.py
+
+import uuid
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from auth_app.models import Membership, User, Organisation
+
+
+def migrate(target=None):
+    """Migrates auth_app to ``target`` (its latest migration by default) and returns the historical apps."""
+    executor = MigrationExecutor(connection)
+    targets = [("auth_app", target)] if target else executor.loader.graph.leaf_nodes("auth_app")
+    executor.migrate(targets)
+    executor.loader.build_graph()
+    return executor.loader.project_state(targets).apps
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDataMigrations:
+    # It Should Carry Existing String Identifiers Over to the UUID Columns.
+    def test_uuid_backfill_keeps_identifiers(self):
+        apps = migrate("0005_user_email_ci_unique")
+        OldUser = apps.get_model("auth_app", "User")
+        OldOrganisation = apps.get_model("auth_app", "Organisation")
+        user_id, org_id = str(uuid.uuid4()), str(uuid.uuid4())
+        OldUser.objects.create(userId=user_id, email="old@example.com", firstName="Old", lastName="User")
+        odd = OldUser.objects.create(userId="not-a-uuid", email="odd@example.com", firstName="Odd", lastName="User")
+        OldOrganisation.objects.create(orgId=org_id, name="Old Org")
+
+        # Clients hold these identifiers, so one that isn't a UUID stops the migration instead of being replaced.
+        with pytest.raises(ValueError, match=f"User pk={odd.pk} userId='not-a-uuid'"):
+            migrate()
+        mapped = str(uuid.uuid4())
+        OldUser.objects.filter(pk=odd.pk).update(userId=mapped)
+
+        migrate()
+
+        assert User.objects.get(email="old@example.com").userId == uuid.UUID(user_id)
+        assert User.objects.get(email="odd@example.com").userId == uuid.UUID(mapped)
+        assert User.objects.get(email="odd@example.com").userId_legacy == mapped
+        assert Organisation.objects.get(name="Old Org").orgId == uuid.UUID(org_id)
+
+    # It Should List Emails That Differ Only in Case Before Adding the Index.
+    def test_case_duplicates_stop_migration(self):
+        apps = migrate("0004_rename_org_id_organisation_orgid_and_more")
+        OldUser = apps.get_model("auth_app", "User")
+        first = OldUser.objects.create(userId=str(uuid.uuid4()), email="Dup@example.com", firstName="D", lastName="Up")
+        second = OldUser.objects.create(userId=str(uuid.uuid4()), email="dup@example.com", firstName="D", lastName="Up")
+
+        with pytest.raises(ValueError, match=f"pk={first.pk} Dup@example.com, pk={second.pk} dup@example.com"):
+            migrate()
+        OldUser.objects.filter(pk=second.pk).update(email="dup2@example.com")
+
+        migrate()
+
+        assert User.objects.filter(email__iexact="dup@example.com").count() == 1
+
+    # It Should Adopt Existing Memberships and Count Them.
+    def test_membership_backfill(self):
+        apps = migrate("0008_swap_uuid_columns")
+        OldUser = apps.get_model("auth_app", "User")
+        OldOrganisation = apps.get_model("auth_app", "Organisation")
+        through = OldOrganisation._meta.get_field("users").remote_field.through
+        users = [
+            OldUser.objects.create(email=f"m{n}@example.com", firstName="M", lastName="User") for n in range(3)
+        ]
+        busy, empty = OldOrganisation.objects.create(name="Busy"), OldOrganisation.objects.create(name="Empty")
+        busy.users.add(*users)
+
+        adopted = migrate()
+
+        # The adopted table keeps the auto-created through model's primary key.
+        pk = adopted.get_model("auth_app", "Membership")._meta.pk
+        assert pk.get_internal_type() == through._meta.pk.get_internal_type() == "BigAutoField"
+        assert Organisation.objects.get(name="Busy").member_count == 3
+        assert Organisation.objects.get(name="Empty").member_count == 0
+        assert Membership.objects.filter(organisation__name="Busy", joined_at__isnull=False).count() == 3
@@ -0,0 +1,128 @@
+# tests/outbox_spec.py
+
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from auth_app import outbox
+from auth_app.models import OutboxMessage, User
+
+
+@pytest.fixture
+def failing_topic():
+    calls = []
+
+    @outbox.handler("test.failing")
+    def fail(message):
+        calls.append(message.attempts)
+        raise RuntimeError("handler failed")
+
+    yield calls
+    outbox._handlers.pop("test.failing")
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def setup_method(self):
+        self.client = APIClient()
+
+    def register(self, email):
+        response = self.client.post(
+            "/auth/register",
+            {"email": email, "firstName": "Out", "lastName": "Box", "password": "password123"},
+            format="json",
+        )
+        assert response.status_code == 201
+        return response.json()["data"]
+
+    # It Should Leave the Outstanding Token to the Worker, Which Records It Once.
+    def test_registration_defers_outstanding_token(self):
+        self.register("outbox@example.com")
+        message = OutboxMessage.objects.get()
+        assert message.topic == "outstanding_token"
+        assert not OutstandingToken.objects.exists()
+
+        assert outbox.drain(10) == (1, 0)
+        token = OutstandingToken.objects.get()
+        assert token.user == User.objects.get(email="outbox@example.com")
+        assert token.jti == message.payload["jti"]
+        assert OutboxMessage.objects.get().processed_at is not None
+
+        outbox.enqueue("outstanding_token", message.payload, key=message.idempotency_key)
+        assert OutboxMessage.objects.count() == 1
+        assert outbox.drain(10) == (0, 0)
+
+    # It Should Let a Token Be Revoked Before the Worker Has Recorded It.
+    def test_logout_before_worker(self):
+        refresh = self.register("early@example.com")["refreshToken"]
+        assert self.client.post("/auth/logout", {"refreshToken": refresh}, format="json").status_code == 200
+        assert outbox.drain(10) == (1, 0)
+        assert OutstandingToken.objects.get().user.email == "early@example.com"
+        assert BlacklistedToken.objects.count() == 1
+
+    # It Should Drop the Message With the Transaction That Enqueued It.
+    def test_rollback_discards_message(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                outbox.enqueue("outstanding_token", {}, key="rolled-back")
+                raise RuntimeError
+        assert not OutboxMessage.objects.exists()
+
+    # It Should Retry a Failing Handler With Backoff and Give Up After MAX_ATTEMPTS.
+    def test_retries_then_gives_up(self, settings, failing_topic):
+        settings.OUTBOX = {**settings.OUTBOX, "MAX_ATTEMPTS": 3, "RETRY_BASE_SECONDS": 0}
+        outbox.enqueue("test.failing", {}, key="failing")
+        assert outbox.drain(10) == (0, 3)
+        assert failing_topic == [1, 2, 3]
+        message = OutboxMessage.objects.get()
+        assert message.processed_at is None
+        assert message.dead_at is not None
+        assert "handler failed" in message.last_error
+        assert outbox.stats() == {"pending": 0, "dead": 1}
+
+        settings.OUTBOX = {**settings.OUTBOX, "MAX_ATTEMPTS": 3, "RETRY_BASE_SECONDS": 60}
+        assert outbox.retry_delay(1) == 60
+        assert outbox.retry_delay(20) == settings.OUTBOX["RETRY_MAX_SECONDS"]
+
+    # It Should Drain Pending Messages From the Management Command.
+    def test_worker_command(self):
+        self.register("worker@example.com")
+        stdout = io.StringIO()
+        call_command("run_outbox_worker", "--once", "--workers", "1", stdout=stdout)
+        assert stdout.getvalue() == "Processed 1 outbox messages, 0 failed\n"
+        assert OutstandingToken.objects.count() == 1
+
+    # It Should Mark Abandoned Final Attempts Dead and Purge Dead Messages After RETENTION_DAYS.
+    def test_purge_dead_messages(self, settings):
+        settings.OUTBOX = {**settings.OUTBOX, "MAX_ATTEMPTS": 2}
+        outbox.enqueue("test.failing", {}, key="abandoned")
+        outbox.enqueue("test.failing", {}, key="old")
+        outbox.enqueue("test.failing", {}, key="pending")
+        # A worker claimed the last attempt and died.
+        OutboxMessage.objects.filter(idempotency_key="abandoned").update(attempts=2)
+        long_ago = timezone.now() - timedelta(days=settings.OUTBOX["RETENTION_DAYS"] + 1)
+        OutboxMessage.objects.filter(idempotency_key="old").update(attempts=2, dead_at=long_ago)
+
+        assert outbox.purge() == 1
+        assert OutboxMessage.objects.get(idempotency_key="abandoned").dead_at is not None
+        assert outbox.stats() == {"pending": 1, "dead": 1}
+
+    # It Should Report Dead Messages From the Worker and the Metrics Endpoint.
+    def test_dead_messages_reported(self, settings, failing_topic):
+        settings.OUTBOX = {**settings.OUTBOX, "MAX_ATTEMPTS": 1}
+        outbox.enqueue("test.failing", {}, key="failing")
+        stderr = io.StringIO()
+        call_command("run_outbox_worker", "--once", "--workers", "1", stdout=io.StringIO(), stderr=stderr)
+        assert "1 outbox messages gave up after MAX_ATTEMPTS" in stderr.getvalue()
+
+        admin = User.objects.create_superuser(
+            email="admin@example.com", firstName="Ad", lastName="Min", password="password123"
+        )
+        self.client.force_authenticate(user=admin)
+        assert self.client.get("/api/metrics").json()["data"]["outbox"] == {"pending": 0, "dead": 1}
@@ -0,0 +1,56 @@
+# tests/pagination_spec.py
+
+import json
+
+import pytest
+from rest_framework.test import APIClient
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestOrganisationListPagination:
+
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="pager@example.com", firstName="Pager", lastName="User", password="password123"
+        )
+        for index in range(5):
+            Organisation.objects.create(name=f"Org {index}").users.add(self.user)
+        Organisation.objects.create(name="Not mine")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    # It Should Page Through Organisations With a Cursor.
+    def test_cursor_pagination(self):
+        names = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get("/api/organisations", params)
+            assert response.status_code == 200
+            data = response.json()["data"]
+            assert len(data["organisations"]) <= 2
+            names += [org["name"] for org in data["organisations"]]
+            cursor = data["nextCursor"]
+            if cursor is None:
+                break
+        assert names == [f"Org {index}" for index in range(5)]
+
+    # It Should Reject a Tampered Cursor.
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/organisations", {"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    # It Should Stream the Same Envelope Incrementally.
+    def test_streaming_mode(self):
+        response = self.client.get("/api/organisations", {"stream": "true"})
+        assert response.status_code == 200
+        assert response.streaming
+        body = json.loads(b"".join(response.streaming_content))
+        assert body["status"] == "success"
+        assert body["message"] == "Organisations retrieved successfully"
+        assert [org["name"] for org in body["data"]["organisations"]] == [
+            f"Org {index}" for index in range(5)
+        ]
@@ -0,0 +1,61 @@
+# tests/registration_spec.py
+
+import pytest
+from django.db import IntegrityError
+from rest_framework.test import APIClient
+from auth_app import registration
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestRegistrationPipeline:
+    client = APIClient()
+
+    def register(self, email):
+        return self.client.post(
+            "/auth/register",
+            data={
+                "email": email,
+                "firstName": "Pipe",
+                "lastName": "Line",
+                "password": "password123",
+            },
+        )
+
+    # It Should Register With Only the Necessary Writes.
+    def test_register_query_count(self, django_assert_max_num_queries):
+        # savepoint + user, organisation, membership, outstanding token + release
+        with django_assert_max_num_queries(6):
+            response = self.register("pipeline@example.com")
+        assert response.status_code == 201
+        user = User.objects.get(email="pipeline@example.com")
+        organisation = Organisation.objects.get(users=user)
+        assert response.json()["data"]["user"]["organisations"] == [
+            {"orgId": str(organisation.orgId), "name": "Pipe's Organisation", "description": "Default organisation"}
+        ]
+
+    # It Should Reject Emails That Differ Only by Case and Leave No Rows Behind.
+    def test_register_duplicate_email_ignores_case(self):
+        assert self.register("Case@Example.com").status_code == 201
+        response = self.register("case@example.com")
+        assert response.status_code == 422
+        assert response.json()["errors"] == {"email": ["A user with this email already exists."]}
+        assert User.objects.count() == 1
+        assert Organisation.objects.count() == 1
+
+    # It Should Only Report a Duplicate Email for the Email Constraints.
+    def test_other_integrity_errors_propagate(self, monkeypatch):
+        assert self.register("first@example.com").status_code == 201
+        taken = Organisation.objects.get().orgId
+
+        def colliding(user):
+            organisation = Organisation(name="Collision", member_count=1)
+            organisation.orgId = taken
+            return organisation
+
+        monkeypatch.setattr(registration, "default_organisation", colliding)
+        data = {"email": "second@example.com", "firstName": "Se", "lastName": "Cond", "password": "password123"}
+        with pytest.raises(IntegrityError):
+            registration.register_user(data)
+        with pytest.raises(registration.DuplicateEmail):
+            registration.register_user({**data, "email": "first@example.com"})
@@ -0,0 +1,62 @@
+# tests/renderers_spec.py
+
+import io
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from auth_app.management.commands.benchmark_renderers import payloads
+from auth_app.renderers import FastJSONParser, FastJSONRenderer
+
+
+class TestFastJSON:
+
+    # It Should Render Exactly What DRF's JSONRenderer Renders.
+    def test_render_matches_drf(self):
+        samples = [
+            *payloads(3).values(),
+            {
+                "uuid": uuid.UUID(int=7),
+                "aware": datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+                "offset": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=1))),
+                "naive": datetime(2024, 1, 2, 3, 4, 5),
+                "date": date(2024, 1, 2),
+                "decimal": Decimal("1.50"),
+                "lazy": gettext_lazy("Login successful"),
+                "text": "café \u2028 \u2029 \"quoted\"",
+                "tuple": (1, 2),
+            },
+            {1: "non-string key"},
+            {"big": 2**70},
+            [],
+        ]
+        for data in samples:
+            assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+        assert FastJSONRenderer().render(None) == b""
+        assert FastJSONRenderer().render({"a": [1]}, "application/json; indent=2") == JSONRenderer().render(
+            {"a": [1]}, "application/json; indent=2"
+        )
+
+    # It Should Parse JSON Bodies Like DRF and Keep Its Error Messages.
+    def test_parse_matches_drf(self):
+        body = JSONRenderer().render(payloads(2)["login"])
+        assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+        with pytest.raises(ParseError) as fast:
+            FastJSONParser().parse(io.BytesIO(b'{"email": '))
+        with pytest.raises(ParseError) as drf:
+            JSONParser().parse(io.BytesIO(b'{"email": '))
+        assert str(fast.value) == str(drf.value)
+
+    # It Should Report Per-Response Timings for Both Implementations.
+    def test_benchmark_command(self, tmp_path):
+        output = tmp_path / "renderers.json"
+        call_command("benchmark_renderers", iterations=5, organisations=2, output=str(output), stdout=io.StringIO())
+        report = output.read_text()
+        assert '"organisation-list"' in report and '"renderUs"' in report
@@ -0,0 +1,107 @@
+# tests/replicas_spec.py
+
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+from auth_app import routers
+from auth_app.middleware import ReplicaPinningMiddleware
+from auth_app.models import User
+from auth_app.routers import ReplicaRouter, replica_health
+
+
+@pytest.fixture
+def replicas(settings, monkeypatch):
+    settings.REPLICA_ROUTING = {**settings.REPLICA_ROUTING, "REPLICAS": ["replica_1"]}
+    monkeypatch.setattr(replica_health, "available", lambda: ["replica_1"])
+
+
+# Transactional, since reads inside the test case's atomic block stay on the primary.
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    def teardown_method(self):
+        replica_health.reset()
+
+    # It Should Read From a Replica Until the Request Writes or Opens a Transaction.
+    def test_router(self, replicas):
+        router = ReplicaRouter()
+        assert router.db_for_read(User) == "replica_1"
+        with transaction.atomic():
+            assert router.db_for_read(User) == "default"
+
+        state, token = routers.start()
+        try:
+            assert router.db_for_read(User) == "replica_1"
+            assert router.db_for_write(User) == "default"
+            assert state.wrote
+            assert router.db_for_read(User) == "default"
+        finally:
+            routers.stop(token)
+        assert router.allow_migrate("replica_1", "auth_app") is False
+
+    # It Should Pin a Client's Reads to the Primary After It Writes.
+    def test_pin_cookie(self, replicas, settings):
+        router = ReplicaRouter()
+        cookie = settings.REPLICA_ROUTING["PIN_COOKIE"]
+
+        def view(request):
+            if request.method == "POST":
+                router.db_for_write(User)
+            return HttpResponse(router.db_for_read(User))
+
+        middleware = ReplicaPinningMiddleware(view)
+        factory = RequestFactory()
+        response = middleware(factory.post("/api/organisations"))
+        assert response.content == b"default"
+        pin = response.cookies[cookie].value
+
+        assert middleware(factory.get("/api/organisations")).content == b"replica_1"
+        pinned = factory.get("/api/organisations")
+        pinned.COOKIES[cookie] = pin
+        assert middleware(pinned).content == b"default"
+        forged = factory.get("/api/organisations")
+        forged.COOKIES[cookie] = "primary"
+        assert middleware(forged).content == b"replica_1"
+
+    # It Should Set the Pin Cookie When Registration Writes.
+    def test_register_sets_pin(self, settings):
+        settings.REPLICA_ROUTING = {**settings.REPLICA_ROUTING, "REPLICAS": ["default"]}
+        response = APIClient().post(
+            "/auth/register",
+            {"email": "pin@example.com", "firstName": "Pin", "lastName": "User", "password": "password123"},
+            format="json",
+        )
+        assert response.status_code == 201
+        assert settings.REPLICA_ROUTING["PIN_COOKIE"] in response.cookies
+
+    # It Should Cache Replica Probes and Fall Back to the Primary While One Is Down.
+    def test_health_fallback(self, settings, monkeypatch):
+        settings.REPLICA_ROUTING = {**settings.REPLICA_ROUTING, "REPLICAS": ["replica_1"], "HEALTH_CHECK_SECONDS": 60}
+        probes = []
+
+        def check(alias):
+            probes.append(alias)
+            return False, None
+
+        monkeypatch.setattr(replica_health, "check", check)
+        router = ReplicaRouter()
+        assert router.db_for_read(User) == "default"
+        assert router.db_for_read(User) == "default"
+        assert probes == ["replica_1"]
+
+        monkeypatch.setattr(replica_health, "check", lambda alias: (True, 0.0))
+        settings.REPLICA_ROUTING = {**settings.REPLICA_ROUTING, "HEALTH_CHECK_SECONDS": 0}
+        assert router.db_for_read(User) == "replica_1"
+
+    # It Should Report Replica Health and Lag.
+    def test_check_replicas(self, settings):
+        assert replica_health.check("default") == (True, 0.0)
+        settings.REPLICA_ROUTING = {**settings.REPLICA_ROUTING, "REPLICAS": ["default"]}
+        stdout = io.StringIO()
+        call_command("check_replicas", stdout=stdout)
+        assert stdout.getvalue() == "default: ok, 0.00s behind\n"
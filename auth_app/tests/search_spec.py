@@ -0,0 +1,55 @@
+# tests/search_spec.py
+
+import pytest
+from rest_framework.test import APIClient
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestOrganisationSearch:
+    client = APIClient()
+
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="search@example.com", firstName="Search", lastName="User", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        for name, description in [
+            ("Widgets", "Makes gadgets"),
+            ("Acme Widgets", None),
+            ("Gadget Co", "Sells widgets"),
+            ("widgets", "Lowercase twin"),
+            ("Unrelated", "Nothing here"),
+        ]:
+            Organisation.objects.create(name=name, description=description).users.add(self.user)
+        Organisation.objects.create(name="Widgets Elsewhere")
+
+    def search(self, **params):
+        return self.client.get("/api/organisations/search", params)
+
+    # It Should Rank Exact, Prefix, Substring and Description Matches, in That Order.
+    def test_ranked_results_scoped_to_memberships(self):
+        response = self.search(q="WIDGETS")
+        assert response.status_code == 200
+        names = [row["name"] for row in response.json()["data"]["organisations"]]
+        assert names == ["Widgets", "widgets", "Acme Widgets", "Gadget Co"]
+
+    # It Should Continue From the Cursor Without Repeating Rows.
+    def test_cursor_continuation(self):
+        names, cursor = [], None
+        while True:
+            params = {"q": "widgets", "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.search(**params).json()["data"]
+            names += [row["name"] for row in data["organisations"]]
+            cursor = data["nextCursor"]
+            if not cursor:
+                break
+        assert names == ["Widgets", "widgets", "Acme Widgets", "Gadget Co"]
+
+    # It Should Reject a Missing Query or a Bad Cursor.
+    def test_invalid_requests(self):
+        assert self.search().status_code == 400
+        assert self.search(q="widgets", cursor="bogus").status_code == 400
+        assert self.search(q="widgets", limit=0).status_code == 400
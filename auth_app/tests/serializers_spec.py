@@ -0,0 +1,38 @@
+# tests/serializers_spec.py
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from auth_app.models import User, Organisation
+from auth_app.serializers import FastUserSerializer, UserSerializer
+
+
+@pytest.mark.django_db
+class TestFastSerializers:
+
+    # It Should Render Byte-Identical JSON to UserSerializer.
+    def test_output_matches_model_serializer(self):
+        user = User.objects.create_user(
+            email="fast@example.com", firstName="Fäst", lastName="User", password="password123"
+        )
+        Organisation.objects.create(name="One", description="First").users.add(user)
+        Organisation.objects.create(name="Two").users.add(user)
+        user = User.objects.get(pk=user.pk)
+        renderer = JSONRenderer()
+        assert renderer.render(FastUserSerializer.to_representation(user)) == renderer.render(
+            UserSerializer(user).data
+        )
+
+    # It Should Load a User and Their Organisations in Two Queries.
+    def test_user_detail_query_count(self, django_assert_num_queries):
+        user = User.objects.create_user(
+            email="detail@example.com", firstName="Detail", lastName="User", password="password123"
+        )
+        for name in ("One", "Two", "Three"):
+            Organisation.objects.create(name=name).users.add(user)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        with django_assert_num_queries(2):
+            response = client.get(f"/api/users/{user.userId}")
+        assert response.status_code == 200
+        assert len(response.json()["data"]["organisations"]) == 3
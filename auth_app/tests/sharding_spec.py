@@ -0,0 +1,246 @@
+# tests/sharding_spec.py
+
+import io
+import json
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from auth_app import resharding, sharding
+from auth_app.models import Membership, Organisation, ShardPlacement, User
+
+SHARDS = ["shard_0", "shard_1"]
+
+
+@pytest.fixture(scope="module")
+def shard_databases(django_db_setup, django_db_blocker):
+    # Two extra in-memory SQLite databases, migrated like any test database.
+    with django_db_blocker.unblock():
+        for alias in SHARDS:
+            configured = connections.configure_settings(
+                {
+                    DEFAULT_DB_ALIAS: dict(connections.settings[DEFAULT_DB_ALIAS]),
+                    alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+                }
+            )
+            connections.settings[alias] = configured[alias]
+            connections[alias].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        yield
+        for alias in SHARDS:
+            connections[alias].creation.destroy_test_db(":memory:", verbosity=0)
+            del connections.settings[alias]
+
+
+@pytest.fixture
+def sharded(shard_databases, settings):
+    settings.SHARDING = {**settings.SHARDING, "DATABASES": SHARDS}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def org_on(alias, name, *users):
+    """Creates an organisation whose orgId hashes to ``alias``, with ``users`` as members."""
+    orgId = uuid.uuid4()
+    while sharding.hash_shard(orgId) != alias:
+        orgId = uuid.uuid4()
+    with sharding.use_shard(alias):
+        organisation = Organisation.objects.create(orgId=orgId, name=name, member_count=len(users))
+        Membership.objects.bulk_create([Membership(organisation=organisation, user_id=user.pk) for user in users])
+    return organisation
+
+
+# Transactional, since fan-out queries run on other threads' connections.
+@pytest.mark.django_db(databases=[DEFAULT_DB_ALIAS, *SHARDS], transaction=True)
+class TestSharding:
+
+    def setup_method(self):
+        self.client = APIClient()
+
+    def register(self, email):
+        response = self.client.post(
+            "/auth/register",
+            {"email": email, "firstName": "Shard", "lastName": "User", "password": "password123"},
+            format="json",
+        )
+        assert response.status_code == 201
+        return User.objects.get(email=email)
+
+    # It Should Place New Organisations on Their Hash Shard and Route Straight to It.
+    def test_registration_placement(self, sharded):
+        user = self.register("placed@example.com")
+        [orgId] = [
+            orgId
+            for org_ids in sharding.fan_out(
+                lambda alias: list(
+                    Membership.objects.filter(user_id=user.pk).values_list("organisation__orgId", flat=True)
+                )
+            )
+            for orgId in org_ids
+        ]
+        home = sharding.hash_shard(orgId)
+        other = next(alias for alias in SHARDS if alias != home)
+        assert Organisation.objects.using(home).filter(orgId=orgId).exists()
+        assert not Organisation.objects.using(other).exists()
+        assert not Organisation.objects.using(DEFAULT_DB_ALIAS).exists()
+
+        self.client.force_authenticate(user=user)
+        response = self.client.get(f"/api/organisations/{orgId}")
+        assert response.status_code == 200
+        assert response.json()["data"]["memberCount"] == 1
+        user_data = self.client.get(f"/api/users/{user.userId}").json()["data"]
+        assert [organisation["orgId"] for organisation in user_data["organisations"]] == [str(orgId)]
+
+        colleague = User.objects.create_user(
+            email="colleague@example.com", firstName="Col", lastName="League", password="password123"
+        )
+        response = self.client.post(
+            f"/api/organisations/{orgId}/users", {"userId": str(colleague.userId)}, format="json"
+        )
+        assert response.status_code == 200
+        assert Membership.objects.using(home).filter(user_id=colleague.pk).exists()
+        assert Organisation.objects.for_org(orgId).get(orgId=orgId).member_count == 2
+
+    # It Should Fan the Organisation List Out to the Shards and Merge Pages by orgId.
+    def test_list_merges_shards(self, sharded):
+        user = User.objects.create_user(
+            email="many@example.com", firstName="Many", lastName="Orgs", password="password123"
+        )
+        organisations = [org_on(alias, f"{alias}-{n}", user) for alias in SHARDS for n in range(3)]
+        expected = sorted(str(organisation.orgId) for organisation in organisations)
+        self.client.force_authenticate(user=user)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+            data = self.client.get("/api/organisations", params).json()["data"]
+            seen += [organisation["orgId"] for organisation in data["organisations"]]
+            cursor = data["nextCursor"]
+            if cursor is None:
+                break
+        assert seen == expected
+
+        response = self.client.get("/api/organisations", {"stream": "true"})
+        streamed = json.loads(b"".join(response.streaming_content))["data"]["organisations"]
+        assert sorted(organisation["orgId"] for organisation in streamed) == expected
+
+        response = self.client.get("/api/organisations/search", {"q": "shard_1"})
+        assert len(response.json()["data"]["organisations"]) == 3
+
+    # It Should Route the Async Views to the Shards Too.
+    @pytest.mark.urls("auth_app.async_urls")
+    def test_async_views(self, sharded):
+        client = AsyncClient()
+        response = async_to_sync(client.post)(
+            "/auth/register",
+            {"email": "async-shard@example.com", "firstName": "Async", "lastName": "Shard", "password": "password123"},
+            content_type="application/json",
+        )
+        assert response.status_code == 201
+        data = response.json()["data"]
+        headers = {"Authorization": f"Bearer {data['accessToken']}"}
+        orgId = data["user"]["organisations"][0]["orgId"]
+
+        response = async_to_sync(client.post)(
+            "/api/organisations", {"name": "Second"}, content_type="application/json", headers=headers
+        )
+        assert response.status_code == 201
+        second = response.json()["data"]["orgId"]
+        assert Organisation.objects.using(sharding.hash_shard(second)).filter(orgId=second).exists()
+
+        response = async_to_sync(client.get)(f"/api/organisations/{orgId}", headers=headers)
+        assert response.status_code == 200
+        response = async_to_sync(client.get)("/api/organisations", headers=headers)
+        assert [organisation["orgId"] for organisation in response.json()["data"]["organisations"]] == sorted(
+            [orgId, second]
+        )
+        response = async_to_sync(client.get)(f"/api/users/{data['user']['userId']}", headers=headers)
+        assert len(response.json()["data"]["organisations"]) == 2
+
+    # It Should Refuse to Query a Sharded Model Without a Shard.
+    def test_requires_shard(self, sharded):
+        with pytest.raises(sharding.NoShardSelected):
+            Organisation.objects.count()
+        assert sum(sharding.fan_out(lambda alias: Organisation.objects.count())) == 0
+
+    # It Should Move an Organisation Between Shards and Rebalance It Back.
+    def test_move_and_rebalance(self, sharded):
+        user = User.objects.create_user(
+            email="mover@example.com", firstName="Mo", lastName="Ver", password="password123"
+        )
+        organisation = org_on("shard_0", "Movers", user)
+        stdout = io.StringIO()
+        call_command("reshard", "--org", str(organisation.orgId), "--to", "shard_1", stdout=stdout)
+        assert stdout.getvalue() == f"Moved {organisation.orgId} from shard_0 to shard_1\n"
+        assert not Organisation.objects.using("shard_0").exists()
+        assert Membership.objects.using("shard_1").filter(user_id=user.pk).exists()
+        assert ShardPlacement.objects.get(orgId=organisation.orgId).database == "shard_1"
+
+        self.client.force_authenticate(user=user)
+        response = self.client.get(f"/api/organisations/{organisation.orgId}")
+        assert response.status_code == 200
+        assert response.json()["data"]["name"] == "Movers"
+
+        assert resharding.rebalance(dry_run=True) == [(organisation.orgId, "shard_1", "shard_0")]
+        assert resharding.rebalance() == [(organisation.orgId, "shard_1", "shard_0")]
+        assert Organisation.objects.using("shard_0").filter(orgId=organisation.orgId).exists()
+        assert not ShardPlacement.objects.exists()
+        assert resharding.pin_all() == 1
+        assert ShardPlacement.objects.get(orgId=organisation.orgId).database == "shard_0"
+
+    # It Should Export an Organisation's Members From Its Shard.
+    def test_export_command(self, sharded, tmp_path):
+        users = [
+            User.objects.create_user(
+                email=f"export-{n}@example.com", firstName="Ex", lastName="Port", password="password123"
+            )
+            for n in range(3)
+        ]
+        organisation = org_on("shard_1", "Exported", *users)
+        output = tmp_path / "members.ndjson"
+        stderr = io.StringIO()
+        call_command("export_members", str(organisation.orgId), "--output", str(output), stderr=stderr)
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [record["email"] for record in records] == [user.email for user in users]
+        assert stderr.getvalue().startswith("Exported 3 members")
+
+    # It Should Follow a Move Another Worker Made While Its Old Shard Was Cached.
+    def test_stale_placement(self, shared_cache, sharded):
+        user = User.objects.create_user(
+            email="stale@example.com", firstName="St", lastName="Ale", password="password123"
+        )
+        colleague = User.objects.create_user(
+            email="stale-colleague@example.com", firstName="Col", lastName="League", password="password123"
+        )
+        organisation = org_on("shard_0", "Moved Away", user)
+        resharding.move_organisation(organisation.orgId, "shard_1")
+        # What a worker that read the placement just before the move would have cached.
+        cache.set(sharding._placement_key(organisation.orgId), "shard_0")
+
+        self.client.force_authenticate(user=user)
+        response = self.client.get(f"/api/organisations/{organisation.orgId}")
+        assert response.status_code == 200
+        cache.set(sharding._placement_key(organisation.orgId), "shard_0")
+        response = self.client.post(
+            f"/api/organisations/{organisation.orgId}/users", {"userId": str(colleague.userId)}, format="json"
+        )
+        assert response.status_code == 200
+        assert Membership.objects.using("shard_1").filter(user_id=colleague.pk).exists()
+        assert sharding.shard_for(organisation.orgId) == "shard_1"
+
+    # It Should Read Placements From the Directory When the Cache Is Per Process.
+    def test_local_cache_reads_directory(self, sharded):
+        user = User.objects.create_user(
+            email="local-shard@example.com", firstName="Lo", lastName="Cal", password="password123"
+        )
+        organisation = org_on("shard_0", "Local", user)
+        resharding.move_organisation(organisation.orgId, "shard_1")
+        cache.set(sharding._placement_key(organisation.orgId), "shard_0")
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/api/organisations")
+        assert [org["orgId"] for org in response.json()["data"]["organisations"]] == [str(organisation.orgId)]
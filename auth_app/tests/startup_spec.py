@@ -0,0 +1,20 @@
+# tests/startup_spec.py
+
+from auth_app.management.commands.profile_startup import parse_importtime
+
+
+class TestProfileStartup:
+    # It Should Parse Self and Cumulative Import Times per Module.
+    def test_parse_importtime(self):
+        stderr = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |   auth_app.timing",
+                "import time:       772 |      83670 | auth_app.views",
+                "unrelated line",
+            ]
+        )
+        assert parse_importtime(stderr) == {
+            "auth_app.timing": (120, 120),
+            "auth_app.views": (772, 83670),
+        }
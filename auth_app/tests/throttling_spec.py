@@ -0,0 +1,115 @@
+# tests/throttling_spec.py
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from auth_app import throttling
+from auth_app.metrics import counters
+from auth_app.models import User
+from auth_app.throttling import CacheBuckets, LocalBuckets
+
+
+def limits(settings, ip=100, email=100):
+    settings.AUTH_THROTTLE = {
+        **settings.AUTH_THROTTLE,
+        "IP": {"CAPACITY": ip, "PER_MINUTE": 1},
+        "EMAIL": {"CAPACITY": email, "PER_MINUTE": 1},
+    }
+
+
+def login(client, email, **extra):
+    return client.post("/auth/login", {"email": email, "password": "wrong-password"}, format="json", **extra)
+
+
+@pytest.mark.django_db
+class TestCredentialThrottle:
+
+    def setup_method(self):
+        self.client = APIClient()
+
+    # It Should Reject an Address Over Its Budget Before Hashing, Whatever It Forwards.
+    def test_ip_bucket(self, settings):
+        limits(settings, ip=2)
+        assert login(self.client, "a@example.com").status_code == 401
+        assert login(self.client, "b@example.com").status_code == 401
+        hashes = counters.get("hashing.admitted")
+
+        response = login(self.client, "c@example.com", HTTP_X_FORWARDED_FOR="203.0.113.9")
+        assert response.status_code == 429
+        assert response["Retry-After"] == "60"
+        assert counters.get("hashing.admitted") == hashes
+        assert login(self.client, "c@example.com", REMOTE_ADDR="10.0.0.2").status_code == 401
+
+    # It Should Limit Attempts per Email Across Addresses and Endpoints.
+    def test_email_bucket(self, settings):
+        limits(settings, email=2)
+        assert login(self.client, "target@example.com", REMOTE_ADDR="10.0.0.1").status_code == 401
+        assert login(self.client, " Target@Example.com", REMOTE_ADDR="10.0.0.2").status_code == 401
+        response = self.client.post(
+            "/auth/register",
+            {"email": "target@example.com", "firstName": "T", "lastName": "Arget", "password": "password123"},
+            format="json",
+            REMOTE_ADDR="10.0.0.3",
+        )
+        assert response.status_code == 429
+        assert not User.objects.filter(email="target@example.com").exists()
+        assert login(self.client, "other@example.com", REMOTE_ADDR="10.0.0.3").status_code == 401
+
+    # It Should Throttle the Async Views With DRF's Response.
+    @pytest.mark.urls("auth_app.async_urls")
+    def test_async_login(self, settings):
+        limits(settings, ip=1)
+        client = AsyncClient()
+        body = {"email": "async@example.com", "password": "wrong-password"}
+        assert async_to_sync(client.post)("/auth/login", body, content_type="application/json").status_code == 401
+        response = async_to_sync(client.post)("/auth/login", body, content_type="application/json")
+        assert response.status_code == 429
+        assert response["Retry-After"] == "60"
+        assert response.json() == {"detail": "Request was throttled. Expected available in 60 seconds."}
+
+    # It Should Report Admitted and Rejected Requests to Admins Only.
+    def test_metrics(self, settings):
+        limits(settings, ip=1)
+        login(self.client, "a@example.com")
+        login(self.client, "a@example.com")
+        admin = User.objects.create_superuser(
+            email="admin@example.com", firstName="Ad", lastName="Min", password="password123"
+        )
+        user = User.objects.create_user(email="user@example.com", firstName="Us", lastName="Er", password="password123")
+
+        self.client.force_authenticate(user=user)
+        assert self.client.get("/api/metrics").status_code == 403
+        self.client.force_authenticate(user=admin)
+        data = self.client.get("/api/metrics").json()["data"]
+        assert data["throttles"]["ip"] == {"admitted": 1, "rejected": 1}
+        assert data["throttles"]["email"] == {"admitted": 1, "rejected": 0}
+        assert data["hashing"]["inFlight"] == 0
+        assert data["hashing"]["maxInFlight"] == settings.PASSWORD_HASHING["MAX_PENDING"]
+
+
+class TestBuckets:
+
+    # It Should Refill Over Time and Evict the Least Recently Used Bucket.
+    def test_local_buckets(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(throttling.time, "monotonic", lambda: now[0])
+        buckets = LocalBuckets(max_keys=2)
+        assert buckets.consume("a", 2, 1.0) == (True, 0.0)
+        assert buckets.consume("a", 2, 1.0) == (True, 0.0)
+        assert buckets.consume("a", 2, 1.0) == (False, 1.0)
+        now[0] += 0.5
+        assert buckets.consume("a", 2, 1.0) == (False, 0.5)
+        now[0] += 0.5
+        assert buckets.consume("a", 2, 1.0) == (True, 0.0)
+
+        buckets.consume("b", 2, 1.0)
+        buckets.consume("c", 2, 1.0)
+        assert "a" not in buckets._buckets
+
+    # It Should Share Buckets Through the Cache.
+    def test_cache_buckets(self, monkeypatch):
+        monkeypatch.setattr(throttling.time, "time", lambda: 1000.0)
+        first, second = CacheBuckets("default"), CacheBuckets("default")
+        assert first.consume("auth_app:throttle:test", 1, 1.0) == (True, 0.0)
+        assert second.consume("auth_app:throttle:test", 1, 1.0) == (False, 1.0)
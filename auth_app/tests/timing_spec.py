@@ -0,0 +1,33 @@
+# tests/timing_spec.py
+
+import pytest
+from django.test import override_settings
+from rest_framework.test import APIClient
+from auth_app.models import User
+
+TIMING = {"ENABLED": True, "SAMPLE_RATE": 1.0, "SLOW_MS": 10_000, "HEADER": True}
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+    client = APIClient()
+
+    # It Should Report Query, Hashing, JWT and Render Phases in Server-Timing.
+    @override_settings(REQUEST_TIMING=TIMING)
+    def test_login_reports_phases(self):
+        User.objects.create_user(
+            email="timed@example.com", firstName="Timed", lastName="User", password="password123"
+        )
+        response = self.client.post(
+            "/auth/login", data={"email": "timed@example.com", "password": "password123"}
+        )
+        assert response.status_code == 200
+        metrics = {metric.split(";")[0] for metric in response["Server-Timing"].split(", ")}
+        assert metrics == {"db", "hash", "jwt", "render", "total"}
+        assert 'desc="3 queries"' in response["Server-Timing"]
+
+    # It Should Skip Unsampled Requests.
+    @override_settings(REQUEST_TIMING={**TIMING, "SAMPLE_RATE": 0.0})
+    def test_unsampled_request_has_no_header(self):
+        response = self.client.post("/auth/login", data={"email": "nobody@example.com", "password": "x"})
+        assert "Server-Timing" not in response
@@ -0,0 +1,116 @@
+# tests/token_spec.py
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import UntypedToken
+from auth_app.blacklist import BlacklistIndex, blacklist_index
+from auth_app.models import User
+from auth_app.tokens import AuthRefreshToken
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenLifecycle:
+    client = APIClient()
+
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="tokens@example.com", firstName="Token", lastName="User", password="password123"
+        )
+        self.refresh = str(AuthRefreshToken.for_user(self.user))
+
+    def teardown_method(self):
+        cache.clear()
+
+    # It Should Issue a New Access Token From a Valid Refresh Token.
+    def test_refresh_returns_access_token(self):
+        response = self.client.post("/auth/token/refresh", {"refreshToken": self.refresh}, format="json")
+        assert response.status_code == 200
+        assert response.data["data"]["accessToken"]
+
+    # It Should Reject a Refresh Token After Logout.
+    def test_logout_blacklists_refresh_token(self):
+        response = self.client.post("/auth/logout", {"refreshToken": self.refresh}, format="json")
+        assert response.status_code == 200
+        response = self.client.post("/auth/token/refresh", {"refreshToken": self.refresh}, format="json")
+        assert response.status_code == 401
+
+    # It Should Reject Refresh for a Deactivated User.
+    def test_refresh_rejects_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post("/auth/token/refresh", {"refreshToken": self.refresh}, format="json")
+        assert response.status_code == 401
+
+    # It Should Reject Refresh for a Deactivated User Without the Cache Marker.
+    def test_refresh_checks_database(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.clear()
+        response = self.client.post("/auth/token/refresh", {"refreshToken": self.refresh}, format="json")
+        assert response.status_code == 401
+
+    # It Should Mint Access Tokens From the Current Privileges and Email.
+    def test_refresh_rereads_claims(self):
+        self.user.is_staff = self.user.is_superuser = True
+        self.user.save()
+        refresh = str(AuthRefreshToken.for_user(self.user))
+        User.objects.filter(pk=self.user.pk).update(
+            is_staff=False, is_superuser=False, email="demoted@example.com"
+        )
+        response = self.client.post("/auth/token/refresh", {"refreshToken": refresh}, format="json")
+        assert response.status_code == 200
+        for key in ("accessToken", "refreshToken"):
+            if key not in response.data["data"]:
+                continue
+            token = UntypedToken(response.data["data"][key])
+            assert token["is_staff"] is False
+            assert token["is_superuser"] is False
+            assert token["email"] == "demoted@example.com"
+
+    # It Should Answer the Blacklist Check Without Queries When the Filter Misses.
+    def test_filter_miss_skips_database(self, shared_cache):
+        blacklist_index.is_blacklisted("warm-up")
+        with CaptureQueriesContext(connection) as captured:
+            assert not blacklist_index.is_blacklisted(AuthRefreshToken(self.refresh)["jti"])
+        assert len(captured.captured_queries) == 0
+
+    # It Should Never Trust a Miss From Before Another Worker Blacklisted the Token.
+    def test_independent_filters(self):
+        jti = AuthRefreshToken(self.refresh)["jti"]
+        here, there = BlacklistIndex(), BlacklistIndex()
+        assert not here.is_blacklisted(jti)
+        assert not there.is_blacklisted(jti)
+        # Written the way another worker would, without this process's cache.
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=OutstandingToken.objects.get(jti=jti))])
+        assert here.is_blacklisted(jti)
+        assert there.is_blacklisted(jti)
+
+    # It Should Catch Up Through the Shared Generation Without a Rebuild.
+    def test_independent_filters_shared_cache(self, shared_cache):
+        jti = AuthRefreshToken(self.refresh)["jti"]
+        here, there = BlacklistIndex(), BlacklistIndex()
+        assert not here.is_blacklisted(jti)
+        assert not there.is_blacklisted(jti)
+        built_at = here._built_at
+        assert self.client.post("/auth/logout", {"refreshToken": self.refresh}, format="json").status_code == 200
+        assert here.is_blacklisted(jti)
+        assert there.is_blacklisted(jti)
+        assert here._built_at == built_at
+
+    # It Should Delete Expired Tokens and Their Blacklist Entries.
+    def test_compaction_removes_expired_tokens(self):
+        expired = OutstandingToken.objects.create(
+            user=self.user, jti="expired-jti", token="x", expires_at=timezone.now() - timedelta(days=1)
+        )
+        BlacklistedToken.objects.create(token=expired)
+        call_command("compact_tokens", "--batch-size", "1")
+        assert not OutstandingToken.objects.filter(jti="expired-jti").exists()
+        assert not BlacklistedToken.objects.exists()
+        assert OutstandingToken.objects.count() == 1
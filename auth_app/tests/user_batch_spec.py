@@ -0,0 +1,54 @@
+# tests/user_batch_spec.py
+
+import uuid
+
+import pytest
+from rest_framework.test import APIClient
+from auth_app.models import User, Organisation
+
+
+@pytest.mark.django_db
+class TestUserBatch:
+
+    def setup_method(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"member{n}@example.com", firstName=f"Member{n}", lastName="User", password="password123"
+            )
+            for n in range(3)
+        ]
+        self.organisation = Organisation.objects.create(name="Acme")
+        self.organisation.users.add(*self.users[:2])
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.users[0])
+
+    # It Should Resolve Users in Request Order With Two Queries and Report Misses.
+    def test_get_batch(self, django_assert_num_queries):
+        missing = str(uuid.uuid4())
+        ids = [str(self.users[2].userId), missing, str(self.users[0].userId), "not-a-uuid", str(self.users[2].userId)]
+        with django_assert_num_queries(2):
+            response = self.client.get("/api/users", {"ids": ",".join(ids)})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [user["email"] for user in data["users"]] == ["member2@example.com", "member0@example.com"]
+        assert data["users"][1]["organisations"][0]["name"] == "Acme"
+        assert data["users"][0]["organisations"] == []
+        assert data["notFound"] == [missing, "not-a-uuid"]
+
+    # It Should Accept Large Sets as a POST Body and Enforce the Batch Limit.
+    def test_post_batch_and_limit(self, settings):
+        response = self.client.post("/api/users", {"ids": [str(user.userId) for user in self.users]}, format="json")
+        assert response.status_code == 200
+        assert len(response.json()["data"]["users"]) == 3
+
+        settings.USER_BATCH_MAX_IDS = 2
+        response = self.client.post("/api/users", {"ids": [str(user.userId) for user in self.users]}, format="json")
+        assert response.status_code == 400
+        assert response.json()["message"] == "Expected a list of 1 to 2 ids"
+        assert self.client.get("/api/users").status_code == 400
+        assert self.client.post("/api/users", {"ids": "a,b"}, format="json").status_code == 400
+
+    # It Should Require Authentication.
+    def test_requires_authentication(self):
+        response = APIClient().get("/api/users", {"ids": str(self.users[0].userId)})
+        assert response.status_code == 401
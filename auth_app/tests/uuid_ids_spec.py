@@ -0,0 +1,29 @@
+# tests/uuid_ids_spec.py
+
+import pytest
+from rest_framework.test import APIClient
+from auth_app.models import User
+from auth_app.tokens import AuthRefreshToken
+
+
+@pytest.mark.django_db
+class TestUUIDLookups:
+    client = APIClient()
+
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="uuid@example.com", firstName="Uuid", lastName="User", password="password123"
+        )
+        token = AuthRefreshToken.build_for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    # It Should Keep Returning Hyphenated UUID Strings.
+    def test_user_detail_wire_format(self):
+        response = self.client.get(f"/api/users/{self.user.userId}")
+        assert response.status_code == 200
+        assert response.json()["data"]["userId"] == str(self.user.userId)
+
+    # It Should Answer Malformed Identifiers With 404.
+    def test_malformed_identifiers_are_not_found(self):
+        assert self.client.get("/api/users/not-a-uuid").status_code == 404
+        assert self.client.get("/api/organisations/not-a-uuid").status_code == 404
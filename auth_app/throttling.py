@@ -0,0 +1,174 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.request import Request
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import counters
+from .renderers import request_data
+
+
+def _refill(tokens, stamp, now, capacity, rate):
+    """Adds the tokens earned since ``stamp`` and takes one if there is one: ``(allowed, tokens, wait)``."""
+    tokens = min(capacity, tokens + max(0.0, now - stamp) * rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / rate
+
+
+class LocalBuckets:
+    """
+    Token buckets for one process in a dict bounded to ``max_keys``,
+    dropping the least recently used. A dropped bucket comes back full, so
+    size MAX_KEYS above the number of clients expected in a refill period.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, stamp = self._buckets.pop(key, (capacity, now))
+            allowed, tokens, wait = _refill(tokens, stamp, now, capacity, rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBuckets:
+    """
+    Token buckets in a Django cache, shared by every worker. The
+    read-modify-write isn't atomic, so requests for one key racing each
+    other can share a token: the overshoot is bounded by how many race.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def consume(self, key, capacity, rate):
+        cache = caches[self.alias]
+        now = time.time()
+        tokens, stamp = cache.get(key) or (capacity, now)
+        allowed, tokens, wait = _refill(tokens, stamp, now, capacity, rate)
+        # A bucket left alone until it is full again needs no entry.
+        cache.set(key, (tokens, now), timeout=int(capacity / rate) + 1)
+        return allowed, wait
+
+    def reset(self):
+        pass
+
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+
+def get_buckets():
+    global _buckets
+    if _buckets is None:
+        with _buckets_lock:
+            if _buckets is None:
+                config = settings.AUTH_THROTTLE
+                if config["BACKEND"] == "cache":
+                    _buckets = CacheBuckets(config["CACHE_ALIAS"])
+                else:
+                    _buckets = LocalBuckets(config["MAX_KEYS"])
+    return _buckets
+
+
+def reset():
+    """Forgets every local bucket and the counters, e.g. between tests."""
+    if _buckets is not None:
+        _buckets.reset()
+    counters.reset()
+
+
+@receiver(setting_changed)
+def _reset_buckets(setting, **kwargs):
+    global _buckets
+    if setting == "AUTH_THROTTLE":
+        _buckets = None
+
+
+def _email(request):
+    data = request.data if isinstance(request, Request) else request_data(request)
+    email = data.get("email") if hasattr(data, "get") else None
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return hashlib.blake2b(email.strip().lower().encode(), digest_size=16).hexdigest()
+
+
+class CredentialThrottle(BaseThrottle):
+    """
+    Admission control for the endpoints that hash a password: a token
+    bucket per client address, then one per submitted email, both checked
+    before the view does any hashing or database work. Works for DRF views
+    through ``throttle_classes`` and for the async views, which call it
+    directly on the Django request.
+    """
+
+    def __init__(self):
+        self._wait = None
+
+    def allow_request(self, request, view):
+        if not settings.AUTH_THROTTLE["ENABLED"]:
+            return True
+        if not self.admit("ip", self.get_ident(request)):
+            return False
+        # The body is only read once the address has been let through.
+        email = _email(request)
+        return email is None or self.admit("email", email)
+
+    async def aallow_request(self, request, view):
+        # Local buckets only take a lock; a shared cache is a network round trip.
+        if settings.AUTH_THROTTLE["BACKEND"] == "cache":
+            return await sync_to_async(self.allow_request, thread_sensitive=False)(request, view)
+        return self.allow_request(request, view)
+
+    def admit(self, scope, key):
+        rate = settings.AUTH_THROTTLE[scope.upper()]
+        allowed, wait = get_buckets().consume(
+            f"auth_app:throttle:{scope}:{key}", rate["CAPACITY"], rate["PER_MINUTE"] / 60
+        )
+        counters.add(f"throttle.{scope}.{'admitted' if allowed else 'rejected'}")
+        if not allowed:
+            self._wait = wait
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+def snapshot():
+    """The admission counters of this process, shaped for the metrics endpoint."""
+    counts = counters.snapshot()
+    return {
+        "throttles": {
+            scope: {
+                "admitted": counts.get(f"throttle.{scope}.admitted", 0),
+                "rejected": counts.get(f"throttle.{scope}.rejected", 0),
+            }
+            for scope in ("ip", "email")
+        },
+        "hashing": {
+            "admitted": counts.get("hashing.admitted", 0),
+            "rejected": counts.get("hashing.rejected", 0),
+            "timedOut": counts.get("hashing.timed_out", 0),
+            "inFlight": counts.get("hashing.in_flight", 0),
+            "maxInFlight": settings.PASSWORD_HASHING["MAX_PENDING"],
+        },
+    }
@@ -0,0 +1,118 @@
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken, BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from . import outbox, timing
+from .blacklist import blacklist_index
+
+
+class TimedEncodeMixin:
+    # Signing happens when a token is turned into a string.
+    def __str__(self):
+        with timing.phase("jwt"):
+            return super().__str__()
+
+
+class AuthAccessToken(TimedEncodeMixin, AccessToken):
+    pass
+
+
+class AuthRefreshToken(TimedEncodeMixin, RefreshToken):
+    """
+    Refresh token that also carries the user claims read by
+    StatelessJWTAuthentication. RefreshToken.access_token copies them onto
+    the access token, so protected views never need to load the User row.
+    """
+
+    access_token_class = AuthAccessToken
+
+    def check_blacklist(self):
+        if blacklist_index.is_blacklisted(self.payload["jti"]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        jti = self.payload["jti"]
+        transaction.on_commit(lambda: blacklist_index.add(jti))
+        return blacklisted
+
+    @classmethod
+    def build_for_user(cls, user):
+        # Skip BlacklistMixin.for_user so the outstanding token is stored
+        # with its claims in place.
+        token = super(BlacklistMixin, cls).for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    # Fields of the User row the claims are read from.
+    claim_fields = ("userId", "email", "is_active", "is_staff", "is_superuser")
+
+    def set_user_claims(self, user):
+        self["userId"] = str(user.userId)
+        self["email"] = user.email
+        self["is_active"] = user.is_active
+        self["is_staff"] = user.is_staff
+        self["is_superuser"] = user.is_superuser
+
+    def outstanding_token(self, user):
+        return OutstandingToken(
+            user=user,
+            jti=self["jti"],
+            token=str(self),
+            created_at=self.current_time,
+            expires_at=datetime_from_epoch(self["exp"]),
+        )
+
+    @classmethod
+    def for_user(cls, user):
+        token = cls.build_for_user(user)
+        token.outstanding_token(user).save()
+        return token
+
+    @classmethod
+    def for_user_deferred(cls, user):
+        """
+        Like for_user, but records the outstanding token through the outbox.
+        Call it inside the transaction that creates ``user``. Blacklisting
+        doesn't depend on the row: it creates one if the worker hasn't yet.
+        """
+        token = cls.build_for_user(user)
+        outbox.enqueue(
+            "outstanding_token",
+            {
+                "userId": user.pk,
+                "jti": token["jti"],
+                "token": str(token),
+                "createdAt": token.current_time.timestamp(),
+                "expiresAt": token["exp"],
+            },
+            key=f"outstanding_token:{token['jti']}",
+        )
+        return token
+
+    @classmethod
+    async def afor_user(cls, user):
+        token = cls.build_for_user(user)
+        await token.outstanding_token(user).asave()
+        return token
+
+
+@outbox.handler("outstanding_token")
+def record_outstanding_token(message):
+    payload = message.payload
+    token, created = OutstandingToken.objects.get_or_create(
+        jti=payload["jti"],
+        defaults={
+            "user_id": payload["userId"],
+            "token": payload["token"],
+            "created_at": datetime_from_epoch(payload["createdAt"]),
+            "expires_at": datetime_from_epoch(payload["expiresAt"]),
+        },
+    )
+    # A logout that got here first stored the token without its user.
+    if not created and token.user_id is None:
+        token.user_id = payload["userId"]
+        token.save(update_fields=["user"])
@@ -1,12 +1,21 @@
 from django.urls import path
-from .views import RegisterView, LoginView, UserDetailView, OrganisationListView, OrganisationDetailView, OrganisationCreateView, AddUserToOrganisationView
+from .views import RegisterView, BulkRegisterView, LoginView, TokenRefreshView, LogoutView, UserBatchView, UserDetailView, OrganisationView, OrganisationSearchView, OrganisationDetailView, AddUserToOrganisationView, BulkAddUsersToOrganisationView, OrganisationMembersExportView, MetricsView
 
 urlpatterns = [
     path('auth/register', RegisterView.as_view(), name='register'),
+    path('auth/register/bulk', BulkRegisterView.as_view(), name='register-bulk'),
     path('auth/login', LoginView.as_view(), name='login'),
+    path('auth/token/refresh', TokenRefreshView.as_view(), name='token-refresh'),
+    path('auth/logout', LogoutView.as_view(), name='logout'),
+    path('api/users', UserBatchView.as_view(), name='user-batch'),
     path('api/users/<str:userId>', UserDetailView.as_view(), name='user-detail'),
-    path('api/organisations', OrganisationListView.as_view(), name='organisation-list'),
+    path('api/organisations', OrganisationView.as_view(), name='organisation-list'),
+    path('api/organisations/search', OrganisationSearchView.as_view(), name='organisation-search'),
     path('api/organisations/<str:orgId>', OrganisationDetailView.as_view(), name='organisation-detail'),
-    path('api/organisations', OrganisationCreateView.as_view(), name='organisation-create'),
+    # Never matched (organisation-list takes the path); kept so reverse('organisation-create') works.
+    path('api/organisations', OrganisationView.as_view(), name='organisation-create'),
     path('api/organisations/<str:orgId>/users', AddUserToOrganisationView.as_view(), name='add-user-to-organisation'),
+    path('api/organisations/<str:orgId>/users/bulk', BulkAddUsersToOrganisationView.as_view(), name='bulk-add-users-to-organisation'),
+    path('api/organisations/<str:orgId>/members/export', OrganisationMembersExportView.as_view(), name='export-organisation-members'),
+    path('api/metrics', MetricsView.as_view(), name='metrics'),
 ]
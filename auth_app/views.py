@@ -1,33 +1,69 @@
 
-from rest_framework_simplejwt.tokens import RefreshToken
+import time
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.contrib.auth import authenticate
-from .serializers import UserSerializer, OrganisationSerializer
-from .models import User, Organisation
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import router
+from django.http import StreamingHttpResponse
+from . import outbox, sharding
+from .serializers import (
+    OrganisationSerializer,
+    RegisterSerializer,
+    FastUserSerializer,
+    FastOrganisationSerializer,
+    user_organisations,
+)
+from .models import User, Organisation, parse_uuid
+from .registration import DuplicateEmail, bulk_register_users, existing_emails, register_user
+from .backends import authenticate_user
+from .hashing import HashingUnavailable
+from .membership import add_members, create_organisation, get_org_ids, is_member
+from .conditional import make_etag, not_modified, user_etag, with_versions
+from .export import CONTENT_TYPES, member_records, render_members
+from .pagination import InvalidCursor, decode_cursor, keyset_page, stream_envelope
+from .search import search_page
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import StatelessJWTAuthentication
+from .throttling import CredentialThrottle, snapshot
+from .tokens import AuthRefreshToken
+
+#The Response when the password hashing workers are saturated.
+def hashing_unavailable_response():
+    return Response(
+        {
+            "status": "Service Unavailable",
+            "message": "Server is busy, please try again shortly",
+            "statusCode": 503,
+        },
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
 
 #Handles User registration
 class RegisterView(APIView):
+    throttle_classes = [CredentialThrottle]
+
     def post(self, request):
-        serializer = UserSerializer(data=request.data)
+        serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
-
-            # Ensure user is saved before creating token.
-            user.save()
-
-            # Create an organization for the user.
-            org_name = f"{user.firstName}'s Organisation"
-            organisation = Organisation.objects.create(
-                name=org_name,
-                description="Default organisation",
-            )
-            organisation.users.add(user)
-
-            refresh = RefreshToken.for_user(user)
+            try:
+                user, organisation, refresh = register_user(serializer.validated_data)
+            except HashingUnavailable:
+                return hashing_unavailable_response()
+            except DuplicateEmail:
+                return Response(
+                    {
+                        "status": "Bad Request",
+                        "message": "Registration unsuccessful",
+                        "statusCode": 422,
+                        "errors": {"email": ["A user with this email already exists."]},
+                    },
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
             return Response(
                 {
                     "status": "success",
@@ -35,7 +71,7 @@ class RegisterView(APIView):
                     "data": {
                         "accessToken": str(refresh.access_token),
                         "refreshToken": str(refresh),
-                        "user": UserSerializer(user).data,
+                        "user": FastUserSerializer.to_representation(user, [organisation]),
                     },
                 },
                 status=status.HTTP_201_CREATED,
@@ -50,14 +86,115 @@ class RegisterView(APIView):
             status=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
 
+#Handles registering a batch of users in one request.
+class BulkRegisterView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        started = time.perf_counter()
+        rows = request.data.get("users") if hasattr(request.data, "get") else None
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {
+                    "status": "Bad Request",
+                    "message": "Expected a non-empty list of users",
+                    "statusCode": 400,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > settings.BULK_REGISTER_MAX_USERS:
+            return Response(
+                {
+                    "status": "Bad Request",
+                    "message": f"At most {settings.BULK_REGISTER_MAX_USERS} users can be registered per request",
+                    "statusCode": 400,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = [None] * len(rows)
+        candidates = {}
+        for index, row in enumerate(rows):
+            serializer = RegisterSerializer(data=row)
+            if not serializer.is_valid():
+                results[index] = {"index": index, "status": "failed", "errors": serializer.errors}
+                continue
+            email = User.objects.normalize_email(serializer.validated_data["email"]).lower()
+            if email in candidates:
+                results[index] = {
+                    "index": index,
+                    "status": "failed",
+                    "errors": {"email": ["Duplicate email in request."]},
+                }
+                continue
+            candidates[email] = (index, serializer.validated_data)
+
+        # One set-based query (on the case-insensitive email index) instead of an exists() per row.
+        def taken(index):
+            return {"index": index, "status": "failed", "errors": {"email": ["A user with this email already exists."]}}
+
+        for email in existing_emails(candidates):
+            index, _ = candidates.pop(email)
+            results[index] = taken(index)
+
+        valid = list(candidates.values())
+        created = 0
+        if valid:
+            try:
+                users = bulk_register_users([data for _, data in valid])
+            except HashingUnavailable:
+                return hashing_unavailable_response()
+            for (index, _), user in zip(valid, users):
+                if user is None:
+                    # Registered by another request since the check above.
+                    results[index] = taken(index)
+                    continue
+                results[index] = {"index": index, "status": "created", "userId": str(user.userId)}
+                created += 1
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            "received": len(rows),
+            "created": created,
+            "failed": len(rows) - created,
+            "elapsedMs": round(elapsed * 1000, 2),
+            "usersPerSecond": round(created / elapsed, 2) if elapsed else None,
+        }
+        if created:
+            return Response(
+                {
+                    "status": "success",
+                    "message": "Bulk registration completed",
+                    "data": {"results": results, "stats": stats},
+                },
+                status=status.HTTP_201_CREATED,
+            )
+        return Response(
+            {
+                "status": "Bad Request",
+                "message": "Registration unsuccessful",
+                "statusCode": 422,
+                "errors": results,
+                "stats": stats,
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
 #Handles Logining in
 class LoginView(APIView):
+    throttle_classes = [CredentialThrottle]
+
     def post(self, request):
         email = request.data.get("email")
         password = request.data.get("password")
-        user = authenticate(request, email=email, password=password)
+        try:
+            user = authenticate_user(email, password)
+        except HashingUnavailable:
+            return hashing_unavailable_response()
         if user is not None:
-            refresh = RefreshToken.for_user(user)
+            organisations = user_organisations([user.pk])[user.pk]
+            refresh = AuthRefreshToken.for_user(user)
             access_token = refresh.access_token
 
             #The Response when login credentials are correct.
@@ -68,7 +205,7 @@ class LoginView(APIView):
                     "data": {
                         "accessToken": str(access_token),
                         "refreshToken": str(refresh),
-                        "user": UserSerializer(user).data,
+                        "user": FastUserSerializer.to_representation(user, organisations),
                     },
                 },
                 status=status.HTTP_200_OK,
@@ -84,22 +221,95 @@ class LoginView(APIView):
         )
 
 
+#Handles issuing a new access token from a refresh token.
+class TokenRefreshView(APIView):
+    def post(self, request):
+        try:
+            refresh = AuthRefreshToken(request.data.get("refreshToken"))
+            # Read on the primary: a cache marker can be evicted or local to
+            # another worker, and a replica can lag behind the deactivation.
+            # The claims are re-read from the row so a demotion or email change
+            # reaches the next access token.
+            user = (
+                User.objects.using(router.db_for_write(User))
+                .only(*AuthRefreshToken.claim_fields)
+                .filter(**{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}, is_active=True)
+                .first()
+            )
+            if user is None:
+                raise TokenError("User is inactive")
+            refresh.set_user_claims(user)
+        except (TokenError, KeyError):
+            return Response(
+                {
+                    "status": "Unauthorized",
+                    "message": "Invalid or expired refresh token",
+                    "statusCode": 401,
+                },
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        data = {"accessToken": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refreshToken"] = str(refresh)
+        return Response(
+            {
+                "status": "success",
+                "message": "Token refreshed successfully",
+                "data": data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+#Handles logging out by blacklisting the refresh token.
+class LogoutView(APIView):
+    def post(self, request):
+        try:
+            refresh = AuthRefreshToken(request.data.get("refreshToken"))
+        except TokenError:
+            return Response(
+                {
+                    "status": "Unauthorized",
+                    "message": "Invalid or expired refresh token",
+                    "statusCode": 401,
+                },
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        refresh.blacklist()
+        return Response(
+            {
+                "status": "success",
+                "message": "Logout successful",
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class UserDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, userId):
         try:
-            user = User.objects.get(userId=userId)
+            user = with_versions(User.objects.only(*FastUserSerializer.fields, "version")).get(userId=userId)
+            etag = user_etag(user)
+            if not_modified(request, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            organisations = user_organisations([user.pk])[user.pk]
             return Response(
                 {
                     "status": "success",
                     "message": "User retrieved successfully",
-                    "data": UserSerializer(user).data,
+                    "data": FastUserSerializer.to_representation(user, organisations),
                 },
                 status=status.HTTP_200_OK,
+                headers={"ETag": etag},
             )
-        except User.DoesNotExist:
+        except (User.DoesNotExist, ValidationError):
             return Response(
                 {
                     "status": "error",
@@ -110,73 +320,200 @@ class UserDetailView(APIView):
             )
 
 
-class OrganisationListView(APIView):
-    authentication_classes = [JWTAuthentication]
+#Looks up many users at once: GET ?ids=a,b,c or POST {"ids": [...]} for large sets.
+class UserBatchView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        organisations = Organisation.objects.filter(users=request.user)
+        ids = request.query_params.get("ids", "")
+        return self.lookup([userId for userId in ids.split(",") if userId.strip()])
+
+    def post(self, request):
+        return self.lookup(request.data.get("ids") if hasattr(request.data, "get") else None)
+
+    def lookup(self, ids):
+        if not isinstance(ids, list) or not ids or len(ids) > settings.USER_BATCH_MAX_IDS:
+            return Response(
+                {
+                    "status": "Bad Request",
+                    "message": f"Expected a list of 1 to {settings.USER_BATCH_MAX_IDS} ids",
+                    "statusCode": 400,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        requested = list(dict.fromkeys(str(userId).strip() for userId in ids))
+        parsed = {userId: parse_uuid(userId) for userId in requested}
+        # One IN query for the users and one for all of their organisations.
+        users = {
+            user.userId: user
+            for user in User.objects.only(*FastUserSerializer.fields).filter(
+                userId__in={value for value in parsed.values() if value}
+            )
+        }
+        organisations = user_organisations(user.pk for user in users.values())
         return Response(
             {
                 "status": "success",
-                "message": "Organisations retrieved successfully",
+                "message": "Users retrieved successfully",
                 "data": {
-                    "organisations":OrganisationSerializer(organisations, many=True).data,
-                    }
+                    "users": [
+                        FastUserSerializer.to_representation(
+                            users[parsed[userId]], organisations[users[parsed[userId]].pk]
+                        )
+                        for userId in requested
+                        if parsed[userId] in users
+                    ],
+                    "notFound": [userId for userId in requested if parsed[userId] not in users],
+                },
             },
             status=status.HTTP_200_OK,
         )
 
 
-class OrganisationDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+class OrganisationListView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, orgId):
+    def get(self, request):
+        # Walk the membership index in primary key order rather than an IN
+        # over every cached orgId, so large accounts page cheaply.
+        organisations = Organisation.objects.filter(memberships__user_id=request.user.id).only(
+            *FastOrganisationSerializer.fields
+        )
+        # With sharding, only ask the shards that hold the caller's organisations.
+        shards = sharding.shards_for(get_org_ids(request.user.id)) if sharding.enabled() else None
+
+        if request.query_params.get("stream") == "true":
+            rows = sharding.iterate(
+                organisations.order_by("pk").values("orgId", "name", "description"),
+                settings.ORGANISATION_STREAM_CHUNK_SIZE,
+                shards,
+            )
+            return StreamingHttpResponse(
+                stream_envelope("Organisations retrieved successfully", "organisations", rows),
+                content_type="application/json",
+            )
+
         try:
-            organisation = Organisation.objects.get(orgId=orgId)
-            if organisation.users.filter(id=request.user.id).exists():
-                return Response(
-                    {
-                        "status": "success",
-                        "message": "Organisation retrieved successfully",
-                        "data": OrganisationSerializer(organisation).data,
-                    },
-                    status=status.HTTP_200_OK,
-                )
+            limit = int(request.query_params.get("limit", settings.ORGANISATION_PAGE_SIZE))
+            if not 1 <= limit <= settings.ORGANISATION_MAX_PAGE_SIZE:
+                raise ValueError
+            page, next_cursor = keyset_page(organisations, request.query_params.get("cursor"), limit, shards)
+        except (ValueError, InvalidCursor):
             return Response(
                 {
-                    "status": "Forbidden",
-                    "message": "You do not have permission to view this organisation",
-                    "statusCode": 403,
+                    "status": "Bad Request",
+                    "message": f"limit must be between 1 and {settings.ORGANISATION_MAX_PAGE_SIZE} and cursor must come from a previous page",
+                    "statusCode": 400,
                 },
-                status=status.HTTP_403_FORBIDDEN,
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        except Organisation.DoesNotExist:
+        return Response(
+            {
+                "status": "success",
+                "message": "Organisations retrieved successfully",
+                "data": {
+                    "organisations":FastOrganisationSerializer.many(page),
+                    "nextCursor": next_cursor,
+                    }
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+#Searches the caller's organisations by name and description.
+class OrganisationSearchView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        try:
+            if not 1 <= len(query) <= settings.ORGANISATION_SEARCH_MAX_QUERY_LENGTH:
+                raise ValueError
+            limit = int(request.query_params.get("limit", settings.ORGANISATION_PAGE_SIZE))
+            if not 1 <= limit <= settings.ORGANISATION_MAX_PAGE_SIZE:
+                raise ValueError
+            page, next_cursor = search_page(request.user.id, query, request.query_params.get("cursor"), limit)
+        except (ValueError, InvalidCursor):
             return Response(
                 {
-                    "status": "Not Found",
-                    "message": "Organisation not found",
-                    "statusCode": 404,
+                    "status": "Bad Request",
+                    "message": f"q must be 1 to {settings.ORGANISATION_SEARCH_MAX_QUERY_LENGTH} characters, limit between 1 and {settings.ORGANISATION_MAX_PAGE_SIZE} and cursor must come from a previous page",
+                    "statusCode": 400,
                 },
-                status=status.HTTP_404_NOT_FOUND,
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        return Response(
+            {
+                "status": "success",
+                "message": "Organisations retrieved successfully",
+                "data": {
+                    "organisations": FastOrganisationSerializer.many(page),
+                    "nextCursor": next_cursor,
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class OrganisationDetailView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, orgId):
+        with sharding.for_org(orgId):
+            try:
+                organisation = sharding.get_organisation(orgId)
+                if is_member(request.user.id, organisation):
+                    etag = make_etag(organisation.version)
+                    if not_modified(request, etag):
+                        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+                    return Response(
+                        {
+                            "status": "success",
+                            "message": "Organisation retrieved successfully",
+                            "data": {
+                                **FastOrganisationSerializer.to_representation(organisation),
+                                "memberCount": organisation.member_count,
+                            },
+                        },
+                        status=status.HTTP_200_OK,
+                        headers={"ETag": etag},
+                    )
+                return Response(
+                    {
+                        "status": "Forbidden",
+                        "message": "You do not have permission to view this organisation",
+                        "statusCode": 403,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            except (Organisation.DoesNotExist, ValidationError):
+                return Response(
+                    {
+                        "status": "Not Found",
+                        "message": "Organisation not found",
+                        "statusCode": 404,
+                    },
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
 
 class OrganisationCreateView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
         serializer = OrganisationSerializer(data=request.data)
         if serializer.is_valid():
-            organisation = serializer.save()
-            organisation.users.add(request.user)
+            organisation = create_organisation(request.user.id, serializer.validated_data)
             return Response(
                 {
                     "status": "success",
                     "message": "Organisation created successfully",
-                    "data": OrganisationSerializer(organisation).data,
+                    "data": FastOrganisationSerializer.to_representation(organisation),
                 },
                 status=status.HTTP_201_CREATED,
             )
@@ -191,39 +528,173 @@ class OrganisationCreateView(APIView):
         )
 
 
+#Serves api/organisations: GET lists the caller's organisations, POST creates one.
+#Django resolves a path to its first pattern for every method, so the list and
+#create views need one view class to share the path.
+class OrganisationView(OrganisationListView, OrganisationCreateView):
+    pass
+
+
 class AddUserToOrganisationView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, orgId):
         userId = request.data.get("userId")
-        try:
-            user = User.objects.get(userId=userId)
-            organisation = Organisation.objects.get(orgId=orgId)
-            if request.user in organisation.users.all():
-                organisation.users.add(user)
+        with sharding.for_org(orgId):
+            try:
+                user = User.objects.get(userId=userId)
+                organisation = sharding.get_organisation(orgId)
+                if is_member(request.user.id, organisation):
+                    add_members(organisation, [user.pk])
+                    return Response(
+                        {
+                            "status": "success",
+                            "message": "User added to organisation successfully",
+                        },
+                        status=status.HTTP_200_OK,
+                    )
                 return Response(
                     {
-                        "status": "success",
-                        "message": "User added to organisation successfully",
+                        "status": "Forbidden",
+                        "message": "You do not have permission to modify this organisation",
+                        "statusCode": 403,
                     },
-                    status=status.HTTP_200_OK,
+                    status=status.HTTP_403_FORBIDDEN,
                 )
-            return Response(
-                {
-                    "status": "Forbidden",
-                    "message": "You do not have permission to modify this organisation",
-                    "statusCode": 403,
-                },
-                status=status.HTTP_403_FORBIDDEN,
+            except (User.DoesNotExist, Organisation.DoesNotExist, ValidationError):
+                return Response(
+                    {
+                        "status": "Not Found",
+                        "message": "User or Organisation not found",
+                        "statusCode": 404,
+                    },
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+
+
+class BulkAddUsersToOrganisationView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, orgId):
+        with sharding.for_org(orgId):
+            userIds = request.data.get("userIds") if hasattr(request.data, "get") else None
+            if not isinstance(userIds, list) or not userIds or len(userIds) > settings.ORGANISATION_BULK_ADD_MAX_USERS:
+                return Response(
+                    {
+                        "status": "Bad Request",
+                        "message": f"Expected a list of 1 to {settings.ORGANISATION_BULK_ADD_MAX_USERS} userIds",
+                        "statusCode": 400,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                organisation = sharding.get_organisation(orgId)
+            except (Organisation.DoesNotExist, ValidationError):
+                return Response(
+                    {
+                        "status": "Not Found",
+                        "message": "Organisation not found",
+                        "statusCode": 404,
+                    },
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            if not is_member(request.user.id, organisation):
+                return Response(
+                    {
+                        "status": "Forbidden",
+                        "message": "You do not have permission to modify this organisation",
+                        "statusCode": 403,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            requested = list(dict.fromkeys(str(userId) for userId in userIds))
+            parsed = {userId: parse_uuid(userId) for userId in requested}
+            found = dict(
+                User.objects.filter(userId__in={value for value in parsed.values() if value}).values_list("userId", "id")
             )
-        except (User.DoesNotExist, Organisation.DoesNotExist):
+            added = add_members(organisation, list(found.values()))
+            not_found = [userId for userId in requested if parsed[userId] not in found]
             return Response(
                 {
-                    "status": "Not Found",
-                    "message": "User or Organisation not found",
-                    "statusCode": 404,
+                    "status": "success",
+                    "message": "Users added to organisation successfully",
+                    "data": {
+                        "added": len(added),
+                        "alreadyMembers": len(found) - len(added),
+                        "notFound": len(not_found),
+                        "notFoundUserIds": not_found,
+                    },
                 },
-                status=status.HTTP_404_NOT_FOUND,
+                status=status.HTTP_200_OK,
             )
 
+
+#Streams an organisation's members as NDJSON or CSV.
+class OrganisationMembersExportView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, orgId):
+        with sharding.for_org(orgId):
+            export_format = request.query_params.get("type", "ndjson")
+            after = request.query_params.get("after")
+            try:
+                if export_format not in CONTENT_TYPES:
+                    raise ValueError
+                if after:
+                    decode_cursor(after)
+            except (ValueError, InvalidCursor):
+                return Response(
+                    {
+                        "status": "Bad Request",
+                        "message": "type must be ndjson or csv and after must be a cursor from a previous export",
+                        "statusCode": 400,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                organisation = sharding.get_organisation(orgId)
+            except (Organisation.DoesNotExist, ValidationError):
+                return Response(
+                    {
+                        "status": "Not Found",
+                        "message": "Organisation not found",
+                        "statusCode": 404,
+                    },
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            if not (request.user.is_staff or is_member(request.user.id, organisation)):
+                return Response(
+                    {
+                        "status": "Forbidden",
+                        "message": "You do not have permission to export this organisation",
+                        "statusCode": 403,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            records = member_records(organisation, after, settings.MEMBER_EXPORT_CHUNK_SIZE)
+            response = StreamingHttpResponse(
+                render_members(records, export_format), content_type=CONTENT_TYPES[export_format]
+            )
+            response["Content-Disposition"] = f'attachment; filename="members-{organisation.orgId}.{export_format}"'
+            return response
+
+
+#Reports this worker's admission counters: throttled versus admitted requests and password hashes.
+class MetricsView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "status": "success",
+                "message": "Metrics retrieved successfully",
+                "data": {**snapshot(), "outbox": outbox.stats()},
+            },
+            status=status.HTTP_200_OK,
+        )